@@ -0,0 +1,29 @@
+"""add direct_upload file origin
+
+Revision ID: 9b1e4c7d2a10
+Revises: fdc7013d9a25
+Create Date: 2026-10-17 10:12:41.208311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b1e4c7d2a10'
+down_revision: Union[str, Sequence[str], None] = 'fdc7013d9a25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TYPE fileorigin ADD VALUE IF NOT EXISTS 'DIRECT_UPLOAD'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Postgres cannot drop a single enum value; leaving it in place is harmless
+    pass
@@ -0,0 +1,98 @@
+"""add worker queue, lookup and chat history indexes
+
+Revision ID: a7d3c9e5b1f4
+Revises: f3b8d2e6a9c4
+Create Date: 2026-10-17 22:58:36.271940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3c9e5b1f4'
+down_revision: Union[str, Sequence[str], None] = 'f3b8d2e6a9c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT s3_bucket, s3_object_key, count(*) FROM files "
+        "WHERE s3_bucket IS NOT NULL AND s3_object_key IS NOT NULL "
+        "GROUP BY s3_bucket, s3_object_key HAVING count(*) > 1 LIMIT 10"
+    )).all()
+    if duplicates:
+        listed = ", ".join(f"{bucket}/{key} ({n})" for bucket, key, n in duplicates)
+        raise RuntimeError(
+            f"files has duplicate (s3_bucket, s3_object_key) rows, resolve them first: {listed}"
+        )
+
+    # Built concurrently so the files/messages tables stay writable meanwhile
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_files_s3_bucket_object_key",
+            "files",
+            ["s3_bucket", "s3_object_key"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_files_vector_store_status",
+            "files",
+            ["vector_store_id", "status"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_files_worker_queue",
+            "files",
+            ["status", "id"],
+            postgresql_where=sa.text("status IN ('STORED', 'INDEXING', 'DELETING')"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_files_indexing_due",
+            "files",
+            [sa.text("indexing_checked_at NULLS FIRST")],
+            postgresql_where=sa.text("status = 'INDEXING'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_messages_chat_id_created_at_id",
+            "messages",
+            ["chat_id", "created_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+        # Superseded by uq_files_s3_bucket_object_key / ix_files_indexing_due /
+        # ix_messages_chat_id_created_at_id
+        op.drop_index("ix_files_s3_object_key", table_name="files", postgresql_concurrently=True)
+        op.drop_index("ix_files_indexing_checked_at", table_name="files", postgresql_concurrently=True)
+        op.drop_index("ix_messages_chat_id", table_name="messages", postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_messages_chat_id", "messages", ["chat_id"], postgresql_concurrently=True
+        )
+        op.create_index(
+            "ix_files_indexing_checked_at", "files", ["indexing_checked_at"], postgresql_concurrently=True
+        )
+        op.create_index(
+            "ix_files_s3_object_key", "files", ["s3_object_key"], postgresql_concurrently=True
+        )
+        op.drop_index("ix_messages_chat_id_created_at_id", table_name="messages", postgresql_concurrently=True)
+        op.drop_index("ix_files_indexing_due", table_name="files", postgresql_concurrently=True)
+        op.drop_index("ix_files_worker_queue", table_name="files", postgresql_concurrently=True)
+        op.drop_index("ix_files_vector_store_status", table_name="files", postgresql_concurrently=True)
+        op.drop_index("uq_files_s3_bucket_object_key", table_name="files", postgresql_concurrently=True)
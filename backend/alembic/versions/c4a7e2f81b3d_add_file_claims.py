@@ -0,0 +1,39 @@
+"""add claimed_by / claimed_until to files
+
+Revision ID: c4a7e2f81b3d
+Revises: 9b1e4c7d2a10
+Create Date: 2026-10-17 11:48:05.730914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a7e2f81b3d'
+down_revision: Union[str, Sequence[str], None] = '9b1e4c7d2a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("files", sa.Column("claimed_by", sa.String(), nullable=True))
+    op.add_column(
+        "files",
+        sa.Column("claimed_until", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_files_claimed_until",
+        "files",
+        ["claimed_until"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_files_claimed_until", table_name="files")
+    op.drop_column("files", "claimed_until")
+    op.drop_column("files", "claimed_by")
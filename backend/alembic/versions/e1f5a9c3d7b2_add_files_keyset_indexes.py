@@ -0,0 +1,37 @@
+"""add (created_at, id) keyset indexes to files
+
+Revision ID: e1f5a9c3d7b2
+Revises: c4a7e2f81b3d
+Create Date: 2026-10-17 21:02:41.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f5a9c3d7b2'
+down_revision: Union[str, Sequence[str], None] = 'c4a7e2f81b3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_files_created_at_id",
+        "files",
+        ["created_at", "id"],
+    )
+    op.create_index(
+        "ix_files_vector_store_created_at_id",
+        "files",
+        ["vector_store_id", "created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_files_vector_store_created_at_id", table_name="files")
+    op.drop_index("ix_files_created_at_id", table_name="files")
@@ -0,0 +1,50 @@
+"""add pg_trgm GIN indexes on files.name / files.s3_object_key
+
+Revision ID: f3b8d2e6a9c4
+Revises: e1f5a9c3d7b2
+Create Date: 2026-10-17 21:40:12.604417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d2e6a9c4'
+down_revision: Union[str, Sequence[str], None] = 'e1f5a9c3d7b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Built concurrently so a large files table stays writable meanwhile
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_files_name_trgm",
+            "files",
+            ["name"],
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_files_s3_object_key_trgm",
+            "files",
+            ["s3_object_key"],
+            postgresql_using="gin",
+            postgresql_ops={"s3_object_key": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_files_s3_object_key_trgm", table_name="files", postgresql_concurrently=True)
+        op.drop_index("ix_files_name_trgm", table_name="files", postgresql_concurrently=True)
@@ -12,6 +12,7 @@ from app.utils.oauth2 import verify_access_token
 from app.api.dependencies.db import get_db
 from app.middleware.logging import set_user_email
 from app.api.dependencies.repos import get_user_repo
+from app.infrastructure.redis.user_cache import user_cache
 
 
 async def get_current_user(
@@ -34,10 +35,13 @@ async def get_current_user(
         token_data = verify_access_token(token, credentials_exception)
         user_id = token_data.id
 
-        # Fetch the user from the repository
-        user = await user_repo.get_by_id(db, int(user_id))
+        # Cached users skip the DB; the session is never checked out then
+        user = await user_cache.get(int(user_id))
         if not user:
-            raise credentials_exception
+            user = await user_repo.get_by_id(db, int(user_id))
+            if not user:
+                raise credentials_exception
+            await user_cache.set(user)
 
         request.state.user = user.id
         set_user_email(user.email, request)
@@ -4,28 +4,28 @@ from openai import AsyncOpenAI
 from app.domain.file.repository import FileRepo
 from app.domain.storage.repository import StorageRepo
 from app.infrastructure.llm.openai_manager import OpenAIManager
-from app.infrastructure.yandex.yandex_s3_client import YandexS3Client
+from app.infrastructure.llm.client import openai_registry
+from app.infrastructure.yandex.yandex_s3_client import YandexS3Client, yandex_s3
 from app.infrastructure.file_converter.file_converter import FileConverter
 from app.api.dependencies.repos import (
     get_file_repo,
     get_storage_repo
 )
-from app.core.config import settings
 
 
 def get_file_converter() -> FileConverter:
     return FileConverter()
 
 
+def get_openai_client() -> AsyncOpenAI:
+    return openai_registry.get_client()
+
+
 def get_openai_manager(
     file_repo: FileRepo = Depends(get_file_repo),
-    storage_repo: StorageRepo = Depends(get_storage_repo)
+    storage_repo: StorageRepo = Depends(get_storage_repo),
+    client: AsyncOpenAI = Depends(get_openai_client),
 ) -> OpenAIManager:
-    client = AsyncOpenAI(
-        api_key=settings.OPENAI_API_KEY,
-        timeout=70
-        # http_client=httpx.AsyncClient(proxy=settings.PROXY_URL)
-    )
 
     return OpenAIManager(
         client=client,
@@ -37,4 +37,4 @@ def get_openai_manager(
 
 def get_yandex_s3_client() -> YandexS3Client:
 
-    return YandexS3Client()
\ No newline at end of file
+    return yandex_s3
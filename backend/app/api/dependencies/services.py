@@ -5,6 +5,7 @@ from fastapi import (
     Depends
 )
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from openai import AsyncOpenAI
 from app.domain.user.schema import UserCreateSchema
 from app.enums.enums import UserRole
 from app.domain.storage.service import StorageService
@@ -35,6 +36,7 @@ from app.api.dependencies.repos import (
     get_message_repo
 )
 from app.api.dependencies.integrations import (
+    get_openai_client,
     get_openai_manager,
     get_yandex_s3_client,
     get_file_converter
@@ -100,12 +102,13 @@ def get_storage_service(
     repo: StorageRepo = Depends(get_storage_repo),
     file_repo: FileRepo = Depends(get_file_repo),
     user: UserOutSchema = Depends(get_current_user),
+    client: AsyncOpenAI = Depends(get_openai_client),
 ) -> StorageService:
 
     if user.role != UserRole.ADMIN:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='Forbidden.')
 
-    return StorageService(repo=repo, file_repo=file_repo, user=user)
+    return StorageService(repo=repo, file_repo=file_repo, user=user, client=client)
 
 
 def get_chat_service(
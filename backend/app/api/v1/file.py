@@ -5,12 +5,20 @@ from fastapi import (
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.middleware.rate_limiter import limiter
-from app.domain.file.schema import FileOut, FilesPage
+from app.domain.file.schema import (
+    FileOut,
+    FilesPage,
+    FileSearchMode,
+    MultipartUploadInit,
+    MultipartUploadInitOut,
+    MultipartUploadComplete,
+)
 from app.domain.file.service import FileService
 from app.domain.file.service_public import PublicFileService
 from app.domain.file.bucket_service import FileBucketService
 from app.utils.oauth2 import validate_file_access_token
 from app.enums.enums import FileState
+from app.common.pagination import CountMode
 from app.api.dependencies.services import (
     get_file_service,
     get_file_public_service,
@@ -40,6 +48,50 @@ async def upload_file(
     return await service.create_file(db, files)
 
 
+@router.post(
+    "/upload/multipart",
+    response_model=MultipartUploadInitOut,
+    status_code=status.HTTP_201_CREATED
+)
+@limiter.limit("10/minute")
+async def init_multipart_upload(
+    request: Request,
+    data: MultipartUploadInit,
+    db: AsyncSession = Depends(get_db),
+    service: FileService = Depends(get_file_service)
+):
+    """
+    Start a direct-to-S3 upload. The client PUTs each part to the returned
+    presigned URLs and then calls the complete endpoint with the part ETags.
+    """
+    return await service.init_multipart_upload(db, data)
+
+
+@router.post("/upload/multipart/{file_id}/complete", response_model=FileOut)
+@limiter.limit("10/minute")
+async def complete_multipart_upload(
+    request: Request,
+    file_id: int,
+    data: MultipartUploadComplete,
+    db: AsyncSession = Depends(get_db),
+    service: FileService = Depends(get_file_service)
+):
+    return await service.complete_multipart_upload(db, file_id, data)
+
+
+@router.delete("/upload/multipart/{file_id}", status_code=status.HTTP_204_NO_CONTENT)
+@limiter.limit("10/minute")
+async def abort_multipart_upload(
+    request: Request,
+    file_id: int,
+    upload_id: str = Query(...),
+    db: AsyncSession = Depends(get_db),
+    service: FileService = Depends(get_file_service)
+):
+    await service.abort_multipart_upload(db, file_id, upload_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
 @router.get("/{file_id}/download")
 @limiter.limit("30/minute")
 async def download_file(
@@ -49,7 +101,7 @@ async def download_file(
     db: AsyncSession = Depends(get_db),
     service: FileService = Depends(get_file_service)
 ):
-    return await service.download_file(db, file_id)
+    return await service.download_file(db, file_id, request.headers.get("range"))
 
 
 @router.get("/secure-download")
@@ -64,7 +116,7 @@ async def secure_file_download(
     if not file_id:
         return {"message": "Not valid url."}
 
-    return await service.download_file(db, file_id)
+    return await service.download_file(db, file_id, request.headers.get("range"))
 
 
 @router.get("/page", response_model=FilesPage)
@@ -77,6 +129,9 @@ async def get_files_page(
     status: FileState | None = Query(None),
     bucket: str | None = Query(None),
     vector_store_id: str | None = Query(None),
+    cursor: str | None = Query(None),
+    count: CountMode = Query("exact"),
+    match: FileSearchMode = Query("contains"),
     db: AsyncSession = Depends(get_db),
     service: FileService = Depends(get_file_service),
 ):
@@ -88,6 +143,9 @@ async def get_files_page(
         status=status,
         bucket=bucket,
         vector_store_id=vector_store_id,
+        cursor=cursor,
+        count=count,
+        match=match,
     )
 
 
@@ -3,7 +3,6 @@ from fastapi import (
     Depends,
     HTTPException,
     Request,
-    BackgroundTasks,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -14,6 +13,8 @@ from app.domain.message.schema import (
 )
 from app.infrastructure.bitrix.bitrix_service import BitrixService
 from app.domain.message.service import MessageService
+from app.domain.message.streaming import DELTA_EVENT, DELTA_PREFIX
+from app.domain.message.jobs import enqueue_bitrix_webhook
 from app.infrastructure.redis.client import get_redis_client
 from app.infrastructure.redis.pubsub import RedisPubSub
 from app.api.dependencies.services import (
@@ -35,12 +36,11 @@ router = APIRouter(prefix=settings.api.v1.message, tags=["Message"])
 @limiter.limit("60/minute")
 async def bitrix_webhook(
     request: Request,
-    background_tasks: BackgroundTasks,
     bitrix_service: BitrixService = Depends(get_bitrix_service)
 ):
     """
     Receive messages from Bitrix24 chatbot webhook.
-    All logic delegated to BitrixService.
+    All logic delegated to BitrixService, run by the assistant worker.
     """
     try:
         # Validate content type
@@ -53,10 +53,7 @@ async def bitrix_webhook(
         if settings.MODE in ['dev', 'test']:
             await bitrix_service.process_webhook(form_data=dict(form_data))
         else:
-            background_tasks.add_task(
-                bitrix_service.process_webhook,
-                form_data=dict(form_data)
-            )
+            await enqueue_bitrix_webhook(dict(form_data), bitrix_service.user.id)
 
         return JSONResponse({"status": "accepted"}, status_code=200)
     except HTTPException:
@@ -74,12 +71,11 @@ async def bitrix_webhook(
 async def create_message(
     request: Request,
     message: MessageCreate,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     service: MessageService = Depends(get_message_service),
 ):
     """Create a user message and enqueue assistant response generation."""
-    return await service.create(db, message, background_tasks)
+    return await service.create(db, message)
 
 
 @router.get("/", status_code=200)
@@ -145,7 +141,11 @@ async def sse_stream(chat_id: str, request: Request):
                 if await request.is_disconnected():
                     break
 
-                yield message
+                # Answer deltas get their own SSE event type; full messages stay "message"
+                if message.startswith(DELTA_PREFIX):
+                    yield {"event": DELTA_EVENT, "data": message}
+                else:
+                    yield message
 
         finally:
             await pubsub.unsubscribe()
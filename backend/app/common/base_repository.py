@@ -1,5 +1,5 @@
 # app/common/base_repository.py
-from typing import Type, TypeVar, Generic, Optional, Dict, Any, Union
+from typing import Type, TypeVar, Generic, Optional, Dict, Any, Union, Sequence
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -8,12 +8,16 @@ from sqlalchemy import update as sqlalchemy_update, delete as sqlalchemy_delete
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime, timezone
 from app.exceptions.exceptions import NotFoundError, DatabaseError
+from app.database.unit_of_work import in_unit_of_work
 
 
 T = TypeVar("T")  # SQLAlchemy model
 S = TypeVar("S", bound=BaseModel)  # Output schema
 C = TypeVar("C", bound=BaseModel)  # Create schema
 
+# Protected fields that should never be updated
+PROTECTED_FIELDS = {"id", "created_at", "created_by"}
+
 
 class BaseRepository(Generic[T, S, C]):
     def __init__(
@@ -26,6 +30,18 @@ class BaseRepository(Generic[T, S, C]):
         self.default_schema = default_schema
         self.create_schema = create_schema
 
+    async def _commit(self, db: AsyncSession) -> None:
+        """Commit, or only flush when the caller owns the transaction (unit_of_work)."""
+        if in_unit_of_work(db):
+            await db.flush()
+        else:
+            await db.commit()
+
+    async def _rollback(self, db: AsyncSession) -> None:
+        """Roll back, unless a unit_of_work will do it when the error reaches it."""
+        if not in_unit_of_work(db):
+            await db.rollback()
+
     async def get_by_id(self, db: AsyncSession, _id: int) -> Optional[S]:
         try:
             result = await db.execute(select(self.model).where(self.model.id == _id))
@@ -73,13 +89,13 @@ class BaseRepository(Generic[T, S, C]):
                 db_obj.updated_by = current_user_id
 
             db.add(db_obj)
-            await db.commit()
+            await self._commit(db)
             await db.refresh(db_obj)
 
             schema_cls = schema or self.default_schema
             return schema_cls.model_validate(db_obj)
         except Exception as e:
-            await db.rollback()
+            await self._rollback(db)
             raise DatabaseError(f"Failed to create entity: {str(e)}") from e
 
     async def update(
@@ -106,13 +122,9 @@ class BaseRepository(Generic[T, S, C]):
             if isinstance(update_data, BaseModel):
                 update_data = update_data.model_dump(exclude_unset=True)
 
-            # Protected fields that should never be updated
-            protected_fields = {"id", "created_at", "created_by"}
-            # protected_fields = {"id", "created_at", "created_by", "deleted_at", "deleted_by"}
-            
             # Update only allowed fields
             for key, value in update_data.items():
-                if key not in protected_fields:
+                if key not in PROTECTED_FIELDS:
                     setattr(instance, key, value)
 
             # Always update audit fields if they exist
@@ -120,7 +132,7 @@ class BaseRepository(Generic[T, S, C]):
                 setattr(instance, "updated_by", current_user_id)
 
             # await db.flush()
-            await db.commit()
+            await self._commit(db)
             await db.refresh(instance)
 
             schema_cls = schema or self.default_schema
@@ -128,9 +140,110 @@ class BaseRepository(Generic[T, S, C]):
         except NotFoundError:
             raise
         except Exception as e:
-            await db.rollback()
+            await self._rollback(db)
             raise DatabaseError(f"Failed to update entity: {str(e)}") from e
 
+    def _update_values(
+        self,
+        update_data: Union[Dict[str, Any], BaseModel],
+        current_user_id: int | None = None,
+    ) -> Dict[str, Any]:
+        if isinstance(update_data, BaseModel):
+            update_data = update_data.model_dump(exclude_unset=True)
+
+        values = {k: v for k, v in update_data.items() if k not in PROTECTED_FIELDS}
+        if current_user_id and hasattr(self.model, "updated_by"):
+            values["updated_by"] = current_user_id
+        return values
+
+    async def update_returning(
+        self,
+        db: AsyncSession,
+        _id: int,
+        update_data: Union[Dict[str, Any], BaseModel],
+        schema: Optional[Type[S]] = None,
+        current_user_id: int | None = None,
+    ) -> S:
+        """
+        Same contract as `update`, but as one UPDATE ... RETURNING statement
+        instead of SELECT + UPDATE + refresh.
+        """
+        try:
+            values = self._update_values(update_data, current_user_id)
+            stmt = (
+                sqlalchemy_update(self.model)
+                .where(self.model.id == _id)
+                .values(**values)
+                .returning(self.model)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+            result = await db.execute(stmt)
+            instance = result.scalar_one_or_none()
+            if not instance:
+                raise NotFoundError(f"Entity with ID {_id} not found")
+            await self._commit(db)
+
+            schema_cls = schema or self.default_schema
+            return schema_cls.model_validate(instance)
+        except NotFoundError:
+            await self._rollback(db)
+            raise
+        except Exception as e:
+            await self._rollback(db)
+            raise DatabaseError(f"Failed to update entity: {str(e)}") from e
+
+    async def bulk_update(
+        self,
+        db: AsyncSession,
+        ids: Sequence[int],
+        update_data: Union[Dict[str, Any], BaseModel],
+        current_user_id: int | None = None,
+    ) -> int:
+        """Apply the same values to every row in `ids`; returns the number of rows updated."""
+        if not ids:
+            return 0
+        try:
+            values = self._update_values(update_data, current_user_id)
+            result = await db.execute(
+                sqlalchemy_update(self.model)
+                .where(self.model.id.in_(ids))
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await self._commit(db)
+            return result.rowcount
+        except Exception as e:
+            await self._rollback(db)
+            raise DatabaseError(f"Failed to bulk update entities: {str(e)}") from e
+
+    async def bulk_update_mapping(
+        self,
+        db: AsyncSession,
+        rows: Sequence[Dict[str, Any]],
+        current_user_id: int | None = None,
+    ) -> int:
+        """
+        Apply per-row values in one executemany UPDATE by primary key.
+
+        Each mapping must contain "id"; rows may set different columns.
+        """
+        if not rows:
+            return 0
+        try:
+            mappings = [
+                {"id": row["id"], **self._update_values(row, current_user_id)}
+                for row in rows
+            ]
+            await db.execute(
+                sqlalchemy_update(self.model).execution_options(synchronize_session=False),
+                mappings,
+            )
+            await self._commit(db)
+            return len(mappings)
+        except Exception as e:
+            await self._rollback(db)
+            raise DatabaseError(f"Failed to bulk update entities: {str(e)}") from e
+
     async def soft_delete(
         self,
         db: AsyncSession,
@@ -154,11 +267,11 @@ class BaseRepository(Generic[T, S, C]):
             if current_user_id and hasattr(instance, "deleted_by"):
                 instance.deleted_by = current_user_id
 
-            await db.commit()
+            await self._commit(db)
         except NotFoundError:
             raise
         except Exception as e:
-            await db.rollback()
+            await self._rollback(db)
             raise DatabaseError(f"Failed to soft delete entity: {str(e)}") from e
 
     async def delete_by_id(self, db: AsyncSession, _id: int) -> None:
@@ -170,9 +283,9 @@ class BaseRepository(Generic[T, S, C]):
                 raise NotFoundError(f"Entity with ID {_id} not found")
 
             await db.delete(instance)
-            await db.commit()
+            await self._commit(db)
         except NotFoundError:
             raise
         except Exception as e:
-            await db.rollback()
+            await self._rollback(db)
             raise DatabaseError(f"Failed to delete entity: {str(e)}") from e
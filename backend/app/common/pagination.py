@@ -0,0 +1,29 @@
+# app/common/pagination.py
+import base64
+import json
+from datetime import datetime
+from typing import Literal
+
+
+CountMode = Literal["exact", "estimate", "cached", "none"]
+
+
+def encode_cursor(created_at: datetime, _id: int) -> str:
+    """Opaque keyset cursor for a (created_at, id) position."""
+    raw = json.dumps({"c": created_at.isoformat(), "i": _id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Inverse of `encode_cursor`.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["c"]), int(data["i"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
@@ -38,6 +38,42 @@ class Settings(BaseSettings):
     ADMIN_PWD: str
 
     OPENAI_API_KEY: str
+    OPENAI_TIMEOUT: float = 70.0
+    OPENAI_MAX_CONNECTIONS: int = 100
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    OPENAI_KEEPALIVE_EXPIRY: float = 30.0
+    OPENAI_HTTP2: bool = True
+
+    # Shared OpenAI rate limiter (Redis token bucket + in-flight leases) for API pods and workers.
+    # Pace follows the x-ratelimit-* headers; background traffic leaves headroom for chat
+    OPENAI_LIMITER_ENABLED: bool = True
+    OPENAI_REQUESTS_PER_MINUTE: int = 500
+    OPENAI_MAX_IN_FLIGHT: int = 50
+    OPENAI_BACKGROUND_SHARE: float = 0.5
+    OPENAI_LIMITER_MAX_WAIT: float = 30.0
+
+    # Web chat: stream answer deltas over the chat SSE channel, coalesced per interval
+    CHAT_STREAM_RESPONSES: bool = True
+    CHAT_STREAM_FLUSH_MS: int = 100
+
+    # Answer cache for repeated questions, keyed by vector stores, model, instructions and
+    # normalized question. The semantic tier embeds misses and matches them in a per-process index
+    ANSWER_CACHE_ENABLED: bool = True
+    ANSWER_CACHE_TTL: int = 86400
+    ANSWER_CACHE_SEMANTIC: bool = False
+    ANSWER_CACHE_EMBEDDING_MODEL: str = "text-embedding-3-small"
+    ANSWER_CACHE_MIN_SIMILARITY: float = 0.95
+
+    # Answer generation: one deadline covers retries and fallbacks. The user's model gets the
+    # time left minus the reserve, then the fallback model gets the rest. With hedging, a
+    # duplicate request starts once the model's observed p95 latency has passed
+    LLM_DEADLINE_SECONDS: float = 90.0
+    LLM_FALLBACK_MODEL: str | None = "gpt-4o-mini"
+    LLM_FALLBACK_RESERVE_SECONDS: float = 10.0
+    LLM_HEDGING: bool = False
+    # A streamed answer must start within its share of the deadline; once text flows,
+    # only a pause this long between events cuts it off
+    LLM_STREAM_IDLE_SECONDS: float = 30.0
 
     # Postgres
     DATABASE_URL: str
@@ -59,8 +95,70 @@ class Settings(BaseSettings):
     AWS_ACCESS_KEY_ID: str
     AWS_SECRET_ACCESS_KEY: str
     MAX_FILE_SIZE: int = 50 * 1024 * 1024  # 50 MB default
+    S3_MAX_POOL_CONNECTIONS: int = 50
+    S3_CONNECT_TIMEOUT: float = 10.0
+    S3_READ_TIMEOUT: float = 60.0
+
+    # Downloads: "stream" proxies bytes through the API, "redirect" sends a 307
+    # to a short-lived presigned S3 URL
+    FILE_DOWNLOAD_MODE: str = "stream"
+    PRESIGNED_URL_EXPIRES: int = 900
+    PRESIGNED_URL_CACHE_MARGIN: int = 60
+
+    # Admin file list: TTL of cached totals for count=cached
+    FILE_PAGE_COUNT_CACHE_TTL: int = 30
+
+    # Authenticated user lookups: shared Redis TTL and per-process TTL
+    USER_CACHE_TTL: int = 60
+    USER_CACHE_LOCAL_TTL: int = 5
+
+    # Storage configuration snapshot; mutations also invalidate via Redis pub/sub
+    STORAGE_REGISTRY_TTL: int = 300
+
+    # Direct-to-S3 multipart uploads
+    PRESIGNED_UPLOAD_EXPIRES: int = 3600
+
+    # Upload worker: rows fetched per query, files in flight, per-stage limits
+    UPLOAD_WORKER_BATCH_SIZE: int = 50
+    UPLOAD_WORKER_CONCURRENCY: int = 10
+    UPLOAD_WORKER_S3_CONCURRENCY: int = 8
+    UPLOAD_WORKER_CONVERT_PROCESSES: int = 2
+    UPLOAD_WORKER_OPENAI_CONCURRENCY: int = 5
+
+    # Worker process: shared Postgres pool for all jobs and queue consumers
+    WORKER_DB_POOL_SIZE: int = 15
+    WORKER_DB_MAX_OVERFLOW: int = 5
+    WORKER_POOL_STATS_MINUTES: int = 10
+
+    # Worker row leases (FOR UPDATE SKIP LOCKED claims); WORKER_ID defaults to hostname:pid
+    WORKER_ID: str | None = None
+    WORKER_CLAIM_LEASE_SECONDS: int = 900
+
+    # Indexing worker: INDEXING rows reconciled per run
+    INDEXING_WORKER_BATCH_SIZE: int = 2000
+
+    # Delete worker: DELETING rows leased per query; the sweep repeats until none are left
+    DELETE_WORKER_BATCH_SIZE: int = 20
+
+    # Worker job queue (Redis streams); the interval scan is only a safety net
+    JOB_QUEUE_MAX_RETRIES: int = 5
+    JOB_QUEUE_CLAIM_IDLE_SECONDS: int = 900
+    JOB_QUEUE_READ_COUNT: int = 20
+    WORKER_SWEEP_MINUTES: int = 30
+
+    # Assistant worker: chat/Bitrix replies consumed from a Redis stream. MAX_IN_FLIGHT caps
+    # replies across all worker replicas (size it to the OpenAI rate limit); CONCURRENCY
+    # caps them per worker process
+    ASSISTANT_MAX_IN_FLIGHT: int = 32
+    ASSISTANT_WORKER_CONCURRENCY: int = 8
+    ASSISTANT_WORKER_PER_USER: int = 2
+    ASSISTANT_JOB_CLAIM_IDLE_SECONDS: int = 300
+    # PROCESSING replies older than this are re-enqueued, and failed past the expiry
+    ASSISTANT_REPLY_ORPHAN_SECONDS: int = 120
+    ASSISTANT_REPLY_EXPIRE_SECONDS: int = 900
 
     BITRIX_WEBHOOK_URL: str
+    BITRIX_REPLY_DEADLINE_SECONDS: float = 30.0
 
     LLAMACLOUD_API_KEY: SecretStr | None = None
     LLAMAPARSE_ENABLE: bool = True
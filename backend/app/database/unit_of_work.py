@@ -0,0 +1,39 @@
+# app/database/unit_of_work.py
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+_DEPTH_KEY = "unit_of_work_depth"
+
+
+def in_unit_of_work(db: AsyncSession) -> bool:
+    return db.info.get(_DEPTH_KEY, 0) > 0
+
+
+@asynccontextmanager
+async def unit_of_work(db: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """
+    Group repository calls into one transaction.
+
+    Inside the block repositories only flush; the outermost block commits on
+    success and rolls back on any exception. Nested blocks join the outer
+    transaction.
+
+    Usage:
+        async with unit_of_work(db):
+            user_msg = await repo.create(db, ...)
+            assistant_msg = await repo.create(db, ...)
+    """
+    depth = db.info.get(_DEPTH_KEY, 0)
+    db.info[_DEPTH_KEY] = depth + 1
+    try:
+        yield db
+        if depth == 0:
+            await db.commit()
+    except BaseException:
+        if depth == 0:
+            await db.rollback()
+        raise
+    finally:
+        db.info[_DEPTH_KEY] = depth
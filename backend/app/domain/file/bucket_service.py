@@ -1,12 +1,14 @@
-import asyncio
 import mimetypes
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.domain.file.repository import FileRepo
 from app.domain.storage.repository import StorageRepo
 from app.domain.storage.schema import StorageOut
+from app.domain.storage.registry import storage_registry
 from app.domain.file.schema import FileCreate
+from app.domain.file.jobs import enqueue_upload, enqueue_delete
 from app.enums.enums import FileOrigin, FileState
 from app.infrastructure.llm.openai_manager import OpenAIManager
+from app.infrastructure.llm.answer_cache import answer_cache
 from app.infrastructure.yandex.yandex_s3_client import YandexS3Client
 from app.infrastructure.file_converter.file_converter import FileConverter
 
@@ -37,19 +39,6 @@ class FileBucketService:
             # Text files
             ".txt", ".md", ".html", ".json",
         )
-        self._storage_cache: dict[str, StorageOut] = {}
-
-    async def _get_storage_with_cache(
-        self, db: AsyncSession, bucket_name: str
-    ) -> StorageOut | None:
-        """Fetch storage config from cache or DB."""
-        if bucket_name in self._storage_cache:
-            return self._storage_cache[bucket_name]
-        
-        storage = await self.storage_repo.get_by_bucket_name(db, bucket_name)
-        if storage:
-            self._storage_cache[bucket_name] = storage
-        return storage
 
     async def process_yandex_messages(self, db: AsyncSession, payload: dict) -> None:
         messages = payload.get("messages", [])
@@ -63,7 +52,7 @@ class FileBucketService:
             if not object_id.lower().endswith(self.SUPPORTED_EXTENSIONS):
                 continue
 
-            storage = await self._get_storage_with_cache(db, bucket_id)
+            storage = await storage_registry.get_by_bucket(db, bucket_id)
             if not storage:
                 logger.error(f"No storage found for bucket {bucket_id}")
                 continue
@@ -80,13 +69,14 @@ class FileBucketService:
         if existing:
             logger.warning(f'File exists: {bucket} - {s3_key}')
             if existing.status == FileState.DELETING:
-                existing.status = FileState.STORED
-                existing.origin = FileOrigin.S3_IMPORT
-                await self.repo.update(db, existing.id, existing)
+                await self.repo.update_returning(db, existing.id, {
+                    "status": FileState.STORED,
+                    "origin": FileOrigin.S3_IMPORT,
+                })
+                await enqueue_upload(existing.id)
             return
         
-        s3_metadata = await asyncio.to_thread(
-            self.s3_client.get_object_metadata,
+        s3_metadata = await self.s3_client.get_object_metadata(
             bucket=bucket,
             key=s3_key
         )
@@ -103,7 +93,8 @@ class FileBucketService:
             origin=FileOrigin.S3_IMPORT,
             status=FileState.STORED,
         )
-        await self.repo.create(db, file)
+        created = await self.repo.create(db, file)
+        await enqueue_upload(created.id)
 
     async def _handle_delete(self, db: AsyncSession, bucket: str, s3_key: str) -> None:
         existing = await self.repo.get_by_s3_bucket_and_key(db, bucket, s3_key)
@@ -111,5 +102,7 @@ class FileBucketService:
         if not existing:
             logger.warning(f'File doesnt exist: {bucket} - {s3_key}')
             return
-        existing.status = FileState.DELETING
-        await self.repo.update(db, existing.id, existing)
+        await self.repo.update_returning(db, existing.id, {"status": FileState.DELETING})
+        if existing.vector_store_id:
+            await answer_cache.invalidate(existing.vector_store_id)
+        await enqueue_delete(existing.id)
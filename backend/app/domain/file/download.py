@@ -0,0 +1,204 @@
+# app/domain/file/download.py
+import re
+import urllib.parse
+from typing import AsyncIterator
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse, RedirectResponse
+from botocore.exceptions import ClientError
+from app.domain.file.schema import FileOut
+from app.infrastructure.yandex.yandex_s3_client import YandexS3Client
+from app.infrastructure.yandex.presign_cache import PresignedUrlCache, presigned_url_cache
+from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger()
+
+CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range_header(range_header: str | None, size: int) -> tuple[int, int] | None:
+    """
+    Parse a single-range `Range: bytes=...` header.
+
+    Returns an inclusive (start, end) tuple, or None when the whole object
+    should be served (no header, multi-range or unsupported unit).
+
+    Raises:
+        HTTPException(416): If the range cannot be satisfied for `size`.
+    """
+    if not range_header:
+        return None
+
+    match = _RANGE_RE.match(range_header.strip())
+    if not match:
+        # Multi-range / other units: RFC 7233 allows ignoring the header
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # Suffix range: last N bytes
+        length = int(last)
+        if length == 0:
+            raise _range_not_satisfiable(size)
+        start, end = max(size - length, 0), size - 1
+    else:
+        start = int(first)
+        end = int(last) if last else size - 1
+        end = min(end, size - 1)
+
+    if start >= size or start > end:
+        raise _range_not_satisfiable(size)
+
+    return start, end
+
+
+def _range_not_satisfiable(size: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+        detail="Requested range not satisfiable",
+        headers={"Content-Range": f"bytes */{size}"},
+    )
+
+
+def content_disposition_headers(name: str | None) -> dict[str, str]:
+    """Build an RFC 5987 Content-Disposition header with an ASCII fallback."""
+    if not name:
+        return {}
+
+    # Create a fallback ASCII filename by removing/replacing problematic characters
+    ascii_filename = name.encode('ascii', 'ignore').decode('ascii')
+    if not ascii_filename:
+        ascii_filename = "download"
+
+    # RFC 5987 encoded filename for full Unicode support
+    encoded_filename = urllib.parse.quote(name, safe='')
+
+    # Include both for maximum browser compatibility
+    return {
+        "Content-Disposition": (
+            f'attachment; filename="{ascii_filename}"; '
+            f"filename*=UTF-8''{encoded_filename}"
+        ),
+    }
+
+
+async def stream_file_from_s3(
+    s3_client: YandexS3Client,
+    file: FileOut,
+    range_header: str | None = None,
+) -> StreamingResponse:
+    """
+    Stream an S3 object to the client without blocking the threadpool.
+
+    The body is pulled from the non-blocking aiobotocore stream one chunk at a
+    time, only when the ASGI server is ready to send more (backpressure), and
+    single `Range` requests are answered with 206 Partial Content.
+    """
+    if not file.s3_bucket or not file.s3_object_key:
+        raise HTTPException(status_code=404, detail="File not available for download")
+
+    size = file.size
+    if size is None:
+        try:
+            meta = await s3_client.get_object_metadata(file.s3_bucket, file.s3_object_key)
+            size = int(meta.get("ContentLength", 0))
+        except ClientError as e:
+            logger.error("S3 head_object failed for %s: %s", file.id, e)
+            raise HTTPException(status_code=404, detail="File not available for download") from e
+
+    byte_range = parse_range_header(range_header, size)
+
+    get_kwargs = {}
+    if byte_range:
+        get_kwargs["Range"] = f"bytes={byte_range[0]}-{byte_range[1]}"
+
+    try:
+        response = await s3_client.get_object(file.s3_bucket, file.s3_object_key, **get_kwargs)
+    except ClientError as e:
+        code = e.response.get("Error", {}).get("Code")
+        if code in ("404", "NoSuchKey"):
+            raise HTTPException(status_code=404, detail="File not available for download") from e
+        raise
+
+    body = response["Body"]
+
+    async def generate() -> AsyncIterator[bytes]:
+        async with body as stream:
+            while chunk := await stream.read(CHUNK_SIZE):
+                yield chunk
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Access-Control-Expose-Headers": "Content-Disposition, Content-Range, Content-Length, Accept-Ranges",
+        **content_disposition_headers(file.name),
+    }
+
+    if byte_range:
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+    else:
+        headers["Content-Length"] = str(response.get("ContentLength", size))
+        status_code = status.HTTP_200_OK
+
+    return StreamingResponse(
+        generate(),
+        status_code=status_code,
+        media_type=file.content_type or "application/octet-stream",
+        headers=headers,
+    )
+
+
+async def redirect_to_presigned_url(
+    s3_client: YandexS3Client,
+    cache: PresignedUrlCache,
+    file: FileOut,
+) -> RedirectResponse:
+    """
+    Redirect the client straight to S3 with a short-lived presigned URL,
+    so the API process never touches the file bytes.
+    """
+    if not file.s3_bucket or not file.s3_object_key:
+        raise HTTPException(status_code=404, detail="File not available for download")
+
+    url = await cache.get(file.s3_bucket, file.s3_object_key)
+    if not url:
+        url = await s3_client.presign_get(
+            file.s3_bucket,
+            file.s3_object_key,
+            expires_in=cache.expires_in,
+            response_content_type=file.content_type or "application/octet-stream",
+            response_content_disposition=content_disposition_headers(file.name).get("Content-Disposition"),
+        )
+        await cache.set(file.s3_bucket, file.s3_object_key, url)
+
+    return RedirectResponse(
+        url,
+        status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+async def build_download_response(
+    s3_client: YandexS3Client,
+    file: FileOut,
+    range_header: str | None = None,
+    mode: str | None = None,
+    cache: PresignedUrlCache | None = None,
+) -> StreamingResponse | RedirectResponse:
+    """
+    Serve a file according to FILE_DOWNLOAD_MODE.
+
+    In "redirect" mode the client re-sends its Range header to S3 itself,
+    so partial downloads keep working without touching the API.
+    """
+    mode = mode or settings.FILE_DOWNLOAD_MODE
+    if mode == "redirect":
+        return await redirect_to_presigned_url(s3_client, cache or presigned_url_cache, file)
+    return await stream_file_from_s3(s3_client, file, range_header)
@@ -0,0 +1,33 @@
+# app/domain/file/jobs.py
+from app.infrastructure.redis.client import redis_client
+from app.infrastructure.redis.stream_queue import RedisStreamQueue, safe_enqueue
+from app.core.config import settings
+
+
+WORKER_GROUP = "workers"
+
+upload_queue = RedisStreamQueue(
+    redis=redis_client,
+    stream="jobs:file:upload",
+    group=WORKER_GROUP,
+    max_retries=settings.JOB_QUEUE_MAX_RETRIES,
+    claim_idle_ms=settings.JOB_QUEUE_CLAIM_IDLE_SECONDS * 1000,
+)
+
+delete_queue = RedisStreamQueue(
+    redis=redis_client,
+    stream="jobs:file:delete",
+    group=WORKER_GROUP,
+    max_retries=settings.JOB_QUEUE_MAX_RETRIES,
+    claim_idle_ms=settings.JOB_QUEUE_CLAIM_IDLE_SECONDS * 1000,
+)
+
+
+async def enqueue_upload(file_id: int) -> None:
+    """Wake the upload worker for a STORED file."""
+    await safe_enqueue(upload_queue, {"file_id": file_id})
+
+
+async def enqueue_delete(file_id: int) -> None:
+    """Wake the delete worker for a DELETING file."""
+    await safe_enqueue(delete_queue, {"file_id": file_id})
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import String, Integer, Boolean, Enum as SQLEnum, DateTime
+from sqlalchemy import String, Integer, Boolean, Enum as SQLEnum, DateTime, Index, DDL, event, text
 from sqlalchemy.orm import Mapped, mapped_column
 from typing import Optional
 from app.database.connection import Base
@@ -9,6 +9,31 @@ from app.enums.enums import FileOrigin, FileState, DeleteStatus
 
 class File(Base, FullAuditMixin):
     __tablename__ = "files"
+    __table_args__ = (
+        # Keyset pagination on (created_at, id), overall and per vector store;
+        # btree scans backwards for the DESC page order
+        Index("ix_files_created_at_id", "created_at", "id"),
+        Index("ix_files_vector_store_created_at_id", "vector_store_id", "created_at", "id"),
+        # Trigram indexes for the admin `q` search (ILIKE '%q%', prefix, similarity)
+        Index("ix_files_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index(
+            "ix_files_s3_object_key_trgm", "s3_object_key",
+            postgresql_using="gin", postgresql_ops={"s3_object_key": "gin_trgm_ops"},
+        ),
+        # Storage events look rows up by (bucket, key); one row per object
+        Index("uq_files_s3_bucket_object_key", "s3_bucket", "s3_object_key", unique=True),
+        # Per-vector-store status counts (index-only scan)
+        Index("ix_files_vector_store_status", "vector_store_id", "status"),
+        # Worker claims: only rows waiting on a worker, in claim order
+        Index(
+            "ix_files_worker_queue", "status", "id",
+            postgresql_where=text("status IN ('STORED', 'INDEXING', 'DELETING')"),
+        ),
+        Index(
+            "ix_files_indexing_due", text("indexing_checked_at NULLS FIRST"),
+            postgresql_where=text("status = 'INDEXING'"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(
         Integer, primary_key=True, autoincrement=True
@@ -16,9 +41,7 @@ class File(Base, FullAuditMixin):
 
     # ---- Canonical S3 ----
     s3_bucket: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    s3_object_key: Mapped[Optional[str]] = mapped_column(
-        String, nullable=True, index=True
-    )
+    s3_object_key: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     s3_version_id: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     e_tag: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     sha256: Mapped[Optional[str]] = mapped_column(
@@ -47,6 +70,13 @@ class File(Base, FullAuditMixin):
     indexing_checked_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True),
         nullable=True,
+    )
+
+    # ---- Worker lease ----
+    claimed_by: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    claimed_until: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
         index=True,
     )
 
@@ -57,3 +87,12 @@ class File(Base, FullAuditMixin):
     deleted_openai: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     deleted_s3: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     last_delete_error: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+
+
+# gin_trgm_ops needs the extension before create_all builds the indexes
+# (migrations create it themselves)
+event.listen(
+    File.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
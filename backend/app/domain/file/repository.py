@@ -1,17 +1,21 @@
 # app/domain/file/repository.py
-from typing import Optional, List
+import json
+from datetime import datetime, timedelta
+from typing import Optional, List, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import delete, func, or_
+from sqlalchemy import delete, func, or_, text, tuple_, update, values, column, cast, any_, bindparam, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY
 
 from app.exceptions.exceptions import DatabaseError
 from app.common.base_repository import BaseRepository
 from app.domain.file.model import File
 from app.domain.file.schema import (
     FileCreate,
-    FileOut
+    FileOut,
+    FileSearchMode,
 )
-from app.enums.enums import FileState
+from app.enums.enums import FileState, FileOrigin
 
 
 class FileRepo(BaseRepository[File, FileOut, FileCreate]):
@@ -21,46 +25,129 @@ class FileRepo(BaseRepository[File, FileOut, FileCreate]):
         """Bind File model to schemas."""
         super().__init__(File, FileOut, FileCreate)
 
-    async def get_page(
+    def _page_query(
         self,
-        db: AsyncSession,
-        limit: int,
-        offset: int,
         q: str | None = None,
         status: FileState | None = None,
         bucket: str | None = None,
         vector_store_id: str | None = None,
-    ) -> tuple[list[FileOut], int]:
-        try:
-            stmt = select(File)
-
-            if vector_store_id:
-                stmt = stmt.where(File.vector_store_id == vector_store_id)
-            if bucket:
-                stmt = stmt.where(File.s3_bucket == bucket)
-            if status:
-                stmt = stmt.where(File.status == status)
-            if q:
-                like = f"%{q.strip()}%"
+        match: FileSearchMode = "contains",
+    ):
+        stmt = select(File)
+
+        if vector_store_id:
+            stmt = stmt.where(File.vector_store_id == vector_store_id)
+        if bucket:
+            stmt = stmt.where(File.s3_bucket == bucket)
+        if status:
+            stmt = stmt.where(File.status == status)
+        if q:
+            term = q.strip()
+            if match == "fuzzy":
+                # pg_trgm similarity operator (threshold: pg_trgm.similarity_threshold)
+                stmt = stmt.where(or_(
+                    File.name.op("%")(term),
+                    File.s3_object_key.op("%")(term),
+                ))
+            else:
+                like = f"{term}%" if match == "prefix" else f"%{term}%"
                 stmt = stmt.where(or_(
                     File.name.ilike(like),
                     File.s3_object_key.ilike(like),
                 ))
+        return stmt
 
-            # total
-            count_stmt = select(func.count()).select_from(stmt.subquery())
-            total = (await db.execute(count_stmt)).scalar_one()
+    async def get_page(
+        self,
+        db: AsyncSession,
+        limit: int,
+        offset: int = 0,
+        q: str | None = None,
+        status: FileState | None = None,
+        bucket: str | None = None,
+        vector_store_id: str | None = None,
+        after: tuple[datetime, int] | None = None,
+        match: FileSearchMode = "contains",
+    ) -> list[FileOut]:
+        """
+        Newest-first page of files.
 
-            # page
-            stmt = stmt.order_by(File.created_at.desc()).limit(limit).offset(offset)
-            res = await db.execute(stmt)
-            rows = res.scalars().all()
-            items = [FileOut.model_validate(x) for x in rows]
-            return items, int(total)
+        With `after` (the (created_at, id) of the last row already shown) the
+        page is fetched by keyset on ix_files_*created_at_id and `offset` is
+        ignored, so deep pages cost the same as the first one. A fuzzy `q`
+        ranks by trigram similarity first and only supports `offset`.
+        """
+        try:
+            stmt = self._page_query(q, status, bucket, vector_store_id, match)
+            if after is not None:
+                stmt = stmt.where(tuple_(File.created_at, File.id) < tuple_(*after))
+            else:
+                stmt = stmt.offset(offset)
+
+            if q and match == "fuzzy":
+                term = q.strip()
+                stmt = stmt.order_by(func.greatest(
+                    func.similarity(File.name, term),
+                    func.similarity(File.s3_object_key, term),
+                ).desc())
 
+            stmt = stmt.order_by(File.created_at.desc(), File.id.desc()).limit(limit)
+            res = await db.execute(stmt)
+            return [FileOut.model_validate(x) for x in res.scalars().all()]
         except Exception as e:
             raise DatabaseError(f"Failed to fetch files page: {e}") from e
 
+    async def count_page(
+        self,
+        db: AsyncSession,
+        q: str | None = None,
+        status: FileState | None = None,
+        bucket: str | None = None,
+        vector_store_id: str | None = None,
+        match: FileSearchMode = "contains",
+    ) -> int:
+        """Exact number of files matching the page filters."""
+        try:
+            stmt = self._page_query(q, status, bucket, vector_store_id, match)
+            count_stmt = select(func.count()).select_from(stmt.with_only_columns(File.id).subquery())
+            return int((await db.execute(count_stmt)).scalar_one())
+        except Exception as e:
+            raise DatabaseError(f"Failed to count files: {e}") from e
+
+    async def estimate_page_count(
+        self,
+        db: AsyncSession,
+        q: str | None = None,
+        status: FileState | None = None,
+        bucket: str | None = None,
+        vector_store_id: str | None = None,
+        match: FileSearchMode = "contains",
+    ) -> int:
+        """
+        Planner estimate of the number of matching files, without scanning them.
+
+        Unfiltered pages read pg_class.reltuples; filtered ones take the row
+        estimate from EXPLAIN. Accuracy depends on how fresh ANALYZE is.
+        """
+        try:
+            if not any((q, status, bucket, vector_store_id)):
+                reltuples = (await db.execute(
+                    text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'files'::regclass")
+                )).scalar_one()
+                if reltuples >= 0:
+                    return int(reltuples)
+
+            stmt = self._page_query(q, status, bucket, vector_store_id, match).with_only_columns(File.id)
+            compiled = stmt.compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True})
+            # Run as-is: text() would read a ":word" in the search term as a bind parameter
+            conn = await db.connection()
+            plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar_one()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+        except Exception as e:
+            raise DatabaseError(f"Failed to estimate file count: {e}") from e
+
     async def get_by_storage_key(
         self,
         db: AsyncSession,
@@ -78,6 +165,34 @@ class FileRepo(BaseRepository[File, FileOut, FileCreate]):
             return FileOut.model_validate(file_entity)
         except Exception as e:
             raise DatabaseError(f"Failed to retrieve file by storage key '{storage_key}': {str(e)}") from e
+
+    async def get_by_storage_keys(
+        self,
+        db: AsyncSession,
+        storage_keys: Sequence[str],
+    ) -> dict[str, FileOut]:
+        """
+        Files by storage_key in one round trip, keyed by storage_key.
+
+        Bound as a single array parameter (`= ANY($1)`), so every batch size
+        reuses the same prepared statement. Missing keys are simply absent.
+        """
+        if not storage_keys:
+            return {}
+        try:
+            result = await db.execute(
+                select(File)
+                .where(File.storage_key == any_(
+                    bindparam("storage_keys", list(storage_keys), type_=ARRAY(String))
+                ))
+                .order_by(File.id)
+            )
+            files: dict[str, FileOut] = {}
+            for entity in result.scalars():
+                files.setdefault(entity.storage_key, FileOut.model_validate(entity))
+            return files
+        except Exception as e:
+            raise DatabaseError(f"Failed to retrieve files by storage keys: {e}") from e
         
     async def get_by_s3_bucket_and_key(
         self,
@@ -127,10 +242,10 @@ class FileRepo(BaseRepository[File, FileOut, FileCreate]):
                 File.vector_store_id == vector_store_id
             )
             result = await db.execute(stmt)
-            await db.commit()
+            await self._commit(db)
             return result.rowcount
         except Exception as e:
-            await db.rollback()  # Rollback on error
+            await self._rollback(db)  # Rollback on error
             raise DatabaseError(f"Failed to delete files by vector store ID '{vector_store_id}': {str(e)}") from e
     
     async def get_by_sha256(
@@ -196,3 +311,129 @@ class FileRepo(BaseRepository[File, FileOut, FileCreate]):
         )
         result = await db.execute(query)
         return result.scalar() or 0
+
+    async def claim_batch(
+        self,
+        db: AsyncSession,
+        worker_id: str,
+        status: FileState,
+        limit: int,
+        lease_seconds: int,
+        origins: Sequence[FileOrigin] | None = None,
+        after_id: int | None = None,
+        order_by: Sequence | None = None,
+        ids: Sequence[int] | None = None,
+    ) -> list[FileOut]:
+        """
+        Atomically lease up to `limit` rows in `status` for `worker_id`.
+
+        Candidate rows are locked with FOR UPDATE SKIP LOCKED, so concurrent
+        workers never block on or double-claim the same row. Rows whose lease
+        has expired (crashed worker) are eligible again. `ids` restricts the
+        claim to specific rows (queue-driven jobs).
+        """
+        try:
+            now = func.now()
+            candidates = (
+                select(File.id)
+                .where(
+                    File.status == status,
+                    or_(File.claimed_until.is_(None), File.claimed_until < now),
+                )
+                .order_by(*(order_by or (File.id,)))
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            if origins:
+                candidates = candidates.where(File.origin.in_(origins))
+            if after_id is not None:
+                candidates = candidates.where(File.id > after_id)
+            if ids is not None:
+                candidates = candidates.where(File.id.in_(ids))
+
+            stmt = (
+                update(File)
+                .where(File.id.in_(candidates.scalar_subquery()))
+                .values(
+                    claimed_by=worker_id,
+                    claimed_until=now + timedelta(seconds=lease_seconds),
+                )
+                .returning(File)
+                .execution_options(synchronize_session=False)
+            )
+            result = await db.execute(stmt)
+            rows = result.scalars().all()
+            await self._commit(db)
+
+            items = [FileOut.model_validate(x) for x in rows]
+            return sorted(items, key=lambda f: f.id)
+        except Exception as e:
+            await self._rollback(db)
+            raise DatabaseError(f"Failed to claim files in status '{status}': {e}") from e
+
+    async def release_claims(
+        self,
+        db: AsyncSession,
+        ids: Sequence[int],
+        worker_id: str,
+    ) -> None:
+        """Drop leases held by `worker_id` so rows can be picked up again right away."""
+        if not ids:
+            return
+        try:
+            await db.execute(
+                update(File)
+                .where(File.id.in_(ids), File.claimed_by == worker_id)
+                .values(claimed_by=None, claimed_until=None)
+                .execution_options(synchronize_session=False)
+            )
+            await self._commit(db)
+        except Exception as e:
+            await self._rollback(db)
+            raise DatabaseError(f"Failed to release file claims: {e}") from e
+
+    async def bulk_update_indexing_status(
+        self,
+        db: AsyncSession,
+        updates: Sequence[tuple[int, FileState | None, str | None]],
+    ) -> int:
+        """
+        Apply indexing results in one UPDATE ... FROM (VALUES ...) statement.
+
+        Each update is (file_id, new_status or None, last_error or None);
+        None leaves the column unchanged. Every listed row gets a fresh
+        `indexing_checked_at`. Only rows still INDEXING are touched, so a
+        concurrent delete is never overwritten.
+        """
+        if not updates:
+            return 0
+        try:
+            # Enum columns store member names; literal binds keep the VALUES
+            # list typed without per-parameter casts
+            v = values(
+                column("id", Integer),
+                column("status", String),
+                column("last_error", String),
+                name="v",
+                literal_binds=True,
+            ).data([
+                (file_id, status.name if status else None, error)
+                for file_id, status, error in updates
+            ])
+
+            stmt = (
+                update(File)
+                .where(File.id == v.c.id, File.status == FileState.INDEXING)
+                .values(
+                    status=func.coalesce(cast(v.c.status, File.__table__.c.status.type), File.status),
+                    last_error=func.coalesce(v.c.last_error, File.last_error),
+                    indexing_checked_at=func.now(),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            result = await db.execute(stmt)
+            await self._commit(db)
+            return result.rowcount
+        except Exception as e:
+            await self._rollback(db)
+            raise DatabaseError(f"Failed to bulk update indexing status: {e}") from e
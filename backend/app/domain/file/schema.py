@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Literal
 from pydantic import (
     BaseModel,
     ConfigDict,
@@ -91,8 +92,51 @@ class FileOut(CamelModel):
     )
 
 
+class MultipartUploadInit(CamelModel):
+    """Client request to start a direct-to-S3 multipart upload."""
+    name: str = Field(..., min_length=1)
+    size: int = Field(..., gt=0)
+    content_type: str | None = None
+    # Optional client-side hash; lets duplicates be rejected before any bytes move
+    sha256: str | None = Field(None, min_length=64, max_length=64)
+
+
+class PresignedPart(CamelModel):
+    part_number: int
+    url: str
+
+
+class MultipartUploadInitOut(CamelModel):
+    file_id: int
+    upload_id: str
+    key: str
+    part_size: int
+    expires_in: int
+    parts: list[PresignedPart]
+
+
+class UploadedPart(CamelModel):
+    part_number: int = Field(..., ge=1)
+    e_tag: str
+
+
+class MultipartUploadComplete(CamelModel):
+    upload_id: str
+    parts: list[UploadedPart] = Field(..., min_length=1)
+    # Optional client-side hash; verified against the stored object
+    sha256: str | None = Field(None, min_length=64, max_length=64)
+
+
+# How the files page `q` is matched; all three are served by the trigram indexes
+FileSearchMode = Literal["contains", "prefix", "fuzzy"]
+
+
 class FilesPage(CamelModel):
     items: list[FileOut]
-    total: int
+    # None when count=none; planner estimate when total_estimated
+    total: int | None
     limit: int
     offset: int
+    # Pass back as `cursor` to fetch the next page by keyset; None on the last page
+    next_cursor: str | None = None
+    total_estimated: bool = False
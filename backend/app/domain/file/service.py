@@ -1,25 +1,38 @@
-import asyncio
-import urllib
 import mimetypes
-import os
 import hashlib
-import tempfile
 from pathlib import Path
 from fastapi import (
     HTTPException,
     UploadFile,
     status
 )
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.domain.file.repository import FileRepo
 from app.domain.storage.repository import StorageRepo
-from app.domain.file.schema import FileCreate, FileOut
+from app.domain.storage.registry import storage_registry
+from app.domain.file.schema import (
+    FileCreate,
+    FileOut,
+    FileSearchMode,
+    MultipartUploadInit,
+    MultipartUploadInitOut,
+    MultipartUploadComplete,
+    PresignedPart,
+)
+from app.domain.file.download import build_download_response
+from app.common.pagination import CountMode, encode_cursor, decode_cursor
+from app.database.unit_of_work import unit_of_work
+from app.domain.file.jobs import enqueue_upload
+from app.domain.file.upload_pipeline import S3UploadSink, OpenAIUploadSink, tee_upload
 from app.domain.user.schema import UserOutSchema
 from app.infrastructure.llm.openai_manager import OpenAIManager
-from app.infrastructure.yandex.yandex_s3_client import YandexS3Client
+from app.infrastructure.llm.answer_cache import answer_cache
+from app.infrastructure.yandex.yandex_s3_client import YandexS3Client, MULTIPART_THRESHOLD
+from app.infrastructure.yandex.presign_cache import presigned_url_cache
+from app.infrastructure.redis.count_cache import file_count_cache
 from app.infrastructure.file_converter.file_converter import FileConverter
-from app.enums.enums import FileOrigin, FileState, DeleteStatus, UserRole
+from app.enums.enums import FileOrigin, FileState, UserRole
 from app.exceptions.exceptions import NotFoundError
 from app.core.config import settings
 
@@ -57,22 +70,66 @@ class FileService:
         self,
         db: AsyncSession,
         limit: int,
-        offset: int,
+        offset: int = 0,
         q: str | None = None,
         status: FileState | None = None,
         bucket: str | None = None,
         vector_store_id: str | None = None,
+        cursor: str | None = None,
+        count: CountMode = "exact",
+        match: FileSearchMode = "contains",
     ):
-        items, total = await self.repo.get_page(
-            db=db,
-            limit=limit,
-            offset=offset,
-            q=q,
-            status=status,
-            bucket=bucket,
-            vector_store_id=vector_store_id,
-        )
-        return {"items": items, "total": total, "limit": limit, "offset": offset}
+        """
+        Newest-first page of files.
+
+        `cursor` (from a previous `next_cursor`) switches to keyset paging and
+        overrides `offset`. `count` picks how `total` is produced: "exact"
+        COUNT(*), "cached" COUNT(*) shared via Redis for a few seconds,
+        "estimate" from planner statistics, or "none" to skip it. `match`
+        selects substring, prefix or fuzzy (similarity-ranked) search for `q`.
+        """
+        ranked = bool(q) and match == "fuzzy"
+        if cursor and ranked:
+            raise HTTPException(status_code=400, detail="cursor is not supported with match=fuzzy")
+
+        after = None
+        if cursor:
+            try:
+                after = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        filters = {
+            "q": q, "status": status, "bucket": bucket,
+            "vector_store_id": vector_store_id, "match": match,
+        }
+
+        # One extra row tells whether there is a next page
+        items = await self.repo.get_page(db=db, limit=limit + 1, offset=offset, after=after, **filters)
+        has_more = len(items) > limit
+        items = items[:limit]
+        # Keyset cursors follow (created_at, id); a ranked page has no such order
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id) if has_more and not ranked else None
+
+        if count == "none":
+            total = None
+        elif count == "estimate":
+            total = await self.repo.estimate_page_count(db, **filters)
+        elif count == "cached":
+            total = await file_count_cache.get_or_compute(
+                filters, lambda: self.repo.count_page(db, **filters)
+            )
+        else:
+            total = await self.repo.count_page(db, **filters)
+
+        return {
+            "items": items,
+            "total": total,
+            "limit": limit,
+            "offset": 0 if after else offset,
+            "next_cursor": next_cursor,
+            "total_estimated": count == "estimate",
+        }
 
     async def delete_by_id(self, db: AsyncSession, file_id: int) -> FileOut | None:
         if self.user.role == UserRole.USER:
@@ -92,33 +149,25 @@ class FileService:
         if (not file.deleted_openai) and file.vector_store_id and file.storage_key:
             try:
                 await self.manager.delete_file(file.vector_store_id, file.storage_key)
-                await self.repo.update(db, file_id, {"deleted_openai": True})
+                await answer_cache.invalidate(file.vector_store_id)
+                await self.repo.update_returning(db, file_id, {"deleted_openai": True})
             except Exception as e:
                 logger.error("Delete OpenAI failed for %s: %s", file_id, e)
-                await self.repo.update(
-                    db, file_id,
-                    {
-                        "delete_status": DeleteStatus.FAILED,
-                        "last_delete_error": f"OpenAI: {str(e)}"
-                    }
-                )
+                await self.repo.update_returning(db, file_id, {"last_delete_error": f"OpenAI: {str(e)}"})
                 raise HTTPException(status_code=500, detail=str(e)) from e
 
         # 2. Delete from S3
         if (not file.deleted_s3) and file.s3_bucket and file.s3_object_key:
             try:
-                await asyncio.to_thread(
-                    self.s3_client.delete_file,
+                await self.s3_client.delete_file(
                     file.s3_bucket,
                     file.s3_object_key
                 )
-                await self.repo.update(db, file_id, {"deleted_s3": True})
+                await presigned_url_cache.invalidate(file.s3_bucket, file.s3_object_key)
+                await self.repo.update_returning(db, file_id, {"deleted_s3": True})
             except Exception as e:
                 logger.error("Delete S3 failed for %s: %s", file_id, e)
-                await self.repo.update(db, file_id, {
-                    "delete_status": DeleteStatus.FAILED,
-                    "last_delete_error": f"S3: {str(e)}"
-                })
+                await self.repo.update_returning(db, file_id, {"last_delete_error": f"S3: {str(e)}"})
                 raise HTTPException(status_code=500, detail=str(e)) from e
 
         # 3. Finalize in DB
@@ -126,10 +175,7 @@ class FileService:
             await self.repo.delete_by_id(db, file_id)
         except Exception as e:
             logger.error("Final DB update failed for %s: %s", file_id, e)
-            await self.repo.update(db, file_id, {
-                "delete_status": DeleteStatus.FAILED,
-                "last_delete_error": f"DB: {str(e)}"
-            })
+            await self.repo.update_returning(db, file_id, {"last_delete_error": f"DB: {str(e)}"})
             raise HTTPException(status_code=500, detail=str(e)) from e
         
         return None
@@ -140,7 +186,12 @@ class FileService:
 
     async def create_file(self, db: AsyncSession, uploaded_file: UploadFile) -> FileOut | None:
         """
-        Upload a file to OpenAI vector store and record it in MongoDB.
+        Upload a file to S3 and the OpenAI vector store and record it in the DB.
+
+        The upload is read once: each chunk feeds the SHA-256 hasher, the S3
+        upload and (for formats that need no conversion) the OpenAI upload
+        concurrently. Files that need conversion are left STORED for the
+        upload worker.
         """
         if self.user.role == UserRole.USER:
             raise HTTPException(
@@ -152,7 +203,7 @@ class FileService:
         
         vector_store_id = await self._resolve_vector_store_id(db)
 
-        storage = await self.storage_repo.get_by_vector_store_id(db, vector_store_id)
+        storage = await storage_registry.get_by_vector_store_id(db, vector_store_id)
         if not storage:
             raise HTTPException(
                 status_code=400,
@@ -164,122 +215,270 @@ class FileService:
         original_name = uploaded_file.filename or "file.unknown"
         original_ct = uploaded_file.content_type or mimetypes.guess_type(original_name)[0]
 
-        tmp_orig: Path | None = None
-        tmp_conv: Path | None = None
-        new_doc: FileOut | None = None
-
-        try:
-            # 1. Persist original to disk + hash
-            tmp_orig, size_bytes, sha256_hex = await self._persist_upload_to_tempfile_with_hash(
-                uploaded_file,
-                suffix=self._suffix_from_name(original_name)
-            )
-
-            # 2. Deduplication check
-            await self._check_for_duplication(db, sha256_hex, original_name)
-
-            # 3. Save metadata
+        # 1. Save metadata; the key is set up-front (same transaction) so the
+        #    bucket webhook recognises the object as already tracked
+        async with unit_of_work(db):
             new_doc = await self.repo.create(db, FileCreate(
                 s3_bucket=bucket,
                 name=original_name,
-                size=size_bytes,
+                size=uploaded_file.size,
                 vector_store_id=vector_store_id,
                 content_type=original_ct,
-                sha256=sha256_hex,
+                status=FileState.UPLOADING,
             ))
+            s3_key = f"{new_doc.id}:{Path(original_name).name}"
+            await self.repo.update_returning(db, new_doc.id, {"s3_object_key": s3_key})
+
+        s3_sink = S3UploadSink(self.s3_client, bucket, s3_key, original_ct)
+        openai_sink: OpenAIUploadSink | None = None
+        if uploaded_file.size is not None and not self.converter.needs_conversion(original_name):
+            openai_sink = OpenAIUploadSink(self.manager, original_name, uploaded_file.size, original_ct)
 
-            # 4. Upload to S3
-            await self._upload_to_s3(
-                db=db,
-                tmp_orig=str(tmp_orig),
-                bucket=bucket,
-                original_name=original_name,
-                original_ct=original_ct,
-                doc_id=new_doc.id
+        try:
+            # 2. Single pass: hash + S3 + OpenAI
+            await uploaded_file.seek(0)
+            result = await tee_upload(
+                uploaded_file.read,
+                [s3_sink, openai_sink] if openai_sink else [s3_sink],
             )
+            e_tag = result.results[0]
+            openai_file = result.results[1] if openai_sink else None
+        except Exception as e:
+            await self.repo.update_returning(db, new_doc.id, {
+                "status": FileState.UPLOAD_FAILED,
+                "last_error": str(e)
+            })
+            logger.exception("File pipeline failed for %s", original_name)
+            raise e
 
-            # 6. Upload to OpenAI
-            final_doc, tmp_conv = await self._upload_to_openai(
-                db=db,
-                tmp_orig=tmp_orig,
-                original_name=original_name,
-                vector_store_id=vector_store_id,
-                doc_id=new_doc.id
+        # 3. Deduplication check (the hash is only known after the single pass)
+        existing = await self.repo.get_by_sha256(db, result.sha256)
+        if existing:
+            await self._discard_upload(db, new_doc.id, bucket, s3_key, vector_store_id, openai_file)
+            logger.info("File already exists (SHA256 match): %s", original_name)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="File with the same content already exists."
             )
 
-            return final_doc
+        try:
+            # 4. Attach to vector store, or hand conversion formats to the worker
+            update = {"size": result.size, "sha256": result.sha256, "e_tag": e_tag}
+            if openai_file:
+                await self.manager.attach_to_vector_store(vector_store_id, openai_file.id)
+                update.update({"storage_key": openai_file.id, "status": FileState.INDEXING})
+            else:
+                update["status"] = FileState.STORED
+
+            saved = await self.repo.update_returning(db, new_doc.id, update)
+            if saved.status == FileState.STORED:
+                await enqueue_upload(saved.id)
+            return saved
         except Exception as e:
-            if new_doc:
-                await self.repo.update(db, new_doc.id, {
-                    "status": FileState.UPLOAD_FAILED,
-                    "last_error": str(e)
-                })
+            if openai_file:
+                # Nothing references it once the row is failed
+                try:
+                    await self.manager.delete_file(vector_store_id, openai_file.id)
+                except Exception as delete_error:
+                    logger.warning("Failed to delete OpenAI file %s: %s", openai_file.id, delete_error)
+            await self.repo.update_returning(db, new_doc.id, {
+                "status": FileState.UPLOAD_FAILED,
+                "last_error": str(e)
+            })
             logger.exception("File pipeline failed for %s", original_name)
             raise e
-        finally:
-            # cleanup original temp
-            if tmp_orig and tmp_orig.exists():
-                try:
-                    tmp_orig.unlink(missing_ok=True)
-                except Exception as e:
-                    logger.warning("Failed to delete temp file %s: %s", tmp_orig, e)
 
-            # cleanup converted temp
-            if tmp_conv and tmp_conv.exists():
-                try:
-                    tmp_conv.unlink(missing_ok=True)
-                except Exception as e:
-                    logger.warning("Failed to delete converted temp %s: %s", tmp_conv, e)
+    async def init_multipart_upload(
+        self,
+        db: AsyncSession,
+        data: MultipartUploadInit,
+    ) -> MultipartUploadInitOut:
+        """
+        Start a direct-to-S3 multipart upload.
 
-    async def download_file(self, db: AsyncSession, file_id: int):
+        Creates the DB row (UPLOADING) and returns presigned `upload_part` URLs,
+        so the client sends the bytes straight to the bucket and the API pod
+        never holds them.
+        """
+        if self.user.role == UserRole.USER:
+            raise HTTPException(
+                status_code=403,
+                detail='Insufficient permissions: File upload requires elevated privileges.'
+            )
 
-        file = await self.repo.get_by_id(db, file_id)
-        if not file:
-            raise HTTPException(status_code=404, detail='File with provided id is not found.')
-        
-        if not file.s3_bucket or not file.s3_object_key:
-            raise HTTPException(status_code=404, detail="File not available for download")
-        
-        # self.s3_client.download_file(file.s3_bucket, file.s3_object_key)
-        def generate():
-            response = self.s3_client.s3.get_object(
-                Bucket=file.s3_bucket, 
-                Key=file.s3_object_key
+        if data.size > settings.MAX_FILE_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="File too large"
             )
-            stream = response['Body']
-            try:
-                while chunk := stream.read(CHUNK_SIZE):
-                    yield chunk
-            finally:
-                stream.close()
 
-        # Build headers dict, only include Content-Length if size is known
-        headers = {}
-    
-        if file.name:
-            # Create a fallback ASCII filename by removing/replacing problematic characters
-            ascii_filename = file.name.encode('ascii', 'ignore').decode('ascii')
-            if not ascii_filename:
-                ascii_filename = "download"
-
-            # RFC 5987 encoded filename for full Unicode support
-            encoded_filename = urllib.parse.quote(file.name, safe='')
-
-            # Include both for maximum browser compatibility
-            headers["Content-Disposition"] = (
-                f'attachment; filename="{ascii_filename}"; '
-                f"filename*=UTF-8''{encoded_filename}"
+        if data.sha256:
+            await self._check_for_duplication(db, data.sha256.lower(), data.name)
+
+        vector_store_id = await self._resolve_vector_store_id(db)
+        storage = await storage_registry.get_by_vector_store_id(db, vector_store_id)
+        if not storage:
+            raise HTTPException(
+                status_code=400,
+                detail="Необходимо выбрать хранилище перед загрузкой файлов."
             )
-            headers["Access-Control-Expose-Headers"] = "Content-Disposition"
 
-        # if file.size:
-        #     headers["Content-Length"] = str(file.size)
+        bucket = settings.S3_BUCKET
+        content_type = data.content_type or mimetypes.guess_type(data.name)[0]
+
+        # Same key layout as server-side uploads; set up-front (same
+        # transaction) so the bucket webhook recognises the object as tracked
+        async with unit_of_work(db):
+            new_doc = await self.repo.create(db, FileCreate(
+                s3_bucket=bucket,
+                name=data.name,
+                size=data.size,
+                vector_store_id=vector_store_id,
+                content_type=content_type,
+                origin=FileOrigin.DIRECT_UPLOAD,
+                status=FileState.UPLOADING,
+            ))
+            s3_key = f"{new_doc.id}:{Path(data.name).name}"
+            await self.repo.update_returning(db, new_doc.id, {"s3_object_key": s3_key})
+
+        extra = {"ContentType": content_type} if content_type else {}
 
-        return StreamingResponse(
-            generate(),
-            media_type=file.content_type or "application/octet-stream",
-            headers=headers
+        try:
+            upload_id = await self.s3_client.create_multipart_upload(bucket, s3_key, **extra)
+
+            part_count = max(1, -(-data.size // MULTIPART_THRESHOLD))
+            expires_in = settings.PRESIGNED_UPLOAD_EXPIRES
+            parts = [
+                PresignedPart(
+                    part_number=n,
+                    url=await self.s3_client.presign_upload_part(
+                        bucket, s3_key, upload_id, n, expires_in=expires_in
+                    ),
+                )
+                for n in range(1, part_count + 1)
+            ]
+        except Exception as e:
+            await self.repo.update_returning(db, new_doc.id, {
+                "status": FileState.UPLOAD_FAILED,
+                "last_error": str(e)
+            })
+            logger.exception("Failed to start multipart upload for %s", data.name)
+            raise HTTPException(status_code=502, detail="Failed to start upload") from e
+
+        return MultipartUploadInitOut(
+            file_id=new_doc.id,
+            upload_id=upload_id,
+            key=s3_key,
+            part_size=MULTIPART_THRESHOLD,
+            expires_in=expires_in,
+            parts=parts,
         )
+
+    async def complete_multipart_upload(
+        self,
+        db: AsyncSession,
+        file_id: int,
+        data: MultipartUploadComplete,
+    ) -> FileOut:
+        """
+        Finalize a direct upload: complete the multipart object, hash it with a
+        streamed S3 read, dedupe, and hand the file to the upload worker (STORED).
+        """
+        if self.user.role == UserRole.USER:
+            raise HTTPException(
+                status_code=403,
+                detail='Insufficient permissions: File upload requires elevated privileges.'
+            )
+
+        file = await self._get_pending_direct_upload(db, file_id)
+
+        try:
+            result = await self.s3_client.complete_multipart_upload(
+                file.s3_bucket,
+                file.s3_object_key,
+                data.upload_id,
+                [{"PartNumber": p.part_number, "ETag": p.e_tag} for p in data.parts],
+            )
+        except Exception as e:
+            await self.repo.update_returning(db, file_id, {
+                "status": FileState.UPLOAD_FAILED,
+                "last_error": f"S3: {str(e)}"
+            })
+            logger.exception("Failed to complete multipart upload for %s", file_id)
+            raise HTTPException(status_code=400, detail="Failed to complete upload") from e
+
+        size_bytes, sha256_hex = await self._hash_s3_object(file.s3_bucket, file.s3_object_key)
+
+        rejection: HTTPException | None = None
+        if size_bytes > settings.MAX_FILE_SIZE:
+            rejection = HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="File too large"
+            )
+        elif data.sha256 and data.sha256.lower() != sha256_hex:
+            rejection = HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="SHA-256 mismatch between declared and uploaded content."
+            )
+        else:
+            existing = await self.repo.get_by_sha256(db, sha256_hex)
+            if existing and existing.id != file_id:
+                logger.info("File already exists (SHA256 match): %s", file.name)
+                rejection = HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="File with the same content already exists."
+                )
+
+        if rejection:
+            await self.s3_client.delete_file(file.s3_bucket, file.s3_object_key)
+            await self.repo.update_returning(db, file_id, {
+                "status": FileState.UPLOAD_FAILED,
+                "deleted_s3": True,
+                "last_error": rejection.detail,
+            })
+            raise rejection
+
+        saved = await self.repo.update_returning(db, file_id, {
+            "size": size_bytes,
+            "sha256": sha256_hex,
+            "e_tag": (result or {}).get("ETag"),
+            "status": FileState.STORED,
+        })
+        await enqueue_upload(file_id)
+        return saved
+
+    async def abort_multipart_upload(
+        self,
+        db: AsyncSession,
+        file_id: int,
+        upload_id: str,
+    ) -> None:
+        """Abort an unfinished direct upload and release its S3 parts."""
+        if self.user.role == UserRole.USER:
+            raise HTTPException(
+                status_code=403,
+                detail='Insufficient permissions: File upload requires elevated privileges.'
+            )
+
+        file = await self._get_pending_direct_upload(db, file_id)
+        await self.s3_client.abort_multipart_upload(file.s3_bucket, file.s3_object_key, upload_id)
+        await self.repo.update_returning(db, file_id, {
+            "status": FileState.UPLOAD_FAILED,
+            "last_error": "Upload aborted by client"
+        })
+
+    async def download_file(
+        self,
+        db: AsyncSession,
+        file_id: int,
+        range_header: str | None = None
+    ) -> StreamingResponse | RedirectResponse:
+
+        file = await self.repo.get_by_id(db, file_id)
+        if not file:
+            raise HTTPException(status_code=404, detail='File with provided id is not found.')
+
+        return await build_download_response(self.s3_client, file, range_header)
     
     async def get_files_for_vector_store(self, vector_store_id: str):
         """Get vector store files."""
@@ -296,13 +495,13 @@ class FileService:
         )
         return rows
 
-    def list_buckets(self):
+    async def list_buckets(self):
 
-        return self.s3_client.list_buckets()
+        return await self.s3_client.list_buckets()
     
-    def list_objects(self, bucket: str):
+    async def list_objects(self, bucket: str):
 
-        return self.s3_client.list_objects(bucket)
+        return await self.s3_client.list_objects(bucket)
     
     # ---------- helpers ----------
     def _validate_file_size(self, uploaded_file: UploadFile):
@@ -326,125 +525,50 @@ class FileService:
                 detail="File with the same content already exists."
             )
 
-    async def _save_upload_to_disk(self, uploaded_file: UploadFile) -> Path:
-        suffix = self._suffix_from_name(uploaded_file.filename or "")
-        tmp_orig, _, _ = await self._persist_upload_to_tempfile_with_hash(uploaded_file, suffix)
-        return tmp_orig
-
-    async def _upload_to_s3(
+    async def _get_pending_direct_upload(self, db: AsyncSession, file_id: int) -> FileOut:
+        file = await self.repo.get_by_id(db, file_id)
+        if not file or file.origin != FileOrigin.DIRECT_UPLOAD:
+            raise HTTPException(status_code=404, detail='File with provided id is not found.')
+        if file.status != FileState.UPLOADING or not file.s3_object_key:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Upload is not in progress (status: {file.status.value})."
+            )
+        return file
+
+    async def _hash_s3_object(self, bucket: str, key: str) -> tuple[int, str]:
+        """Compute (size, sha256) of an S3 object with a streamed read."""
+        sha256 = hashlib.sha256()
+        total = 0
+        response = await self.s3_client.get_object(bucket, key)
+        async with response["Body"] as stream:
+            while chunk := await stream.read(CHUNK_SIZE):
+                sha256.update(chunk)
+                total += len(chunk)
+        return total, sha256.hexdigest()
+
+    async def _discard_upload(
         self,
         db: AsyncSession,
-        tmp_orig: str,
+        doc_id: int,
         bucket: str,
-        original_name: str,
-        original_ct: str | None,
-        doc_id: int
-    ):
-        safe_filename = Path(original_name).name
-        s3_key = f"{doc_id}:{safe_filename}"
-
-        await asyncio.to_thread(
-            self.s3_client.upload_file,
-            bucket=bucket,
-            local_path=str(tmp_orig),
-            key=s3_key,
-            content_type=original_ct
-        )
-
-        await self.repo.update(db, doc_id, {
-            "s3_object_key": s3_key,
-            "status": FileState.STORED
-        })
-
-    async def _upload_to_openai(
-        self,
-        db: AsyncSession,
-        tmp_orig: Path,
-        original_name: str,
+        s3_key: str,
         vector_store_id: str,
-        doc_id: int
-    ) -> tuple[FileOut, Path | None]:
-        # 5. Convert if needed
-        openai_path, _ = await self.converter.convert(
-            tmp_orig,
-            original_name
-        )
-
-        openai_file = await self.manager.create_file_from_path(
-            str(openai_path),
-            vector_store_id
-        )
-
-        # 7. Final update
-        final_doc = await self.repo.update(db, doc_id, {
-            "storage_key": openai_file.id,
-            "status": FileState.INDEXING
-        })
-
-        return final_doc, openai_path
-
-    async def _persist_upload_to_tempfile_with_hash(
-        self,
-        uploaded: UploadFile,
-        suffix: str = ""
-    ) -> tuple[Path, int, str]:
-        """
-        Write UploadFile to a temp file while computing sha256 and size.
-
-        Returns:
-            (tmp_path, size_in_bytes, sha256_hex)
-        """
+        openai_file=None,
+    ) -> None:
+        """Remove everything a rejected upload created (S3 object, OpenAI file, DB row)."""
         try:
-            uploaded.file.seek(0)
-        except Exception:
-            pass
-
-        if not suffix:
-            suffix = self._suffix_from_name(uploaded.filename or "")
-
-        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-        tmp_path = Path(tmp.name)
-
-        def _copy_and_hash() -> tuple[int, str]:
-            sha256 = hashlib.sha256()
-            total = 0
-            with tmp:
-                src = uploaded.file
-                while True:
-                    chunk = src.read(CHUNK_SIZE)
-                    if not chunk:
-                        break
-                    sha256.update(chunk)
-                    total += len(chunk)
-                    tmp.write(chunk)
-                tmp.flush()
-                os.fsync(tmp.fileno())
-            return total, sha256.hexdigest()
+            await self.s3_client.delete_file(bucket, s3_key)
+        except Exception as e:
+            logger.warning("Failed to delete rejected S3 object %s: %s", s3_key, e)
 
-        try:
-            size, digest = await asyncio.to_thread(_copy_and_hash)
-        except Exception:
+        if openai_file:
             try:
-                tmp.close()
-            finally:
-                try:
-                    tmp_path.unlink(missing_ok=True)
-                except Exception:
-                    pass
-            raise
-        finally:
-            try:
-                uploaded.file.seek(0)
-            except Exception:
-                pass
-
-        return tmp_path, size, digest
+                await self.manager.delete_file(vector_store_id, openai_file.id)
+            except Exception as e:
+                logger.warning("Failed to delete rejected OpenAI file %s: %s", openai_file.id, e)
 
-    @classmethod
-    def _suffix_from_name(cls, name: str) -> str:
-        if "." in name:
-            return "." + name.rsplit(".", 1)[-1].lower()
-        return ""
+        await self.repo.delete_by_id(db, doc_id)
 
     async def _resolve_vector_store_id(self, db: AsyncSession) -> str:
         # 1) User-specific configuration
@@ -453,7 +577,7 @@ class FileService:
             return ids[0]
 
         # 2) Default storage fallback
-        default_storage = await self.storage_repo.get_default_storage(db)
+        default_storage = await storage_registry.get_default(db)
         if default_storage and default_storage.vector_store_id:
             return default_storage.vector_store_id
 
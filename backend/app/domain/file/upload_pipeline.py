@@ -0,0 +1,206 @@
+# app/domain/file/upload_pipeline.py
+import asyncio
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Protocol
+from app.infrastructure.llm.openai_manager import OpenAIManager
+from app.infrastructure.yandex.yandex_s3_client import YandexS3Client, MULTIPART_THRESHOLD
+from app.core.logger import get_logger
+
+
+logger = get_logger()
+
+CHUNK_SIZE = 1024 * 1024  # 1 MB read size
+PART_SIZE = MULTIPART_THRESHOLD  # 8 MB, above the S3 5 MB part minimum and below OpenAI's 64 MB cap
+QUEUE_DEPTH = 2  # parts buffered per sink before the reader waits
+
+Reader = Callable[[int], Awaitable[bytes]]
+
+
+class PartSink(Protocol):
+    """Consumer of fixed-size parts produced by `tee_upload`."""
+
+    async def write(self, part_number: int, data: bytes, last: bool) -> None: ...
+
+    async def complete(self) -> Any: ...
+
+    async def abort(self) -> None: ...
+
+
+@dataclass
+class TeeResult:
+    size: int
+    sha256: str
+    results: list[Any] = field(default_factory=list)
+
+
+class S3UploadSink:
+    """
+    Streams parts into an S3 object.
+
+    A single-part upload is sent as one `put_object`; anything larger becomes
+    a multipart upload that is created lazily on the first part.
+    """
+
+    def __init__(
+        self,
+        s3_client: YandexS3Client,
+        bucket: str,
+        key: str,
+        content_type: str | None = None,
+    ):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.extra = {"ContentType": content_type} if content_type else {}
+        self.upload_id: str | None = None
+        self.parts: list[dict] = []
+        self.e_tag: str | None = None
+
+    async def write(self, part_number: int, data: bytes, last: bool) -> None:
+        if part_number == 1 and last:
+            resp = await self.s3_client.put_object(self.bucket, self.key, data, **self.extra)
+            self.e_tag = (resp or {}).get("ETag")
+            return
+
+        if self.upload_id is None:
+            self.upload_id = await self.s3_client.create_multipart_upload(self.bucket, self.key, **self.extra)
+        self.parts.append(
+            await self.s3_client.upload_part(self.bucket, self.key, self.upload_id, part_number, data)
+        )
+
+    async def complete(self) -> str | None:
+        if self.upload_id is not None:
+            resp = await self.s3_client.complete_multipart_upload(
+                self.bucket, self.key, self.upload_id, self.parts
+            )
+            self.e_tag = (resp or {}).get("ETag")
+        return self.e_tag
+
+    async def abort(self) -> None:
+        if self.upload_id is not None:
+            await self.s3_client.abort_multipart_upload(self.bucket, self.key, self.upload_id)
+
+
+class OpenAIUploadSink:
+    """
+    Streams parts into an OpenAI file via the Uploads API.
+
+    Small files go through a single `files.create`. The resulting file is not
+    attached to a vector store here, so the caller can still discard it (e.g.
+    on a duplicate) before it gets indexed. Aborting deletes a file that was
+    already created, e.g. when the S3 sink fails after this one completed.
+    """
+
+    def __init__(
+        self,
+        manager: OpenAIManager,
+        filename: str,
+        size: int,
+        mime_type: str | None = None,
+    ):
+        self.manager = manager
+        self.filename = filename
+        self.size = size
+        self.mime_type = mime_type or "application/octet-stream"
+        self.upload_id: str | None = None
+        self.part_ids: list[str] = []
+        self.file: Any = None
+
+    async def write(self, part_number: int, data: bytes, last: bool) -> None:
+        if part_number == 1 and last:
+            self.file = await self.manager.create_file_from_bytes(self.filename, data)
+            return
+
+        if self.upload_id is None:
+            self.upload_id = await self.manager.create_upload(self.filename, self.size, self.mime_type)
+        self.part_ids.append(await self.manager.add_upload_part(self.upload_id, data))
+
+    async def complete(self) -> Any:
+        if self.upload_id is not None:
+            self.file = await self.manager.complete_upload(self.upload_id, self.part_ids)
+        return self.file
+
+    async def abort(self) -> None:
+        if self.file is not None:
+            await self.manager.discard_file(self.file.id)
+        elif self.upload_id is not None:
+            await self.manager.cancel_upload(self.upload_id)
+
+
+async def tee_upload(
+    read: Reader,
+    sinks: list[PartSink],
+    part_size: int = PART_SIZE,
+    chunk_size: int = CHUNK_SIZE,
+) -> TeeResult:
+    """
+    Read a stream once and fan it out to several sinks concurrently.
+
+    The stream is read in `chunk_size` pieces, hashed (SHA-256) inline and
+    grouped into `part_size` parts. Every part is handed to each sink through
+    its own bounded queue, so a slow sink applies backpressure to the reader
+    and peak memory stays at a few parts regardless of file size. One part
+    is held back so sinks know which part is the last.
+
+    If any sink fails, the others are cancelled and every sink is aborted.
+
+    :param read: Async `read(n)` callable (UploadFile.read, aiofiles, S3 body)
+    :param sinks: Part consumers; their `complete()` results are returned in order
+    :return: TeeResult(size, sha256, results)
+    """
+    sha256 = hashlib.sha256()
+    queues: list[asyncio.Queue] = [asyncio.Queue(maxsize=QUEUE_DEPTH) for _ in sinks]
+    results: list[Any] = [None] * len(sinks)
+    total = 0
+
+    async def fan_out(item: tuple[int, bytes, bool] | None) -> None:
+        for q in queues:
+            await q.put(item)
+
+    async def produce() -> None:
+        nonlocal total
+        buf = bytearray()
+        pending: bytes | None = None
+        part_number = 0
+
+        while chunk := await read(chunk_size):
+            sha256.update(chunk)
+            total += len(chunk)
+            buf += chunk
+            if len(buf) >= part_size:
+                if pending is not None:
+                    part_number += 1
+                    await fan_out((part_number, pending, False))
+                pending = bytes(buf)
+                buf.clear()
+
+        if buf:
+            if pending is not None:
+                part_number += 1
+                await fan_out((part_number, pending, False))
+            pending = bytes(buf)
+
+        # Empty stream still produces one (empty) part so sinks create an object
+        await fan_out((part_number + 1, pending or b"", True))
+        await fan_out(None)
+
+    async def drain(index: int, sink: PartSink, q: asyncio.Queue) -> None:
+        while (item := await q.get()) is not None:
+            await sink.write(*item)
+        results[index] = await sink.complete()
+
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(produce())
+            for i, (sink, q) in enumerate(zip(sinks, queues)):
+                tg.create_task(drain(i, sink, q))
+    except BaseExceptionGroup as eg:
+        await asyncio.gather(*(sink.abort() for sink in sinks), return_exceptions=True)
+        # Surface the first real error so callers keep their usual except clauses
+        raise eg.exceptions[0] from eg
+    except BaseException:
+        await asyncio.gather(*(sink.abort() for sink in sinks), return_exceptions=True)
+        raise
+
+    return TeeResult(size=total, sha256=sha256.hexdigest(), results=results)
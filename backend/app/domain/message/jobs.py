@@ -0,0 +1,32 @@
+# app/domain/message/jobs.py
+from app.infrastructure.redis.client import redis_client
+from app.infrastructure.redis.stream_queue import RedisStreamQueue, safe_enqueue
+from app.domain.file.jobs import WORKER_GROUP
+from app.core.config import settings
+
+
+REPLY_JOB = "reply"
+BITRIX_JOB = "bitrix"
+
+assistant_queue = RedisStreamQueue(
+    redis=redis_client,
+    stream="jobs:assistant:reply",
+    group=WORKER_GROUP,
+    max_retries=settings.JOB_QUEUE_MAX_RETRIES,
+    claim_idle_ms=settings.ASSISTANT_JOB_CLAIM_IDLE_SECONDS * 1000,
+)
+
+
+async def enqueue_assistant_reply(message_id: int) -> None:
+    """Hand a PROCESSING assistant placeholder to the assistant worker."""
+    await safe_enqueue(assistant_queue, {"kind": REPLY_JOB, "message_id": message_id})
+
+
+async def enqueue_bitrix_webhook(form_data: dict, user_id: int) -> None:
+    """
+    Hand a Bitrix webhook to the assistant worker.
+
+    Unlike chat replies there is no row to recover from, so a Redis failure
+    is raised and Bitrix gets an error (and redelivers).
+    """
+    await assistant_queue.enqueue({"kind": BITRIX_JOB, "form_data": form_data, "user_id": user_id})
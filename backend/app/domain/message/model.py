@@ -1,5 +1,5 @@
 # app/domain/message/model.py
-from sqlalchemy import String, Integer, ForeignKey, Enum as SQLEnum
+from sqlalchemy import String, Integer, ForeignKey, Enum as SQLEnum, Index
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional, List
@@ -11,7 +11,11 @@ from app.domain.message.schema import SourceInfo
 
 class Message(Base, TimestampMixin):
     __tablename__ = "messages"
-    
+    __table_args__ = (
+        # Chat history in order; also serves plain chat_id lookups
+        Index("ix_messages_chat_id_created_at_id", "chat_id", "created_at", "id"),
+    )
+
     id: Mapped[int] = mapped_column(
         Integer, primary_key=True, autoincrement=True
     )
@@ -20,7 +24,6 @@ class Message(Base, TimestampMixin):
         Integer,
         ForeignKey("chats.id", ondelete="CASCADE"),
         nullable=False,
-        index=True
     )
     content: Mapped[str] = mapped_column(String, nullable=False)
     role: Mapped[str] = mapped_column(String, nullable=False)
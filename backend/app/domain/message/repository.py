@@ -1,4 +1,5 @@
 # app/domain/message/repository.py
+from datetime import datetime
 from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -7,6 +8,7 @@ from sqlalchemy import delete
 from app.exceptions.exceptions import DatabaseError
 from app.common.base_repository import BaseRepository
 from app.domain.message.model import Message
+from app.enums.enums import MessageState, UserRole
 from app.domain.message.schema import (
     MessageCreate,
     MessageOut,
@@ -47,7 +49,9 @@ class MessageRepository(BaseRepository[Message, MessageOut, MessageCreate]):
         """
         try:
             result = await db.execute(
-                select(Message).where(Message.chat_id == chat_id)
+                select(Message)
+                .where(Message.chat_id == chat_id)
+                .order_by(Message.created_at, Message.id)
             )
             messages = result.scalars().all()
             
@@ -55,6 +59,59 @@ class MessageRepository(BaseRepository[Message, MessageOut, MessageCreate]):
         except Exception as e:
             raise DatabaseError(f"Failed to fetch messages for chat ID '{chat_id}': {str(e)}") from e
     
+    async def get_prompt(
+        self,
+        db: AsyncSession,
+        assistant_msg: MessageOut
+    ) -> str | None:
+        """
+        Return the user message an assistant placeholder answers: the latest
+        user message in the same chat created before it.
+
+        Raises:
+            DatabaseError: If there is an issue with the database operation.
+        """
+        try:
+            result = await db.execute(
+                select(Message.content)
+                .where(
+                    Message.chat_id == assistant_msg.chat_id,
+                    Message.role == UserRole.USER,
+                    Message.id < assistant_msg.id,
+                )
+                .order_by(Message.id.desc())
+                .limit(1)
+            )
+            return result.scalar_one_or_none()
+        except Exception as e:
+            raise DatabaseError(f"Failed to fetch prompt for message ID '{assistant_msg.id}': {str(e)}") from e
+
+    async def get_processing_replies(
+        self,
+        db: AsyncSession,
+        created_before: datetime
+    ) -> List[MessageOut]:
+        """
+        Retrieve assistant placeholders still PROCESSING that were created
+        before `created_before`.
+
+        Raises:
+            DatabaseError: If there is an issue with the database operation.
+        """
+        try:
+            result = await db.execute(
+                select(Message)
+                .where(
+                    Message.state == MessageState.PROCESSING,
+                    Message.role == UserRole.ASSISTANT,
+                    Message.created_at < created_before,
+                )
+                .order_by(Message.id)
+            )
+            return [MessageOut.model_validate(message) for message in result.scalars().all()]
+        except Exception as e:
+            raise DatabaseError(f"Failed to fetch processing replies: {str(e)}") from e
+
     async def delete_by_chat_id(
         self, 
         db: AsyncSession, 
@@ -76,8 +133,8 @@ class MessageRepository(BaseRepository[Message, MessageOut, MessageCreate]):
         try:
             stmt = delete(Message).where(Message.chat_id == chat_id)
             result = await db.execute(stmt)
-            await db.commit()  # Ensure changes are committed
+            await self._commit(db)  # Ensure changes are committed
             return result.rowcount
         except Exception as e:
-            await db.rollback()  # Rollback on error
+            await self._rollback(db)  # Rollback on error
             raise DatabaseError(f"Failed to delete messages for chat ID '{chat_id}': {str(e)}") from e
@@ -4,13 +4,14 @@ import time
 from fastapi import (
     HTTPException,
     status,
-    BackgroundTasks
 )
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from fastapi.encoders import jsonable_encoder
 from app.domain.message.repository import MessageRepository
 from app.domain.chat.repository import ChatRepository
 from app.domain.message.schema import MessageCreate, MessageOut
+from app.domain.message.streaming import DeltaPublisher
+from app.domain.message.jobs import enqueue_assistant_reply
 from app.infrastructure.llm.openai_manager import OpenAIManager
 from app.domain.user.schema import UserOutSchema
 from app.enums.enums import (
@@ -19,13 +20,24 @@ from app.enums.enums import (
 )
 from app.domain.chat.schema import ChatCreate
 from app.database.connection import db_manager
+from app.database.unit_of_work import unit_of_work
 from app.infrastructure.redis.client import get_redis_client
 from app.infrastructure.redis.pubsub import RedisPubSub
+from app.core.config import settings
 from app.core.logger import get_logger
 
 
 logger = get_logger()
 
+REPLY_FAILED_TEXT = "Failed to respond. Please try again later."
+
+
+async def publish_message(message: MessageOut) -> None:
+    """Push a message to its chat's SSE channel."""
+    redis = await get_redis_client()
+    pubsub = RedisPubSub(redis, channel="chat", object_id=message.chat_id, client_id="system")
+    await pubsub.publish(json.dumps(jsonable_encoder(message)))
+
 
 class MessageService:
     """
@@ -63,16 +75,18 @@ class MessageService:
         self,
         db: AsyncSession,
         data: MessageCreate,
-        background_tasks: BackgroundTasks
     ) -> list[MessageOut]:
         """
-        Create a new user message in a chat, send it to OpenAI, and store the assistant's reply.
+        Create a new user message in a chat and queue the assistant's reply.
+
+        The reply is generated by the assistant worker, which fills in the
+        PROCESSING placeholder and publishes it on the chat channel.
 
         Args:
             data (MessageCreate): Input data containing chat_id and message content.
 
         Returns:
-            MessageOut: The assistant's reply message.
+            list[MessageOut]: The user message and the assistant placeholder.
 
         Raises:
             HTTPException: If the chat, agent, or assistant ID is invalid, or OpenAI fails.
@@ -93,37 +107,30 @@ class MessageService:
 
         session_handle = chat.session_handle
 
-        # 2. Save the user message
-        user_msg = await self.repo.create(db, data)
-
-        # 3. Save assistant placeholder
-        assistant_msg = await self.repo.create(
-            db,
-            MessageCreate(
-                chat_id=data.chat_id,
-                role=UserRole.ASSISTANT,
-                content="...",
-                state=MessageState.PROCESSING,
+        # 2. Save the user message and the assistant placeholder atomically
+        async with unit_of_work(db):
+            user_msg = await self.repo.create(db, data)
+
+            assistant_msg = await self.repo.create(
+                db,
+                MessageCreate(
+                    chat_id=data.chat_id,
+                    role=UserRole.ASSISTANT,
+                    content="...",
+                    state=MessageState.PROCESSING,
+                )
             )
-        )
-
-        # 3. Process assistant message in background
-        user_snapshot = self.user
-        background_tasks.add_task(
-            self._process_assistant_response,
-            chat_id=data.chat_id,
-            assistant_msg_id=assistant_msg.id,
-            session_handle=chat.session_handle,
-            user_input=data.content,
-            user=user_snapshot,
-        )
+
+        # 3. Hand the reply to the assistant worker; if Redis is down the
+        # worker's recovery sweep enqueues the placeholder again
+        await enqueue_assistant_reply(assistant_msg.id)
 
         return [
             user_msg,
             assistant_msg
         ]
 
-    async def _process_assistant_response(
+    async def process_assistant_response(
         self,
         chat_id: int,
         assistant_msg_id: int,
@@ -131,14 +138,38 @@ class MessageService:
         user_input: str,
         user: UserOutSchema
     ):
+        """
+        Generate the answer for an assistant placeholder and publish it.
+
+        Called by the assistant worker. Failures and cancellation are recorded
+        on the message (ERROR / CANCELED) rather than raised, except that
+        cancellation is re-raised after the update.
+        """
         async with self.session_factory() as db:
             try:
-                reply = await self.manager.send_and_receive(
-                    db=db,
-                    conv_id=session_handle,
-                    user=user,
-                    user_input=user_input
-                )
+                if settings.CHAT_STREAM_RESPONSES:
+                    # Partial answer text goes out on the chat channel as it arrives
+                    redis = await get_redis_client()
+                    publisher = DeltaPublisher(
+                        RedisPubSub(redis, channel="chat", object_id=chat_id, client_id="system"),
+                        message_id=assistant_msg_id,
+                        interval_ms=settings.CHAT_STREAM_FLUSH_MS,
+                    )
+                    reply = await self.manager.stream_and_receive(
+                        db=db,
+                        conv_id=session_handle,
+                        user=user,
+                        user_input=user_input,
+                        on_delta=publisher,
+                    )
+                    await publisher.flush()
+                else:
+                    reply = await self.manager.send_and_receive(
+                        db=db,
+                        conv_id=session_handle,
+                        user=user,
+                        user_input=user_input
+                    )
     
                 sources_dict = []
                 if reply.sources:
@@ -163,10 +194,7 @@ class MessageService:
                 )
 
                 # Push updated message to SSE channel
-                redis = await get_redis_client()
-                pubsub = RedisPubSub(redis, channel="chat", object_id=chat_id, client_id="system")
-
-                await pubsub.publish(json.dumps(jsonable_encoder(updated_msg)))
+                await publish_message(updated_msg)
 
             except asyncio.CancelledError:
                 updated_msg = await self.repo.update(
@@ -179,24 +207,19 @@ class MessageService:
                 )
                 
                 # Notify frontend
-                redis = await get_redis_client()
-                pubsub = RedisPubSub(redis, channel="chat", object_id=chat_id, client_id="system")
-                await pubsub.publish(json.dumps(jsonable_encoder(updated_msg)))
-                
+                await publish_message(updated_msg)
+
                 raise
             except Exception as e:
                 logger.error(f"Error processing assistant response: {e}")
-                error_content = "Failed to respond. Please try again later."
                 updated_msg = await self.repo.update(
                     db,
                     assistant_msg_id,
                     {
-                        "content": error_content,
+                        "content": REPLY_FAILED_TEXT,
                         "state": MessageState.ERROR,
                     }
                 )
-                
+
                 # Notify frontend
-                redis = await get_redis_client()
-                pubsub = RedisPubSub(redis, channel="chat", object_id=chat_id, client_id="system")
-                await pubsub.publish(json.dumps(jsonable_encoder(updated_msg)))
+                await publish_message(updated_msg)
@@ -0,0 +1,61 @@
+# app/domain/message/streaming.py
+import json
+import time
+from app.infrastructure.redis.pubsub import RedisPubSub
+from app.core.logger import get_logger
+
+
+logger = get_logger()
+
+DELTA_EVENT = "delta"
+# Every payload DeltaPublisher emits starts with this, so relays can route
+# deltas without parsing JSON
+DELTA_PREFIX = json.dumps({"event": DELTA_EVENT})[:-1]
+
+
+class DeltaPublisher:
+    """
+    Coalesces assistant answer deltas and publishes them on the chat channel
+    at most once every `interval_ms`.
+
+    Each publish is `{"event": "delta", "id", "offset", "delta"}`, where
+    `offset` is the position of `delta` in the answer; an offset of 0 tells
+    clients to drop any text they have (first chunk, or a retried attempt).
+    The first chunk goes out immediately. Publish errors are logged and do not
+    interrupt the response; the final message is published separately.
+    """
+
+    def __init__(self, pubsub: RedisPubSub, message_id: int, interval_ms: int):
+        self.pubsub = pubsub
+        self.message_id = message_id
+        self.interval = interval_ms / 1000
+        self._buffer: list[str] = []
+        self._offset = 0
+        self._last_flush = float("-inf")
+
+    async def __call__(self, text: str, offset: int) -> None:
+        if offset == 0:
+            # A new attempt; anything buffered belongs to the failed one
+            self._buffer.clear()
+        if not self._buffer:
+            self._offset = offset
+        self._buffer.append(text)
+
+        if time.monotonic() - self._last_flush >= self.interval:
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self._buffer:
+            return
+        payload = {
+            "event": DELTA_EVENT,
+            "id": self.message_id,
+            "offset": self._offset,
+            "delta": "".join(self._buffer),
+        }
+        self._buffer.clear()
+        self._last_flush = time.monotonic()
+        try:
+            await self.pubsub.publish(json.dumps(payload, ensure_ascii=False))
+        except Exception as e:
+            logger.warning("Failed to publish answer delta for message %s: %s", self.message_id, e)
@@ -0,0 +1,144 @@
+# app/domain/storage/registry.py
+import asyncio
+import time
+from dataclasses import dataclass, field
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.domain.storage.repository import StorageRepo
+from app.domain.storage.schema import StorageOut
+from app.infrastructure.redis.client import redis_client
+
+
+logger = get_logger()
+
+INVALIDATE_CHANNEL = "storage:registry:invalidate"
+
+
+@dataclass
+class _Snapshot:
+    loaded_at: float
+    by_id: dict[int, StorageOut] = field(default_factory=dict)
+    by_bucket: dict[str, StorageOut] = field(default_factory=dict)
+    by_bot_id: dict[str, StorageOut] = field(default_factory=dict)
+    by_vector_store_id: dict[str, StorageOut] = field(default_factory=dict)
+    default: StorageOut | None = None
+
+    @classmethod
+    def build(cls, storages: list[StorageOut]) -> "_Snapshot":
+        snapshot = cls(loaded_at=time.monotonic())
+        for storage in sorted(storages, key=lambda s: s.id):
+            snapshot.by_id[storage.id] = storage
+            if storage.s3_bucket:
+                snapshot.by_bucket[storage.s3_bucket] = storage
+            if storage.bot_id:
+                snapshot.by_bot_id[storage.bot_id] = storage
+            # Several rows may share a vector store; keep the oldest like the repo's LIMIT 1
+            snapshot.by_vector_store_id.setdefault(storage.vector_store_id, storage)
+            if storage.default and snapshot.default is None:
+                snapshot.default = storage
+        return snapshot
+
+
+class StorageRegistry:
+    """
+    Process-level snapshot of the storages table, indexed by id, bucket,
+    bot_id and vector_store_id.
+
+    The table is small and read on every chat message, webhook and upload,
+    so it is loaded whole and reused for `ttl` seconds. StorageService calls
+    `invalidate` after each mutation, which clears this process and publishes
+    on Redis so `listen` clears every other API replica. A lookup that misses
+    the snapshot falls through to the repository (rows written outside
+    StorageService show up without waiting for the TTL).
+    """
+
+    def __init__(self, repo: StorageRepo, redis: Redis | None, ttl: int):
+        self.repo = repo
+        self.redis = redis
+        self.ttl = ttl
+        self._snapshot: _Snapshot | None = None
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    async def get_by_id(self, db: AsyncSession, storage_id: int) -> StorageOut:
+        snapshot = await self._current(db)
+        return snapshot.by_id.get(storage_id) or await self.repo.get_by_id(db, storage_id)
+
+    async def get_by_bucket(self, db: AsyncSession, bucket: str) -> StorageOut | None:
+        snapshot = await self._current(db)
+        return snapshot.by_bucket.get(bucket) or await self.repo.get_by_bucket_name(db, bucket)
+
+    async def get_by_bot_id(self, db: AsyncSession, bot_id: str) -> StorageOut | None:
+        snapshot = await self._current(db)
+        return snapshot.by_bot_id.get(bot_id) or await self.repo.get_by_bot_id(db, bot_id)
+
+    async def get_by_vector_store_id(self, db: AsyncSession, vector_store_id: str) -> StorageOut | None:
+        snapshot = await self._current(db)
+        return (
+            snapshot.by_vector_store_id.get(vector_store_id)
+            or await self.repo.get_by_vector_store_id(db, vector_store_id)
+        )
+
+    async def get_default(self, db: AsyncSession) -> StorageOut | None:
+        snapshot = await self._current(db)
+        return snapshot.default or await self.repo.get_default_storage(db)
+
+    def clear(self) -> None:
+        self._snapshot = None
+        self._generation += 1
+
+    async def invalidate(self) -> None:
+        """Drop the snapshot here and on every replica listening on Redis."""
+        self.clear()
+        if self.redis is None:
+            return
+        try:
+            await self.redis.publish(INVALIDATE_CHANNEL, "1")
+        except Exception as e:
+            logger.warning("Storage registry invalidation publish failed: %s", e)
+
+    async def listen(self) -> None:
+        """Clear the snapshot on every invalidation message; runs until cancelled."""
+        if self.redis is None:
+            return
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(INVALIDATE_CHANNEL)
+                # Anything published while we were disconnected is lost
+                self.clear()
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.clear()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Storage registry listener error, resubscribing: %s", e)
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    async def _current(self, db: AsyncSession) -> _Snapshot:
+        snapshot = self._snapshot
+        if snapshot and time.monotonic() - snapshot.loaded_at < self.ttl:
+            return snapshot
+
+        async with self._lock:
+            snapshot = self._snapshot
+            if snapshot and time.monotonic() - snapshot.loaded_at < self.ttl:
+                return snapshot
+            generation = self._generation
+            snapshot = _Snapshot.build(await self.repo.get_all(db))
+            # An invalidation during the load may have raced the SELECT
+            if generation == self._generation:
+                self._snapshot = snapshot
+            return snapshot
+
+
+storage_registry = StorageRegistry(
+    repo=StorageRepo(),
+    redis=redis_client,
+    ttl=settings.STORAGE_REGISTRY_TTL,
+)
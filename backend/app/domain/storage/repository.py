@@ -51,28 +51,28 @@ class StorageRepo(BaseRepository[Storage, StorageOut, StorageCreate]):
         try:
             await db.execute(update(Storage).values(default=False))
             await db.execute(update(Storage).where(Storage.id == storage_id).values(default=True))
-            await db.commit()
+            await self._commit(db)
             result = await db.execute(select(Storage).where(Storage.id == storage_id))
             storage = result.scalar_one_or_none()
             if not storage:
                 raise NotFoundError(f"Storage with ID {storage_id} not found")
             return StorageOut.model_validate(storage, from_attributes=True)
         except Exception as e:
-            await db.rollback()
+            await self._rollback(db)
             raise DatabaseError(f"Failed to set default storage: {e}") from e
 
     async def unset_default(self, db: AsyncSession, storage_id: int) -> StorageOut:
         """Remove default status from a specific storage."""
         try:
             await db.execute(update(Storage).where(Storage.id == storage_id).values(default=False))
-            await db.commit()
+            await self._commit(db)
             result = await db.execute(select(Storage).where(Storage.id == storage_id))
             storage = result.scalar_one_or_none()
             if not storage:
                 raise NotFoundError(f"Storage with ID {storage_id} not found")
             return StorageOut.model_validate(storage, from_attributes=True)
         except Exception as e:
-            await db.rollback()
+            await self._rollback(db)
             raise DatabaseError(f"Failed to unset default storage: {e}") from e
 
     async def get_by_vector_store_id(self, db: AsyncSession, vector_store_id: str) -> Optional[StorageOut]:
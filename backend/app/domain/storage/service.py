@@ -5,9 +5,9 @@ import fitz
 from openai import AsyncOpenAI
 from sqlalchemy.ext.asyncio import AsyncSession
 from prettytable import from_csv
-from app.core.config import settings
 from app.core.logger import get_logger
 from app.domain.storage.repository import StorageRepo
+from app.domain.storage.registry import storage_registry
 from app.domain.file.repository import FileRepo
 from app.domain.user.schema import UserOutSchema
 from app.domain.storage.schema import StorageCreate, StorageOut
@@ -22,12 +22,13 @@ class StorageService:
         self,
         repo: StorageRepo,
         file_repo: FileRepo,
-        user: UserOutSchema
+        user: UserOutSchema,
+        client: AsyncOpenAI,
     ):
         self.repo = repo
         self.file_repo = file_repo
         self.user = user
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = client
 
     async def get_all(self, db: AsyncSession):
         docs = await self.repo.get_all(db)
@@ -46,6 +47,7 @@ class StorageService:
 
         # Set as default
         updated_storage = await self.repo.set_as_default(db, storage_id)
+        await storage_registry.invalidate()
 
         return updated_storage
 
@@ -60,6 +62,7 @@ class StorageService:
         data.vector_store_id = vs.id
         # Store in your DB
         db_vs = await self.repo.create(db, data)
+        await storage_registry.invalidate()
         return db_vs
     
     async def delete_vector_store(self, db: AsyncSession, storage_id: int):
@@ -78,6 +81,7 @@ class StorageService:
 
         # Delete in DB
         await self.repo.delete_by_id(db, storage_id)
+        await storage_registry.invalidate()
         return True
     
     # ======================================
@@ -8,6 +8,7 @@ from app.domain.user.schema import (
     UserOutSchema,
     UserCredsSchema,
 )
+from app.infrastructure.redis.user_cache import user_cache
 from app.core.logger import get_logger
 from app.core.config import settings
 from app.utils.oauth2 import hash_password
@@ -60,6 +61,7 @@ class UserService:
             raise HTTPException(status_code=403, detail="Cannot delete yourself.")
 
         await self.repo.delete_by_id(db, user_id)
+        await user_cache.invalidate(user_id)
 
     async def get_by_email(self, db: AsyncSession, email: str) -> UserCredsSchema | None:
         user = await self.repo.get_by_email(db, email)
@@ -94,5 +96,6 @@ class UserService:
         vs_id: str,
         user_id: int,
     ) -> UserOutSchema:
-        # implement later, but keep db as explicit arg
+        # implement later, but keep db as explicit arg; once the user row is
+        # updated here, call `await user_cache.invalidate(user_id)`
         raise NotImplementedError
@@ -37,6 +37,7 @@ class FileOrigin(str, Enum):
     UPLOAD = "upload"           # Uploaded via API
     S3_IMPORT = "s3_import"     # Discovered/imported from S3
     OPENAI_ONLY = "openai_only" # Legacy: only existed in OpenAI
+    DIRECT_UPLOAD = "direct_upload"  # Uploaded by the client straight to S3 (presigned multipart)
 
 
 class FileState(str, Enum):
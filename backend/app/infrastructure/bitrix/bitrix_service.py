@@ -2,14 +2,16 @@ import httpx
 import asyncio
 from dataclasses import dataclass
 from redis.asyncio import Redis
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from urllib.parse import unquote
 from app.core.config import settings
 from app.domain.message.repository import MessageRepository
 from app.domain.chat.repository import ChatRepository
 from app.domain.storage.repository import StorageRepo
+from app.domain.storage.registry import storage_registry
 from app.domain.user.schema import UserOutSchema
 from app.infrastructure.llm.openai_manager import OpenAIManager
+from app.infrastructure.llm.resilience import Deadline
 from app.domain.message.schema import MessageCreate
 from app.domain.chat.schema import ChatCreate, ChatOut
 from app.enums.enums import UserRole, MessageState
@@ -46,7 +48,8 @@ class BitrixService:
         chat_repo: ChatRepository,
         user: UserOutSchema,
         openai_manager: OpenAIManager,
-        storage_repo: StorageRepo
+        storage_repo: StorageRepo,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
     ):
         # Dependencies
         self.message_repo = message_repo
@@ -54,6 +57,8 @@ class BitrixService:
         self.user = user
         self.openai_manager = openai_manager
         self.storage_repo = storage_repo
+        # Workers pass their own pool; the API process uses the global manager
+        self.session_factory = session_factory
 
         # Security settings
         self.expected_domain = "crm.clever-trading.ru"
@@ -90,8 +95,8 @@ class BitrixService:
             await redis.setex(lock_key, 60, 'processing')
 
             # 4. Database operations and AI Processing
-            async with db_manager.session_scope() as db:
-                storage = await self.storage_repo.get_by_bot_id(db, wh.bot_id)
+            async with self._session() as db:
+                storage = await storage_registry.get_by_bot_id(db, wh.bot_id)
                 if not storage:
                     await self.send_response(
                         dialog_id=wh.dialog_id,
@@ -108,6 +113,11 @@ class BitrixService:
         finally:
             await redis.delete(lock_key)
 
+    def _session(self):
+        if self.session_factory:
+            return self.session_factory()
+        return db_manager.session_scope()
+
     async def _process_user_message(
         self,
         db: AsyncSession,
@@ -241,16 +251,14 @@ class BitrixService:
                     ]
                 )
 
-            # Add timeout for AI calls in background tasks
-            reply = await asyncio.wait_for(
-                self.openai_manager.send_and_receive(
-                    db=db,
-                    conv_id=chat.session_handle,
-                    user=self.user,
-                    user_input=message_text,
-                    vector_store_id=vector_store_id
-                ),
-                timeout=30.0
+            # Retries and the fallback model share this budget
+            reply = await self.openai_manager.send_and_receive(
+                db=db,
+                conv_id=chat.session_handle,
+                user=self.user,
+                user_input=message_text,
+                vector_store_id=vector_store_id,
+                deadline=Deadline.after(settings.BITRIX_REPLY_DEADLINE_SECONDS),
             )
 
             return reply
@@ -48,6 +48,11 @@ class FileConverter:
         else:
             logger.info("LlamaParse disabled or API key missing; using local Excel converter")
 
+    def needs_conversion(self, filename: str) -> bool:
+        """Return True if `filename` must be converted before OpenAI upload."""
+        ext = os.path.splitext(filename.lower())[-1]
+        return ext in self._handlers
+
     async def convert(self, source_path: Path, filename: str) -> Tuple[Path, str]:
         """
         Convert a file to OpenAI-compatible format if needed.
@@ -59,22 +64,27 @@ class FileConverter:
         Returns:
             (converted_path, new_filename) or (source_path, filename) if no conversion needed
         """
-        ext = os.path.splitext(filename.lower())[-1]
-        handler = self._handlers.get(ext)
-
-        if not handler:
-            logger.debug("No conversion needed for %s", ext)
+        if not self.needs_conversion(filename):
+            logger.debug("No conversion needed for %s", filename)
             return source_path, filename
 
-        logger.info("Converting %s (%s) to OpenAI-compatible format", filename, ext)
         try:
             # Run blocking conversion in thread
-            result = await asyncio.to_thread(handler, source_path, filename)
-            return result
+            return await asyncio.to_thread(self.convert_sync, source_path, filename)
         except Exception as e:
             logger.exception("Conversion failed for %s: %s", filename, e)
             raise RuntimeError(f"File conversion failed: {e}") from e
 
+    def convert_sync(self, source_path: Path, filename: str) -> Tuple[Path, str]:
+        """Blocking conversion; returns (source_path, filename) if none is needed."""
+        ext = os.path.splitext(filename.lower())[-1]
+        handler = self._handlers.get(ext)
+        if not handler:
+            return source_path, filename
+
+        logger.info("Converting %s (%s) to OpenAI-compatible format", filename, ext)
+        return handler(source_path, filename)
+
     # ---------- CSV -> TXT ----------
     def _convert_csv_to_txt(self, source_path: Path, filename: str) -> Tuple[Path, str]:
         with open(source_path, "r", newline="", encoding="utf-8") as f:
@@ -157,3 +167,21 @@ class FileConverter:
 
         logger.debug("Excel converted to Markdown: %s -> %s", filename, new_filename)
         return tmp_path, new_filename
+
+
+_process_converter: FileConverter | None = None
+
+
+def convert_in_process(source_path: str, filename: str) -> Tuple[str, str]:
+    """
+    Picklable entry point for running conversions in a ProcessPoolExecutor.
+
+    Each pool process builds its own FileConverter once and reuses it, so
+    CPU-heavy pandas/openpyxl work runs off the event loop and outside the GIL.
+    """
+    global _process_converter
+    if _process_converter is None:
+        _process_converter = FileConverter()
+
+    path, new_filename = _process_converter.convert_sync(Path(source_path), filename)
+    return str(path), new_filename
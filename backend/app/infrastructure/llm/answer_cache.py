@@ -0,0 +1,203 @@
+# app/infrastructure/llm/answer_cache.py
+import hashlib
+import json
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Sequence
+import numpy as np
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.domain.message.schema import ResultPayload
+from app.infrastructure.redis.client import redis_client
+
+
+logger = get_logger()
+
+REDIS_PREFIX = "answer"
+
+Embed = Callable[[str], Awaitable[Sequence[float]]]
+
+
+def normalize_question(text: str) -> str:
+    """Case, whitespace and trailing punctuation don't change the answer."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return " ".join(text.split()).strip(" ?!.")
+
+
+@dataclass
+class AnswerLookup:
+    """Result of `AnswerCache.lookup`; pass it back to `store` on a miss."""
+    answer: ResultPayload | None = None
+    key: str | None = None
+    scope: str | None = None
+    embedding: np.ndarray | None = None
+
+
+class SemanticIndex:
+    """
+    In-process vector index of cached questions, one matrix per scope.
+
+    Rows are unit-length embeddings, so a matrix-vector product gives cosine
+    similarities. Scopes are LRU-bounded and rows expire with the Redis TTL;
+    a scope whose vector stores changed is never queried again and ages out.
+    """
+
+    def __init__(self, ttl: int, max_scopes: int = 256, max_entries_per_scope: int = 2048):
+        self.ttl = ttl
+        self.max_scopes = max_scopes
+        self.max_entries_per_scope = max_entries_per_scope
+        self._scopes: OrderedDict[str, tuple[np.ndarray, list[str], list[float]]] = OrderedDict()
+
+    def search(self, scope: str, embedding: np.ndarray, min_similarity: float) -> str | None:
+        entry = self._scopes.get(scope)
+        if entry is None:
+            return None
+        self._scopes.move_to_end(scope)
+
+        vectors, keys, expires = entry
+        similarities = vectors @ embedding
+        now = time.monotonic()
+        for i in np.argsort(similarities)[::-1]:
+            if similarities[i] < min_similarity:
+                return None
+            if expires[i] > now:
+                return keys[i]
+        return None
+
+    def add(self, scope: str, key: str, embedding: np.ndarray) -> None:
+        vectors, keys, expires = self._scopes.pop(scope, (None, [], []))
+        row = embedding[np.newaxis, :]
+        vectors = row if vectors is None else np.vstack([vectors, row])
+        keys = keys + [key]
+        expires = expires + [time.monotonic() + self.ttl]
+
+        if len(keys) > self.max_entries_per_scope:
+            vectors, keys, expires = vectors[1:], keys[1:], expires[1:]
+
+        if len(self._scopes) >= self.max_scopes:
+            self._scopes.popitem(last=False)
+        self._scopes[scope] = (vectors, keys, expires)
+
+
+class AnswerCache:
+    """
+    Cache of assistant answers (with their sources) for repeated questions.
+
+    Entries are keyed by vector store ids, model, instructions and the
+    normalized question, and live in Redis for `ttl` seconds so every API and
+    worker process shares them. Each vector store has a generation counter
+    that is part of the key; `invalidate` bumps it whenever the store's files
+    change, which orphans every answer drawn from the old contents at once.
+
+    With an `index`, exact misses are embedded and matched against similar
+    questions seen by this process. Redis errors degrade to a miss. A cache
+    without Redis is disabled.
+    """
+
+    def __init__(
+        self,
+        redis: Redis | None,
+        ttl: int,
+        index: SemanticIndex | None = None,
+        min_similarity: float = 0.95,
+    ):
+        self.redis = redis
+        self.ttl = ttl
+        self.index = index
+        self.min_similarity = min_similarity
+
+    async def lookup(
+        self,
+        vector_store_ids: Sequence[str],
+        model: str,
+        instructions: str | None,
+        question: str,
+        embed: Embed | None = None,
+    ) -> AnswerLookup:
+        if self.redis is None:
+            return AnswerLookup()
+
+        normalized = normalize_question(question)
+        try:
+            scope = await self._scope(vector_store_ids, model, instructions)
+            key = _digest(scope, normalized)
+            cached = await self.redis.get(self._redis_key(key))
+        except Exception as e:
+            logger.warning("Answer cache read failed: %s", e)
+            return AnswerLookup()
+
+        if cached is not None:
+            return AnswerLookup(answer=ResultPayload.model_validate_json(cached), key=key, scope=scope)
+
+        lookup = AnswerLookup(key=key, scope=scope)
+        if self.index is None or embed is None:
+            return lookup
+
+        try:
+            lookup.embedding = _unit(await embed(normalized))
+            similar = self.index.search(scope, lookup.embedding, self.min_similarity)
+            if similar:
+                cached = await self.redis.get(self._redis_key(similar))
+                if cached is not None:
+                    lookup.answer = ResultPayload.model_validate_json(cached)
+        except Exception as e:
+            logger.warning("Semantic answer cache lookup failed: %s", e)
+        return lookup
+
+    async def store(self, lookup: AnswerLookup, answer: ResultPayload) -> None:
+        if self.redis is None or lookup.key is None or not answer.answer:
+            return
+        try:
+            await self.redis.setex(self._redis_key(lookup.key), self.ttl, answer.model_dump_json())
+        except Exception as e:
+            logger.warning("Answer cache write failed: %s", e)
+            return
+        if self.index is not None and lookup.embedding is not None:
+            self.index.add(lookup.scope, lookup.key, lookup.embedding)
+
+    async def invalidate(self, vector_store_id: str) -> None:
+        """Drop every cached answer that searched `vector_store_id`."""
+        if self.redis is None:
+            return
+        try:
+            await self.redis.incr(self._generation_key(vector_store_id))
+        except Exception as e:
+            logger.warning("Answer cache invalidation failed for %s: %s", vector_store_id, e)
+
+    async def _scope(self, vector_store_ids: Sequence[str], model: str, instructions: str | None) -> str:
+        stores = sorted(set(vector_store_ids))
+        generations = await self.redis.mget([self._generation_key(vs) for vs in stores]) if stores else []
+        return _digest(
+            [[vs, int(gen or 0)] for vs, gen in zip(stores, generations)],
+            model,
+            hashlib.sha256((instructions or "").encode()).hexdigest(),
+        )
+
+    @staticmethod
+    def _redis_key(key: str) -> str:
+        return f"{REDIS_PREFIX}:entry:{key}"
+
+    @staticmethod
+    def _generation_key(vector_store_id: str) -> str:
+        return f"{REDIS_PREFIX}:generation:{vector_store_id}"
+
+
+def _digest(*parts) -> str:
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode()).hexdigest()
+
+
+def _unit(vector: Sequence[float]) -> np.ndarray:
+    array = np.asarray(vector, dtype=np.float32)
+    return array / (np.linalg.norm(array) or 1.0)
+
+
+answer_cache = AnswerCache(
+    redis=redis_client if settings.ANSWER_CACHE_ENABLED else None,
+    ttl=settings.ANSWER_CACHE_TTL,
+    index=SemanticIndex(ttl=settings.ANSWER_CACHE_TTL) if settings.ANSWER_CACHE_SEMANTIC else None,
+    min_similarity=settings.ANSWER_CACHE_MIN_SIMILARITY,
+)
@@ -0,0 +1,101 @@
+# app/infrastructure/llm/client.py
+from typing import Any
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.infrastructure.llm.rate_limiter import Priority, RateLimitedTransport, openai_rate_limiter
+
+
+logger = get_logger()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def build_openai_client(priority: Priority = Priority.CHAT, **overrides: Any) -> AsyncOpenAI:
+    """
+    Build an AsyncOpenAI client backed by a tuned httpx connection pool.
+
+    :param priority: Rate limiter priority of requests made with this client,
+        unless overridden with `openai_priority`
+    :param overrides: Extra keyword arguments for AsyncOpenAI (e.g. base_url)
+    :return: AsyncOpenAI instance owning its own httpx.AsyncClient
+    """
+    http2 = settings.OPENAI_HTTP2
+    if http2 and not _http2_available():
+        logger.warning("OPENAI_HTTP2 is enabled but 'h2' is not installed; falling back to HTTP/1.1")
+        http2 = False
+
+    transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY,
+        ),
+    )
+    if settings.OPENAI_LIMITER_ENABLED:
+        transport = RateLimitedTransport(transport, openai_rate_limiter, priority)
+
+    http_client = DefaultAsyncHttpxClient(
+        transport=transport,
+        timeout=httpx.Timeout(settings.OPENAI_TIMEOUT, connect=10.0),
+    )
+
+    return AsyncOpenAI(
+        api_key=overrides.pop("api_key", settings.OPENAI_API_KEY),
+        timeout=settings.OPENAI_TIMEOUT,
+        http_client=http_client,
+        **overrides,
+    )
+
+
+class OpenAIClientRegistry:
+    """
+    Application-lifetime owner of the shared AsyncOpenAI client.
+
+    The client (and its keep-alive connection pool) is created once in the
+    FastAPI lifespan hook and closed on shutdown, so requests reuse warm
+    TCP/TLS connections instead of paying the setup cost every time.
+    """
+
+    def __init__(self):
+        self._client: AsyncOpenAI | None = None
+
+    def init_client(self) -> AsyncOpenAI:
+        """
+        Create the shared client if it does not exist yet.
+        """
+        if self._client is None:
+            self._client = build_openai_client()
+            logger.info(
+                "OpenAI client pool initialized (max_connections=%s, keepalive=%s, http2=%s)",
+                settings.OPENAI_MAX_CONNECTIONS,
+                settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+                settings.OPENAI_HTTP2,
+            )
+        return self._client
+
+    def get_client(self) -> AsyncOpenAI:
+        """
+        Return the shared client, creating it lazily when used outside the lifespan
+        (tests, scripts).
+        """
+        return self._client or self.init_client()
+
+    async def close(self):
+        """
+        Close the shared client and release pooled connections.
+        """
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+openai_registry = OpenAIClientRegistry()
@@ -1,26 +1,42 @@
 from pathlib import Path
-import aiofiles
 import time
-from typing import Any
+from typing import Any, Awaitable, Callable, TypeVar
 import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from openai import NOT_GIVEN
 from openai import (
     AsyncOpenAI,
-    BadRequestError, NotFoundError, ConflictError,
-    InternalServerError, RateLimitError, APIError
+    BadRequestError, NotFoundError, ConflictError, PermissionDeniedError,
+    InternalServerError, RateLimitError, APIConnectionError, APIError
 )
 from app.domain.user.schema import UserOutSchema
 from app.domain.message.schema import ResultPayload, SourceInfo
 from app.domain.file.repository import FileRepo
 from app.domain.storage.repository import StorageRepo
+from app.domain.storage.registry import storage_registry
+from app.infrastructure.llm.source_cache import source_file_cache
+from app.infrastructure.llm.answer_cache import AnswerLookup, answer_cache
+from app.infrastructure.llm.resilience import Deadline, LatencyTracker, hedged
+from app.core.config import settings
 from app.core.logger import get_logger
 from app.core.decorators import log_timing
 
 
 logger = get_logger()
 
+T = TypeVar("T")
+
+# Worth retrying with the same model (APITimeoutError is an APIConnectionError)
+RETRYABLE_ERRORS = (InternalServerError, RateLimitError, APIConnectionError)
+# The model itself is unavailable to this account; go straight to the fallback
+MODEL_UNAVAILABLE_ERRORS = (NotFoundError, PermissionDeniedError)
+ATTEMPTS_PER_MODEL = 2
+RETRY_BACKOFF_SECONDS = 4
+# Attempts are not started with less time than this left
+MIN_ATTEMPT_SECONDS = 1.0
+
+latency_tracker = LatencyTracker()
+
 
 class OpenAIManager:
     def __init__(
@@ -78,14 +94,13 @@ class OpenAIManager:
             logger.warning(f"Conversation {conv_id} inactive or invalid after {elapsed:.3f}s: {e}")
             return False
 
-    async def create_response(
+    async def _response_params(
         self,
         db: AsyncSession,
-        conv_id: str,
         user: UserOutSchema,
         user_input: str,
         vector_store_id: str | None
-    ) -> ResultPayload:
+    ) -> dict[str, Any]:
         if vector_store_id:
             vector_store_ids = [vector_store_id]
         else:
@@ -100,7 +115,7 @@ class OpenAIManager:
         else:
             instructions = self._get_web_instruction()
 
-        resp = await self.client.responses.create(
+        return dict(
             model=model,
             tools=tools_arg or NOT_GIVEN,
             instructions=instructions,
@@ -109,6 +124,7 @@ class OpenAIManager:
             # temperature=0.7,
         )
 
+    async def _parse_response(self, db: AsyncSession, resp) -> ResultPayload:
         answer = ""
         sources = []
         
@@ -122,20 +138,202 @@ class OpenAIManager:
         
         return ResultPayload(answer=answer, sources=sources)
 
+    async def _lookup_answer(self, params: dict[str, Any], user_input: str) -> AnswerLookup:
+        # Responses are stateless (no conversation), so an answer only depends on these
+        tools = params["tools"] or []
+        return await answer_cache.lookup(
+            vector_store_ids=[vs for tool in tools for vs in tool["vector_store_ids"]],
+            model=params["model"],
+            instructions=params["instructions"],
+            question=user_input,
+            embed=self.embed,
+        )
+
+    async def embed(self, text: str) -> list[float]:
+        resp = await self.client.embeddings.create(
+            model=settings.ANSWER_CACHE_EMBEDDING_MODEL,
+            input=text,
+        )
+        return resp.data[0].embedding
+
+    async def create_response(
+        self,
+        db: AsyncSession,
+        conv_id: str,
+        user: UserOutSchema,
+        user_input: str,
+        vector_store_id: str | None,
+        deadline: Deadline | None = None,
+    ) -> ResultPayload:
+        """
+        Answer `user_input` by `deadline`, falling back to LLM_FALLBACK_MODEL
+        when the user's model fails or runs out of its share of the time.
+        """
+        params = await self._response_params(db, user, user_input, vector_store_id)
+        lookup = await self._lookup_answer(params, user_input)
+        if lookup.answer:
+            return lookup.answer
+
+        resp, model = await self._call_with_fallback(
+            params, deadline or Deadline.after(settings.LLM_DEADLINE_SECONDS), self._create_once
+        )
+        result = await self._parse_response(db, resp)
+        if model == params["model"]:
+            await answer_cache.store(lookup, result)
+        return result
+
+    async def _create_once(self, params: dict[str, Any], timeout: float):
+        model = params["model"]
+        hedge_after = latency_tracker.p95(model) if settings.LLM_HEDGING else None
+        started = time.monotonic()
+        # Each call only does HTTP; the response is parsed once, by the caller
+        resp = await hedged(lambda: self.client.responses.create(**params), timeout, hedge_after)
+        latency_tracker.record(model, time.monotonic() - started)
+        return resp
+
+    async def _call_with_fallback(
+        self,
+        params: dict[str, Any],
+        deadline: Deadline,
+        call: Callable[[dict[str, Any], float], Awaitable[T]],
+    ) -> tuple[T, str]:
+        """
+        Run `call(params, timeout)` with the user's model, then the fallback
+        model, retrying transient errors while `deadline` allows.
+
+        The user's model gets the time left minus LLM_FALLBACK_RESERVE_SECONDS,
+        so the fallback always has a chance. Timeouts and unavailable models
+        skip straight to the next model; other errors are raised at once.
+
+        :return: The result and the model that produced it
+        """
+        models = [params["model"]]
+        if settings.LLM_FALLBACK_MODEL and settings.LLM_FALLBACK_MODEL != params["model"]:
+            models.append(settings.LLM_FALLBACK_MODEL)
+
+        last_error: Exception | None = None
+        for index, model in enumerate(models):
+            reserve = settings.LLM_FALLBACK_RESERVE_SECONDS if index < len(models) - 1 else 0.0
+            for attempt in range(1, ATTEMPTS_PER_MODEL + 1):
+                timeout = deadline.remaining() - reserve
+                if timeout < MIN_ATTEMPT_SECONDS:
+                    break
+                try:
+                    return await call({**params, "model": model}, timeout), model
+                except TimeoutError as e:
+                    logger.warning("OpenAI %s gave no answer within %.1fs", model, timeout)
+                    last_error = e
+                    break
+                except MODEL_UNAVAILABLE_ERRORS as e:
+                    logger.warning("OpenAI model %s unavailable: %s", model, e)
+                    last_error = e
+                    break
+                except RETRYABLE_ERRORS as e:
+                    logger.warning("OpenAI %s attempt %s failed: %s", model, attempt, e)
+                    last_error = e
+                    if attempt == ATTEMPTS_PER_MODEL:
+                        break
+                    if deadline.remaining() - reserve - RETRY_BACKOFF_SECONDS < MIN_ATTEMPT_SECONDS:
+                        break
+                    await asyncio.sleep(RETRY_BACKOFF_SECONDS)
+
+        if last_error is not None:
+            raise last_error
+        raise TimeoutError("Answer deadline passed before any model was tried")
+
+    async def stream_response(
+        self,
+        db: AsyncSession,
+        conv_id: str,
+        user: UserOutSchema,
+        user_input: str,
+        vector_store_id: str | None,
+        on_delta: Callable[[str, int], Awaitable[None]],
+        deadline: Deadline | None = None,
+    ) -> ResultPayload:
+        """
+        Like `create_response`, but streams the answer text.
+
+        `on_delta(text, offset)` is awaited for every output_text delta, where
+        `offset` is the position of `text` in the answer. Sources are resolved
+        once from the completed response. A cached answer arrives as one delta.
+        Streams are never hedged, and the deadline only bounds the wait for
+        the first delta, so a long answer that keeps streaming is not cut
+        off. An answer restarted on retry or fallback streams again from
+        offset 0.
+        """
+        params = await self._response_params(db, user, user_input, vector_store_id)
+        lookup = await self._lookup_answer(params, user_input)
+        if lookup.answer:
+            await on_delta(lookup.answer.answer, 0)
+            return lookup.answer
+
+        async def stream_once(attempt_params: dict[str, Any], timeout: float):
+            return await self._stream_completed(attempt_params, on_delta, Deadline.after(timeout))
+
+        completed, model = await self._call_with_fallback(
+            params, deadline or Deadline.after(settings.LLM_DEADLINE_SECONDS), stream_once
+        )
+        result = await self._parse_response(db, completed)
+        if model == params["model"]:
+            await answer_cache.store(lookup, result)
+        return result
+
+    async def _stream_completed(
+        self,
+        params: dict[str, Any],
+        on_delta: Callable[[str, int], Awaitable[None]],
+        first_delta_by: Deadline,
+    ):
+        """
+        Stream one response through `on_delta` and return the completed response.
+
+        Raises TimeoutError if no delta arrives by `first_delta_by`, or if the
+        stream then stalls for LLM_STREAM_IDLE_SECONDS.
+        """
+        stream = await asyncio.wait_for(
+            self.client.responses.create(**params, stream=True), first_delta_by.remaining()
+        )
+        try:
+            events = aiter(stream)
+            offset = 0
+            streaming = False
+            completed = None
+            while True:
+                wait = settings.LLM_STREAM_IDLE_SECONDS if streaming else first_delta_by.remaining()
+                try:
+                    event = await asyncio.wait_for(anext(events), wait)
+                except StopAsyncIteration:
+                    break
+
+                if event.type == "response.output_text.delta":
+                    streaming = True
+                    await on_delta(event.delta, offset)
+                    offset += len(event.delta)
+                elif event.type == "response.completed":
+                    completed = event.response
+                elif event.type in ("response.failed", "response.incomplete"):
+                    detail = event.response.error or event.response.incomplete_details
+                    raise RuntimeError(f"Response stream {event.type}: {detail}")
+                elif event.type == "error":
+                    raise RuntimeError(f"Response stream error {event.code}: {event.message}")
+        finally:
+            # Frees the connection (and its rate limiter lease) when we stop early
+            await stream.close()
+
+        if completed is None:
+            raise RuntimeError("Response stream ended before completion")
+        return completed
+
     @log_timing("OpenAI:message")
-    @retry(
-        stop=stop_after_attempt(2),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((InternalServerError, RateLimitError, APIError)),
-        reraise=True
-    )
     async def send_and_receive(
         self,
         db: AsyncSession,
         conv_id: str,
         user: UserOutSchema,
         user_input: str,
-        vector_store_id: str | None = None
+        vector_store_id: str | None = None,
+        deadline: Deadline | None = None,
     ) -> ResultPayload:
         """
         Send user input and receive AI response with retry on transient errors.
@@ -143,6 +341,8 @@ class OpenAIManager:
         :param conv_id: Conversation ID
         :param user: UserOutSchema instance containing model and tool info
         :param user_input: User message input string
+        :param deadline: When the answer is needed by; LLM_DEADLINE_SECONDS from now by default.
+            Raises TimeoutError once it passes
         :return: ResultPayload containing answer and sources
         """
         try:
@@ -151,7 +351,7 @@ class OpenAIManager:
             #     # Optionally create new conversation here or throw exception
             #     logger.warning(f"Conversation {conv_id} inactive, consider creating a new one.")
 
-            return await self.create_response(db, conv_id, user, user_input, vector_store_id)
+            return await self.create_response(db, conv_id, user, user_input, vector_store_id, deadline)
 
         except (InternalServerError, RateLimitError, APIError) as e:
             logger.exception("OpenAIManager send_and_receive failed with retryable error: %s", e)
@@ -160,26 +360,114 @@ class OpenAIManager:
             logger.exception("OpenAIManager unexpected error in send_and_receive: %s", e)
             raise
 
+    @log_timing("OpenAI:message_stream")
+    async def stream_and_receive(
+        self,
+        db: AsyncSession,
+        conv_id: str,
+        user: UserOutSchema,
+        user_input: str,
+        on_delta: Callable[[str, int], Awaitable[None]],
+        vector_store_id: str | None = None,
+        deadline: Deadline | None = None,
+    ) -> ResultPayload:
+        """
+        Streaming variant of `send_and_receive`. A retried attempt streams
+        the answer again from offset 0.
+
+        :param on_delta: Awaited with (text, offset) for each answer delta
+        :return: ResultPayload containing the full answer and sources
+        """
+        try:
+            return await self.stream_response(db, conv_id, user, user_input, vector_store_id, on_delta, deadline)
+        except (InternalServerError, RateLimitError, APIError) as e:
+            logger.exception("OpenAIManager stream_and_receive failed with retryable error: %s", e)
+            raise
+        except Exception as e:
+            logger.exception("OpenAIManager unexpected error in stream_and_receive: %s", e)
+            raise
+
     @log_timing("OpenAI:create_file")
     async def create_file_from_path(self, path: str, vector_store_id: str):
-        async with aiofiles.open(path, "rb") as f:
-            file_content = await f.read()
+        """
+        Upload a local file and attach it to a vector store.
+
+        The SDK gets an open file handle rather than the file's bytes, so httpx
+        streams the multipart body from disk in small chunks and memory stays
+        flat regardless of file size.
+        """
+        normalized_filename = self._normalize_filename(Path(path).name)
+
+        fh = await asyncio.to_thread(open, path, "rb")
+        try:
+            openai_file = await self.client.files.create(
+                file=(normalized_filename, fh),
+                purpose="assistants"
+            )
+        finally:
+            await asyncio.to_thread(fh.close)
 
-        original_filename = Path(path).name
-        stem = Path(original_filename).stem
-        ext = Path(original_filename).suffix.lower()
-        normalized_filename = f"{stem}{ext}"
-        
-        openai_file = await self.client.files.create(
-            file=(normalized_filename, file_content),
-            purpose="assistants"
-        )
         await self.client.vector_stores.files.create(
             vector_store_id=vector_store_id,
             file_id=openai_file.id,
         )
         return openai_file
 
+    @staticmethod
+    def _normalize_filename(name: str) -> str:
+        path = Path(name)
+        return f"{path.stem}{path.suffix.lower()}"
+
+    @log_timing("OpenAI:create_file_from_bytes")
+    async def create_file_from_bytes(self, filename: str, data: bytes):
+        """Upload a small in-memory file (not attached to any vector store)."""
+        return await self.client.files.create(
+            file=(self._normalize_filename(filename), data),
+            purpose="assistants"
+        )
+
+    async def create_upload(self, filename: str, size: int, mime_type: str) -> str:
+        """Start a multi-part OpenAI Upload and return its id."""
+        upload = await self.client.uploads.create(
+            bytes=size,
+            filename=self._normalize_filename(filename),
+            mime_type=mime_type,
+            purpose="assistants",
+        )
+        return upload.id
+
+    async def add_upload_part(self, upload_id: str, data: bytes) -> str:
+        """Send one part of an OpenAI Upload and return the part id."""
+        part = await self.client.uploads.parts.create(upload_id=upload_id, data=data)
+        return part.id
+
+    @log_timing("OpenAI:complete_upload")
+    async def complete_upload(self, upload_id: str, part_ids: list[str]):
+        """Finish an OpenAI Upload and return the resulting file object."""
+        upload = await self.client.uploads.complete(upload_id=upload_id, part_ids=part_ids)
+        return upload.file
+
+    async def cancel_upload(self, upload_id: str) -> None:
+        try:
+            await self.client.uploads.cancel(upload_id)
+        except Exception as e:
+            logger.warning("Failed to cancel OpenAI upload %s: %s", upload_id, e)
+
+    async def discard_file(self, file_id: str) -> None:
+        """Delete an OpenAI file that was never attached to a vector store."""
+        try:
+            await self.client.files.delete(file_id)
+        except NotFoundError:
+            pass
+        except Exception as e:
+            logger.warning("Failed to delete OpenAI file %s: %s", file_id, e)
+
+    async def attach_to_vector_store(self, vector_store_id: str, file_id: str) -> None:
+        await self.client.vector_stores.files.create(
+            vector_store_id=vector_store_id,
+            file_id=file_id,
+        )
+
     @log_timing("OpenAI:delete_file")
     async def delete_file(
         self, vector_store_id: str, file_id: str, max_retries=3, delay=1
@@ -243,6 +531,31 @@ class OpenAIManager:
         """
         List all files attached to a specific vector store.
         """
+        all_files = await self._list_all_vector_store_files(vector_store_id)
+
+        res = [file for file in all_files if file.status != 'completed']
+        return res  # result.data is list[VectorStoreFile] [web:21][web:35]
+
+    @log_timing("OpenAI:list_vector_store_file_statuses")
+    async def list_vector_store_file_statuses(
+        self, vector_store_id: str, status: str | None = None
+    ) -> dict[str, Any]:
+        """
+        Map file id -> VectorStoreFile for every file in a store, or only
+        those with `status` ("in_progress", "completed", "failed", "cancelled").
+
+        Pages 100 at a time, so reconciling N files costs ~N/100 calls
+        instead of one retrieve per file.
+        """
+        files = await self._list_all_vector_store_files(vector_store_id, status)
+        return {f.id: f for f in files}
+
+    async def get_vector_store_file_counts(self, vector_store_id: str):
+        """Per-status file counts of a vector store (in_progress, completed, failed, cancelled, total)."""
+        vector_store = await self.client.vector_stores.retrieve(vector_store_id)
+        return vector_store.file_counts
+
+    async def _list_all_vector_store_files(self, vector_store_id: str, status: str | None = None) -> list:
         all_files = []
         after = None
         while True:
@@ -250,6 +563,7 @@ class OpenAIManager:
                 vector_store_id=vector_store_id,
                 limit=100,
                 after=after,
+                filter=status or NOT_GIVEN,
             )
             all_files.extend(page.data)
 
@@ -262,8 +576,7 @@ class OpenAIManager:
             if not after:
                 break
 
-        res = [file for file in all_files if file.status != 'completed']
-        return res  # result.data is list[VectorStoreFile] [web:21][web:35]
+        return all_files
 
     @log_timing("OpenAI:retrieve_file")
     async def retrieve_file(self, vector_store_id: str, file_id: str):
@@ -292,7 +605,7 @@ class OpenAIManager:
             return user.vector_store_ids
         
         # Priority 2: Default storage from storages table
-        default_storage = await self.storage_repo.get_default_storage(db)
+        default_storage = await storage_registry.get_default(db)
         if default_storage:
             return [default_storage.vector_store_id]
         
@@ -327,24 +640,52 @@ class OpenAIManager:
     ) -> list[SourceInfo]:
         """
         Extract unique sources from the content annotations, avoiding duplicates.
-        
+
+        All cited files are resolved together: cached ones from
+        `source_file_cache`, the rest in a single query.
+
         :param content_item: AI response content item with annotations
         :return: List of SourceInfo
         """
-        sources = []
-        seen_file_ids = set()
+        # storage_key -> page of its first citation, in citation order
+        citations: dict[str, int | None] = {}
         for annotation in getattr(content_item, "annotations", []):
             if getattr(annotation, "type", None) == "file_citation":
                 file_id = getattr(annotation, "file_id", None)
-                if not file_id or file_id in seen_file_ids:
+                if not file_id or file_id in citations:
                     continue
-                seen_file_ids.add(file_id)
-                page = getattr(annotation, "page", None)
-                source_info = await self.get_source_file(db, file_id, page)
-                if source_info:
-                    sources.append(source_info)
+                citations[file_id] = getattr(annotation, "page", None)
+
+        if not citations:
+            return []
+
+        files = await self.resolve_source_files(db, list(citations))
+        sources = []
+        for file_id, page in citations.items():
+            if file_id not in files:
+                logger.warning("Source file %s not found in DB", file_id)
+                continue
+            db_id, name = files[file_id]
+            sources.append(SourceInfo(file_id=db_id, file_name=name, page=page))
         return sources
 
+    async def resolve_source_files(
+        self, db: AsyncSession, storage_keys: list[str]
+    ) -> dict[str, tuple[int, str | None]]:
+        """
+        Map OpenAI file ids to (files.id, name), cache first.
+
+        :param storage_keys: OpenAI file ids (files.storage_key)
+        :return: Found files keyed by storage key
+        """
+        found = source_file_cache.get_many(storage_keys)
+        missing = [key for key in storage_keys if key not in found]
+        if missing:
+            for key, file in (await self.file_repo.get_by_storage_keys(db, missing)).items():
+                source_file_cache.set(key, file.id, file.name)
+                found[key] = (file.id, file.name)
+        return found
+
     async def get_source_file(
         self, db: AsyncSession, file_id: str, page: int | None
     ) -> SourceInfo | None:
@@ -355,16 +696,12 @@ class OpenAIManager:
         :param page: Page number (optional)
         :return: SourceInfo or None
         """
-        file = await self.file_repo.get_by_storage_key(db, file_id)
-        if not file:
+        files = await self.resolve_source_files(db, [file_id])
+        if file_id not in files:
             logger.warning("Source file %s not found in DB", file_id)
             return None
-        source_info = SourceInfo(
-            file_id=file.id,
-            file_name=file.name,
-            page=page
-        )
-        return source_info
+        db_id, name = files[file_id]
+        return SourceInfo(file_id=db_id, file_name=name, page=page)
 
     def _get_bitrix_instruction(self) -> str:
     
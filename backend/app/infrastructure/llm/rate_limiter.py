@@ -0,0 +1,292 @@
+# app/infrastructure/llm/rate_limiter.py
+import asyncio
+import random
+import re
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import Awaitable, Callable, Iterator, Mapping
+import httpx
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.infrastructure.redis.client import redis_client
+
+
+logger = get_logger()
+
+REDIS_PREFIX = "openai:ratelimit"
+
+# Below this fraction of the remaining requests/tokens, background traffic
+# pauses until the window resets
+LOW_WATER = 0.1
+# Bucket capacity, in seconds' worth of requests
+BURST_SECONDS = 10
+IN_FLIGHT_POLL_MS = 100
+
+
+class Priority(str, Enum):
+    CHAT = "chat"
+    BACKGROUND = "background"
+
+
+_priority: ContextVar[Priority | None] = ContextVar("openai_priority", default=None)
+
+
+@contextmanager
+def openai_priority(priority: Priority) -> Iterator[None]:
+    """Send OpenAI requests made in this block (and tasks it starts) at `priority`."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+# KEYS: bucket, in-flight leases, pauses
+# ARGV: priority, default rate (requests/ms), capacity, reserve, max in flight, lease ms, lease id
+# Returns 0 when the lease is taken, otherwise ms to wait (-1: poll for a free slot)
+ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+local paused_until = tonumber(redis.call('HGET', KEYS[3], ARGV[1]) or '0')
+if paused_until > now then
+    return paused_until - now
+end
+
+local rate = tonumber(redis.call('HGET', KEYS[1], 'rate') or ARGV[2])
+local capacity = tonumber(ARGV[3])
+local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens') or ARGV[3])
+local updated = tonumber(redis.call('HGET', KEYS[1], 'updated') or now)
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', now)
+redis.call('PEXPIRE', KEYS[1], 3600000)
+
+local reserve = tonumber(ARGV[4])
+if tokens < reserve + 1 then
+    return math.max(1, math.ceil((reserve + 1 - tokens) / rate))
+end
+
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+if redis.call('ZCARD', KEYS[2]) >= tonumber(ARGV[5]) then
+    return -1
+end
+
+redis.call('ZADD', KEYS[2], now + tonumber(ARGV[6]), ARGV[7])
+redis.call('PEXPIRE', KEYS[2], tonumber(ARGV[6]))
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens - 1))
+return 0
+"""
+
+# KEYS: pauses; ARGV: duration ms, priorities...
+PAUSE_SCRIPT = """
+local t = redis.call('TIME')
+local paused_until = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000) + tonumber(ARGV[1])
+for i = 2, #ARGV do
+    if paused_until > tonumber(redis.call('HGET', KEYS[1], ARGV[i]) or '0') then
+        redis.call('HSET', KEYS[1], ARGV[i], paused_until)
+    end
+end
+redis.call('PEXPIRE', KEYS[1], 3600000)
+return paused_until
+"""
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNIT_MS = {"ms": 1, "s": 1000, "m": 60_000, "h": 3_600_000}
+
+
+def parse_reset_ms(value: str | None) -> int:
+    """OpenAI reset headers look like "20ms", "1s" or "6m0s"."""
+    if not value:
+        return 0
+    return int(sum(float(n) * _UNIT_MS[unit] for n, unit in _DURATION.findall(value)))
+
+
+def retry_after_ms(headers: Mapping[str, str]) -> int:
+    try:
+        if headers.get("retry-after-ms"):
+            return int(float(headers["retry-after-ms"]))
+        if headers.get("retry-after"):
+            return int(float(headers["retry-after"]) * 1000)
+    except ValueError:
+        pass
+    return 0
+
+
+class OpenAIRateLimiter:
+    """
+    Rate and concurrency limit for OpenAI requests, shared through Redis by
+    every API pod and worker process.
+
+    Each request takes a token from a bucket refilled at the account's
+    requests-per-minute and a lease on one of `max_in_flight` slots (leases
+    expire, so a crashed process cannot leak them). Background requests may
+    only use `background_share` of the burst and of the slots, leaving the
+    rest to chat. Responses feed back in: the `x-ratelimit-limit-requests`
+    header sets the refill rate, a low `x-ratelimit-remaining-*` pauses
+    background traffic until the window resets, and a 429 pauses everyone
+    for its retry-after.
+
+    Redis errors fail open. Chat gives up waiting after `max_wait` seconds
+    and sends anyway; background waits as long as it takes.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        requests_per_minute: int,
+        max_in_flight: int,
+        background_share: float,
+        max_wait: float,
+        lease_seconds: float,
+    ):
+        self.redis = redis
+        self.requests_per_minute = requests_per_minute
+        self.max_in_flight = max_in_flight
+        self.background_share = background_share
+        self.max_wait = max_wait
+        self.lease_ms = int(lease_seconds * 1000)
+        self.capacity = max(1.0, requests_per_minute / 60 * BURST_SECONDS)
+        self._acquire = redis.register_script(ACQUIRE_SCRIPT)
+        self._pause = redis.register_script(PAUSE_SCRIPT)
+        self._keys = [f"{REDIS_PREFIX}:bucket", f"{REDIS_PREFIX}:in_flight", f"{REDIS_PREFIX}:pause"]
+        self._known_limit: int | None = None
+
+    async def acquire(self, priority: Priority) -> str | None:
+        """Wait for a token and a slot; returns the lease to `release`, or None if not taken."""
+        if priority == Priority.CHAT:
+            reserve, max_in_flight = 0, self.max_in_flight
+        else:
+            reserve = self.capacity * (1 - self.background_share)
+            max_in_flight = max(1, int(self.max_in_flight * self.background_share))
+
+        lease = uuid.uuid4().hex
+        started = time.monotonic()
+        while True:
+            try:
+                wait_ms = await self._acquire(
+                    keys=self._keys,
+                    args=[
+                        priority.value,
+                        self.requests_per_minute / 60_000,
+                        self.capacity,
+                        reserve,
+                        max_in_flight,
+                        self.lease_ms,
+                        lease,
+                    ],
+                )
+            except Exception as e:
+                logger.warning("OpenAI rate limiter unavailable, not limiting: %s", e)
+                return None
+
+            waited = time.monotonic() - started
+            if wait_ms == 0:
+                if waited > 1:
+                    logger.info("OpenAI %s request waited %.1fs for the rate limiter", priority.value, waited)
+                return lease
+
+            delay = (IN_FLIGHT_POLL_MS if wait_ms < 0 else min(wait_ms, 1000)) / 1000
+            if priority == Priority.CHAT and waited + delay > self.max_wait:
+                logger.warning("OpenAI rate limiter wait exceeded %.0fs, sending chat request anyway", self.max_wait)
+                return None
+            await asyncio.sleep(delay * random.uniform(1, 1.2))
+
+    async def release(self, lease: str | None) -> None:
+        if lease is None:
+            return
+        try:
+            await self.redis.zrem(self._keys[1], lease)
+        except Exception as e:
+            logger.warning("Failed to release OpenAI rate limiter lease: %s", e)
+
+    async def observe(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Adapt to the rate limit headers of an OpenAI response."""
+        try:
+            if status_code == 429:
+                pause_ms = retry_after_ms(headers) or parse_reset_ms(headers.get("x-ratelimit-reset-requests")) or 1000
+                logger.warning("OpenAI returned 429, pausing all requests for %sms", pause_ms)
+                await self._pause(keys=[self._keys[2]], args=[pause_ms, Priority.CHAT.value, Priority.BACKGROUND.value])
+                return
+
+            limit = headers.get("x-ratelimit-limit-requests")
+            if limit and limit.isdigit() and int(limit) != self._known_limit:
+                self._known_limit = int(limit)
+                rate = min(self.requests_per_minute, self._known_limit) / 60_000
+                await self.redis.hset(self._keys[0], "rate", rate)
+
+            pause_ms = 0
+            for kind in ("requests", "tokens"):
+                remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+                limit = headers.get(f"x-ratelimit-limit-{kind}")
+                if remaining and limit and remaining.isdigit() and limit.isdigit():
+                    if int(remaining) < int(limit) * LOW_WATER:
+                        pause_ms = max(pause_ms, parse_reset_ms(headers.get(f"x-ratelimit-reset-{kind}")))
+            if pause_ms:
+                await self._pause(keys=[self._keys[2]], args=[pause_ms, Priority.BACKGROUND.value])
+        except Exception as e:
+            logger.warning("Failed to update OpenAI rate limiter: %s", e)
+
+
+class _ReleaseOnClose(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], Awaitable[None]]):
+        self._stream = stream
+        self._release = release
+        self._released = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                await self._release()
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that puts every request through `limiter`.
+
+    Sitting under the SDK, it covers every OpenAI call, including the SDK's
+    own retries. The lease is held until the response body is closed, so
+    streamed responses count as in flight for their whole duration.
+    Requests default to `priority` unless `openai_priority` says otherwise.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, limiter: OpenAIRateLimiter, priority: Priority):
+        self.transport = transport
+        self.limiter = limiter
+        self.priority = priority
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        lease = await self.limiter.acquire(_priority.get() or self.priority)
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            await self.limiter.release(lease)
+            raise
+
+        await self.limiter.observe(response.status_code, response.headers)
+        response.stream = _ReleaseOnClose(response.stream, lambda: self.limiter.release(lease))
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+openai_rate_limiter = OpenAIRateLimiter(
+    redis=redis_client,
+    requests_per_minute=settings.OPENAI_REQUESTS_PER_MINUTE,
+    max_in_flight=settings.OPENAI_MAX_IN_FLIGHT,
+    background_share=settings.OPENAI_BACKGROUND_SHARE,
+    max_wait=settings.OPENAI_LIMITER_MAX_WAIT,
+    lease_seconds=settings.OPENAI_TIMEOUT + 10,
+)
@@ -0,0 +1,87 @@
+# app/infrastructure/llm/resilience.py
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, TypeVar
+
+
+T = TypeVar("T")
+
+# Latency samples needed per model before hedging kicks in
+HEDGE_MIN_SAMPLES = 20
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """Absolute point (monotonic clock) by which an answer is needed."""
+    at: float
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.at - time.monotonic())
+
+
+class LatencyTracker:
+    """Rolling window of successful request latencies per model, in seconds."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, model: str, seconds: float) -> None:
+        self._samples.setdefault(model, deque(maxlen=self.window)).append(seconds)
+
+    def p95(self, model: str) -> float | None:
+        samples = self._samples.get(model)
+        if not samples or len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+async def hedged(call: Callable[[], Awaitable[T]], timeout: float, hedge_after: float | None) -> T:
+    """
+    Await `call()`, starting a second identical call if the first has not
+    finished after `hedge_after` seconds; the first successful result wins
+    and the other call is cancelled. A call failing while the other is still
+    running is ignored; failing before the hedge starts raises at once, so
+    callers keep their own retry and backoff.
+
+    Raises TimeoutError if nothing succeeds within `timeout`, or the last
+    error if every call failed.
+    """
+    if hedge_after is None or hedge_after >= timeout:
+        return await asyncio.wait_for(call(), timeout)
+
+    loop = asyncio.get_running_loop()
+    give_up_at = loop.time() + timeout
+    pending = {asyncio.ensure_future(call())}
+    hedge_at: float | None = loop.time() + hedge_after
+    last_error: BaseException | None = None
+
+    try:
+        while pending:
+            if hedge_at is not None and loop.time() >= hedge_at:
+                pending.add(asyncio.ensure_future(call()))
+                hedge_at = None
+
+            wake_at = give_up_at if hedge_at is None else min(hedge_at, give_up_at)
+            done, pending = await asyncio.wait(
+                pending, timeout=max(0.0, wake_at - loop.time()), return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                last_error = task.exception()
+
+            if loop.time() >= give_up_at:
+                raise TimeoutError(f"No response within {timeout:.1f}s")
+    finally:
+        for task in pending:
+            task.cancel()
+
+    raise last_error
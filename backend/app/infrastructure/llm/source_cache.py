@@ -0,0 +1,44 @@
+# app/infrastructure/llm/source_cache.py
+import time
+from collections import OrderedDict
+from typing import Iterable
+
+
+class SourceFileCache:
+    """
+    In-process LRU of OpenAI file id (files.storage_key) -> (files.id, name)
+    for citation lookups.
+
+    The same few documents are cited over and over; a storage_key never moves
+    to another row, so entries only expire to pick up renames and to let
+    deleted files drop out.
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl: int = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[int, str | None, float]] = OrderedDict()
+
+    def get_many(self, storage_keys: Iterable[str]) -> dict[str, tuple[int, str | None]]:
+        now = time.monotonic()
+        found = {}
+        for key in storage_keys:
+            entry = self._entries.get(key)
+            if not entry:
+                continue
+            file_id, name, expires_at = entry
+            if expires_at <= now:
+                self._entries.pop(key, None)
+                continue
+            self._entries.move_to_end(key)
+            found[key] = (file_id, name)
+        return found
+
+    def set(self, storage_key: str, file_id: int, name: str | None) -> None:
+        self._entries.pop(storage_key, None)
+        if len(self._entries) >= self.max_entries:
+            self._entries.popitem(last=False)
+        self._entries[storage_key] = (file_id, name, time.monotonic() + self.ttl)
+
+
+source_file_cache = SourceFileCache()
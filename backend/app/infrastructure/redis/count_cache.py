@@ -0,0 +1,64 @@
+# app/infrastructure/redis/count_cache.py
+import hashlib
+import json
+from typing import Any, Awaitable, Callable
+from redis.asyncio import Redis
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.infrastructure.redis.client import redis_client
+
+
+logger = get_logger()
+
+
+class CountCache:
+    """
+    Short-lived Redis cache for expensive COUNT(*) results, keyed by a
+    namespace and the filter combination.
+
+    Counts may lag writes by up to `ttl` seconds. Redis errors fall back to
+    computing the count directly.
+    """
+
+    def __init__(self, redis: Redis | None, namespace: str, ttl: int):
+        self.redis = redis
+        self.namespace = namespace
+        self.ttl = ttl
+
+    async def get_or_compute(
+        self,
+        filters: dict[str, Any],
+        compute: Callable[[], Awaitable[int]],
+    ) -> int:
+        key = self._key(filters)
+        if self.redis is not None:
+            try:
+                cached = await self.redis.get(key)
+                if cached is not None:
+                    return int(cached)
+            except Exception as e:
+                logger.warning("Count cache read failed: %s", e)
+
+        total = await compute()
+
+        if self.redis is not None:
+            try:
+                await self.redis.set(key, total, ex=self.ttl)
+            except Exception as e:
+                logger.warning("Count cache write failed: %s", e)
+        return total
+
+    def _key(self, filters: dict[str, Any]) -> str:
+        canonical = json.dumps(
+            {k: str(v) for k, v in filters.items() if v is not None},
+            sort_keys=True,
+        )
+        digest = hashlib.sha1(canonical.encode()).hexdigest()
+        return f"count:{self.namespace}:{digest}"
+
+
+file_count_cache = CountCache(
+    redis=redis_client,
+    namespace="files",
+    ttl=settings.FILE_PAGE_COUNT_CACHE_TTL,
+)
@@ -0,0 +1,182 @@
+# app/infrastructure/redis/stream_queue.py
+import json
+from dataclasses import dataclass, field
+from typing import Any
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, ResponseError
+from app.core.logger import get_logger
+
+
+logger = get_logger()
+
+
+@dataclass
+class QueueMessage:
+    id: str
+    payload: dict[str, Any]
+    attempts: int = 0
+    fields: dict[str, str] = field(default_factory=dict)
+
+
+class RedisStreamQueue:
+    """
+    At-least-once job queue on a Redis stream with a consumer group.
+
+    Producers `enqueue` JSON payloads; consumers `read` a batch, then `ack`
+    each message or `retry` it. A retried message is re-added with an attempt
+    counter and moved to `<stream>:dead` once `max_retries` is reached.
+    Messages left pending by a crashed consumer are reclaimed after
+    `claim_idle_ms`; every earlier delivery counts as a failed attempt, so a
+    job that keeps killing its consumer is dead-lettered too.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        stream: str,
+        group: str,
+        max_retries: int = 5,
+        claim_idle_ms: int = 5 * 60 * 1000,
+        maxlen: int = 100_000,
+    ):
+        self.redis = redis
+        self.stream = stream
+        self.group = group
+        self.dead_letter_stream = f"{stream}:dead"
+        self.max_retries = max_retries
+        self.claim_idle_ms = claim_idle_ms
+        self.maxlen = maxlen
+
+    async def ensure_group(self) -> None:
+        """Create the consumer group (and the stream) if they don't exist yet."""
+        try:
+            await self.redis.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def enqueue(self, payload: dict[str, Any], attempts: int = 0) -> str:
+        message_id = await self.redis.xadd(
+            self.stream,
+            {"payload": json.dumps(payload), "attempts": str(attempts)},
+            maxlen=self.maxlen,
+            approximate=True,
+        )
+        return _decode(message_id)
+
+    async def read(self, consumer: str, count: int = 10, block_ms: int = 5000) -> list[QueueMessage]:
+        """
+        Return up to `count` messages for `consumer`.
+
+        Stale pending messages of other consumers are reclaimed first; otherwise
+        new messages are awaited for up to `block_ms`.
+        """
+        _, claimed, *_ = await self.redis.xautoclaim(
+            self.stream, self.group, consumer,
+            min_idle_time=self.claim_idle_ms, start_id="0-0", count=count,
+        )
+        messages = []
+        for mid, data in claimed:
+            if not data:
+                continue
+            message = self._to_message(mid, data)
+            message.attempts += await self._earlier_deliveries(message.id)
+            if message.attempts >= self.max_retries:
+                await self._dead_letter(message, message.attempts, "Consumer died or stalled on every delivery")
+            else:
+                messages.append(message)
+
+        if not messages:
+            response = await self.redis.xreadgroup(
+                self.group, consumer, {self.stream: ">"}, count=count, block=block_ms,
+            )
+            for _, stream_entries in response or []:
+                messages.extend(self._to_message(mid, data) for mid, data in stream_entries)
+
+        return messages
+
+    async def _earlier_deliveries(self, message_id: str) -> int:
+        """Deliveries of a just-reclaimed message before this one, none of which got it acked."""
+        pending = await self.redis.xpending_range(
+            self.stream, self.group, min=message_id, max=message_id, count=1,
+        )
+        if not pending:
+            return 0
+        return max(0, int(pending[0]["times_delivered"]) - 1)
+
+    async def ack(self, message: QueueMessage) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.xack(self.stream, self.group, message.id)
+            pipe.xdel(self.stream, message.id)
+            await pipe.execute()
+
+    async def retry(self, message: QueueMessage, error: str) -> None:
+        """Re-queue a failed message, or dead-letter it after `max_retries` attempts."""
+        attempts = message.attempts + 1
+        if attempts >= self.max_retries:
+            await self._dead_letter(message, attempts, error)
+            return
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.xadd(
+                self.stream,
+                {"payload": json.dumps(message.payload), "attempts": str(attempts)},
+                maxlen=self.maxlen,
+                approximate=True,
+            )
+            pipe.xack(self.stream, self.group, message.id)
+            pipe.xdel(self.stream, message.id)
+            await pipe.execute()
+
+    async def _dead_letter(self, message: QueueMessage, attempts: int, error: str) -> None:
+        logger.error(
+            "Dead-lettering %s message %s after %s attempts: %s",
+            self.stream, message.id, attempts, error,
+        )
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.xadd(
+                self.dead_letter_stream,
+                {
+                    "payload": json.dumps(message.payload),
+                    "attempts": str(attempts),
+                    "error": error[:1000],
+                    "source_id": message.id,
+                },
+                maxlen=self.maxlen,
+                approximate=True,
+            )
+            pipe.xack(self.stream, self.group, message.id)
+            pipe.xdel(self.stream, message.id)
+            await pipe.execute()
+
+    @staticmethod
+    def _to_message(message_id, data: dict) -> QueueMessage:
+        fields = {_decode(k): _decode(v) for k, v in data.items()}
+        try:
+            payload = json.loads(fields.get("payload") or "{}")
+        except ValueError:
+            payload = {}
+        return QueueMessage(
+            id=_decode(message_id),
+            payload=payload,
+            attempts=int(fields.get("attempts") or 0),
+            fields=fields,
+        )
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+async def safe_enqueue(queue: RedisStreamQueue, payload: dict[str, Any]) -> str | None:
+    """
+    Enqueue without failing the caller.
+
+    The database row is the source of truth and the periodic sweep picks up
+    anything whose job was lost, so a Redis outage only delays processing.
+    """
+    try:
+        return await queue.enqueue(payload)
+    except (RedisError, OSError) as e:
+        logger.warning("Failed to enqueue job on %s: %s", queue.stream, e)
+        return None
@@ -0,0 +1,98 @@
+# app/infrastructure/redis/user_cache.py
+import time
+from collections import OrderedDict
+from redis.asyncio import Redis
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.domain.user.schema import UserOutSchema
+from app.infrastructure.redis.client import redis_client
+
+
+logger = get_logger()
+
+REDIS_PREFIX = "user:auth"
+
+
+class UserCache:
+    """
+    Two-tier cache of authenticated users keyed by user id.
+
+    The in-process LRU is checked first and lives only `local_ttl` seconds,
+    which bounds how long another replica's invalidation can go unseen.
+    Redis (when reachable) shares entries between replicas for `ttl` seconds.
+    Writers call `invalidate` after changing or deleting a user. Redis errors
+    degrade to local-only caching.
+    """
+
+    def __init__(
+        self,
+        redis: Redis | None,
+        ttl: int,
+        local_ttl: int,
+        max_local_entries: int = 10_000,
+    ):
+        self.redis = redis
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        self.max_local_entries = max_local_entries
+        self._local: OrderedDict[int, tuple[UserOutSchema, float]] = OrderedDict()
+
+    async def get(self, user_id: int) -> UserOutSchema | None:
+        entry = self._local.get(user_id)
+        if entry:
+            user, expires_at = entry
+            if expires_at > time.monotonic():
+                self._local.move_to_end(user_id)
+                return user
+            self._local.pop(user_id, None)
+
+        if self.redis is None:
+            return None
+
+        try:
+            cached = await self.redis.get(self._redis_key(user_id))
+        except Exception as e:
+            logger.warning("User cache read failed: %s", e)
+            return None
+        if cached is None:
+            return None
+
+        user = UserOutSchema.model_validate_json(cached)
+        self._set_local(user)
+        return user
+
+    async def set(self, user: UserOutSchema) -> None:
+        self._set_local(user)
+
+        if self.redis is None:
+            return
+        try:
+            await self.redis.setex(self._redis_key(user.id), self.ttl, user.model_dump_json())
+        except Exception as e:
+            logger.warning("User cache write failed: %s", e)
+
+    async def invalidate(self, user_id: int) -> None:
+        self._local.pop(user_id, None)
+        if self.redis is None:
+            return
+        try:
+            await self.redis.delete(self._redis_key(user_id))
+        except Exception as e:
+            logger.warning("User cache invalidation failed: %s", e)
+
+    def _set_local(self, user: UserOutSchema) -> None:
+        self._local.pop(user.id, None)
+        if len(self._local) >= self.max_local_entries:
+            self._local.popitem(last=False)
+        self._local[user.id] = (user, time.monotonic() + self.local_ttl)
+
+    @staticmethod
+    def _redis_key(user_id: int) -> str:
+        return f"{REDIS_PREFIX}:{user_id}"
+
+
+user_cache = UserCache(
+    redis=redis_client,
+    ttl=settings.USER_CACHE_TTL,
+    local_ttl=settings.USER_CACHE_LOCAL_TTL,
+)
@@ -0,0 +1,97 @@
+# app/infrastructure/yandex/presign_cache.py
+import time
+from redis.asyncio import Redis
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.infrastructure.redis.client import redis_client
+
+
+logger = get_logger()
+
+REDIS_PREFIX = "presign:get"
+
+
+class PresignedUrlCache:
+    """
+    Two-tier cache of presigned GET URLs keyed by (bucket, key).
+
+    Entries live slightly shorter than the URL itself so a cached URL always
+    has at least `margin` seconds of validity left when handed to a client.
+    The in-process tier is checked first; Redis (when reachable) lets all API
+    replicas share signatures. Redis errors degrade to local-only caching.
+    """
+
+    def __init__(
+        self,
+        redis: Redis | None,
+        expires_in: int,
+        margin: int,
+        max_local_entries: int = 10_000,
+    ):
+        self.redis = redis
+        self.expires_in = expires_in
+        self.ttl = max(expires_in - margin, 1)
+        self.max_local_entries = max_local_entries
+        self._local: dict[tuple[str, str], tuple[str, float]] = {}
+
+    async def get(self, bucket: str, key: str) -> str | None:
+        now = time.monotonic()
+        entry = self._local.get((bucket, key))
+        if entry:
+            url, expires_at = entry
+            if expires_at > now:
+                return url
+            self._local.pop((bucket, key), None)
+
+        if self.redis is None:
+            return None
+
+        try:
+            cached = await self.redis.get(self._redis_key(bucket, key))
+            if cached is None:
+                return None
+            ttl = await self.redis.ttl(self._redis_key(bucket, key))
+        except Exception as e:
+            logger.warning("Presigned URL cache read failed: %s", e)
+            return None
+
+        url = cached.decode() if isinstance(cached, bytes) else cached
+        if ttl and ttl > 0:
+            self._set_local(bucket, key, url, ttl)
+        return url
+
+    async def set(self, bucket: str, key: str, url: str) -> None:
+        self._set_local(bucket, key, url, self.ttl)
+
+        if self.redis is None:
+            return
+        try:
+            await self.redis.setex(self._redis_key(bucket, key), self.ttl, url)
+        except Exception as e:
+            logger.warning("Presigned URL cache write failed: %s", e)
+
+    async def invalidate(self, bucket: str, key: str) -> None:
+        self._local.pop((bucket, key), None)
+        if self.redis is None:
+            return
+        try:
+            await self.redis.delete(self._redis_key(bucket, key))
+        except Exception as e:
+            logger.warning("Presigned URL cache invalidation failed: %s", e)
+
+    def _set_local(self, bucket: str, key: str, url: str, ttl: float) -> None:
+        if len(self._local) >= self.max_local_entries:
+            # Drop the oldest insertion; dicts preserve insertion order
+            self._local.pop(next(iter(self._local)))
+        self._local[(bucket, key)] = (url, time.monotonic() + ttl)
+
+    @staticmethod
+    def _redis_key(bucket: str, key: str) -> str:
+        return f"{REDIS_PREFIX}:{bucket}:{key}"
+
+
+presigned_url_cache = PresignedUrlCache(
+    redis=redis_client,
+    expires_in=settings.PRESIGNED_URL_EXPIRES,
+    margin=settings.PRESIGNED_URL_CACHE_MARGIN,
+)
@@ -1,26 +1,39 @@
 # s3_client.py — Class wrapper for Yandex Object Storage (S3-compatible).
 from __future__ import annotations
 import os
+import asyncio
 import mimetypes
+from contextlib import AsyncExitStack
 from pathlib import Path
-from typing import Generator, Iterable
+from typing import Any
 
-import boto3
+import aiofiles
+from aiobotocore.config import AioConfig
+from aiobotocore.session import get_session
 from botocore.exceptions import ClientError
 from app.core.config import settings
+from app.core.logger import get_logger
+
+
+logger = get_logger()
+
+CHUNK_SIZE = 1024 * 1024  # 1 MB
+MULTIPART_THRESHOLD = 8 * 1024 * 1024  # 8 MB, also used as part size
 
 
 class YandexS3Client:
-    """High-level S3 client for Yandex Object Storage.
+    """High-level async S3 client for Yandex Object Storage.
 
-    Creates the connection in __init__ and exposes convenience methods.
-    Raises RuntimeError if credentials are missing.
+    Wraps a single long-lived aiobotocore client with a tuned connection pool.
+    The client is opened once via `connect()` (FastAPI lifespan / worker
+    scheduler) and shared by every request; methods connect lazily if used
+    outside those hooks (tests, scripts).
 
-    Env vars (UPPERCASE and lowercase are both supported):
-        AWS_ACCESS_KEY_ID / aws_access_key_id
-        AWS_SECRET_ACCESS_KEY / aws_secret_access_key
-        AWS_REGION / aws_region (default: ru-central1)
-        S3_ENDPOINT / s3_endpoint (default: https://storage.yandexcloud.net)
+    Settings:
+        AWS_ACCESS_KEY_ID / AWS_SECRET_ACCESS_KEY
+        AWS_REGION (e.g. ru-central1)
+        S3_ENDPOINT (e.g. https://storage.yandexcloud.net)
+        S3_MAX_POOL_CONNECTIONS
     """
 
     def __init__(self) -> None:
@@ -30,46 +43,78 @@ class YandexS3Client:
         self.access_key = settings.AWS_ACCESS_KEY_ID
         self.secret_key = settings.AWS_SECRET_ACCESS_KEY
 
-        self.s3 = boto3.client(
-            "s3",
-            endpoint_url=self.endpoint,
-            region_name=self.region,
-            aws_access_key_id=self.access_key,
-            aws_secret_access_key=self.secret_key,
-        )
+        self._exit_stack: AsyncExitStack | None = None
+        self._client: Any = None
+        self._lock = asyncio.Lock()
+
+    # -------- Lifecycle --------
+    async def connect(self) -> None:
+        """Open the shared aiobotocore client (idempotent)."""
+        async with self._lock:
+            if self._client is not None:
+                return
+
+            config = AioConfig(
+                max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                connect_timeout=settings.S3_CONNECT_TIMEOUT,
+                read_timeout=settings.S3_READ_TIMEOUT,
+                retries={"max_attempts": 3, "mode": "standard"},
+            )
+            stack = AsyncExitStack()
+            self._client = await stack.enter_async_context(
+                get_session().create_client(
+                    "s3",
+                    endpoint_url=self.endpoint,
+                    region_name=self.region,
+                    aws_access_key_id=self.access_key,
+                    aws_secret_access_key=self.secret_key,
+                    config=config,
+                )
+            )
+            self._exit_stack = stack
+            logger.info(
+                "S3 client initialized (max_pool_connections=%s)",
+                settings.S3_MAX_POOL_CONNECTIONS,
+            )
+
+    async def close(self) -> None:
+        """Close the shared client and its connection pool."""
+        async with self._lock:
+            if self._exit_stack is not None:
+                await self._exit_stack.aclose()
+            self._exit_stack = None
+            self._client = None
+
+    async def _s3(self) -> Any:
+        if self._client is None:
+            await self.connect()
+        return self._client
 
     # -------- Bucket ops --------
-    def list_buckets(self) -> Iterable[dict]:
+    async def list_buckets(self) -> list[dict]:
         """Return a list of buckets (requires permissions)."""
-        # resp = s3.list_buckets()
-        # buckets = resp.get("Buckets", [])
-        return self.s3.list_buckets().get("Buckets", [])
+        s3 = await self._s3()
+        resp = await s3.list_buckets()
+        return resp.get("Buckets", [])
 
-    def head_bucket(self, bucket: str) -> None:
+    async def head_bucket(self, bucket: str) -> None:
         """Raise if bucket doesn't exist or access is denied."""
-        self.s3.head_bucket(Bucket=bucket)
+        s3 = await self._s3()
+        await s3.head_bucket(Bucket=bucket)
 
     # -------- Object ops --------
-    # def list_objects(self, bucket: str, prefix: str = "") -> Generator[Dict, None, None]:
-    #     """Yield object summaries for a bucket (optionally filtered by prefix)."""
-    #     paginator = self.s3.get_paginator("list_objects_v2")
-    #     for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
-    #         for obj in page.get("Contents", []):
-    #             yield obj
-
-    def list_objects(self, bucket: str, prefix: str = "") -> list[dict]:
+    async def list_objects(self, bucket: str, prefix: str = "") -> list[dict]:
 
         ans = []
-        self.s3.head_bucket(Bucket=bucket)
+        s3 = await self._s3()
+        await s3.head_bucket(Bucket=bucket)
 
-        paginator = self.s3.get_paginator("list_objects_v2")
-        pages = paginator.paginate(Bucket=bucket, Prefix=prefix)
-
-        for page in pages:
+        paginator = s3.get_paginator("list_objects_v2")
+        async for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
             ans.extend(page.get("Contents", []))
         return ans
 
-    def upload_file(
+    async def upload_file(
         self,
         bucket: str,
         local_path: str | os.PathLike,
@@ -80,13 +125,16 @@ class YandexS3Client:
     ) -> None:
         """Upload local file to s3://bucket/key.
 
+        Files above MULTIPART_THRESHOLD are sent as a multipart upload so only
+        one part is held in memory at a time.
+
         Args:
             bucket: Destination bucket.
             local_path: Path to local file.
             key: Destination key. Defaults to file name.
             public: If True, sets ACL public-read (bucket policy must allow).
             content_type: Override Content-Type header; guessed from key if not provided.
-            extra_args: ExtraArgs dict passed to boto3 upload_file.
+            extra_args: Extra arguments passed to put_object / create_multipart_upload.
         """
         path = Path(local_path)
         if not path.is_file():
@@ -105,9 +153,29 @@ class YandexS3Client:
         if public:
             args.setdefault("ACL", "public-read")
 
-        self.s3.upload_file(str(path), bucket, key, ExtraArgs=args)
+        s3 = await self._s3()
+        size = path.stat().st_size
 
-    def download_file(
+        if size <= MULTIPART_THRESHOLD:
+            async with aiofiles.open(path, "rb") as f:
+                body = await f.read()
+            await s3.put_object(Bucket=bucket, Key=key, Body=body, **args)
+            return
+
+        upload_id = await self.create_multipart_upload(bucket, key, **args)
+        try:
+            parts = []
+            async with aiofiles.open(path, "rb") as f:
+                part_number = 1
+                while chunk := await f.read(MULTIPART_THRESHOLD):
+                    parts.append(await self.upload_part(bucket, key, upload_id, part_number, chunk))
+                    part_number += 1
+            await self.complete_multipart_upload(bucket, key, upload_id, parts)
+        except BaseException:
+            await self.abort_multipart_upload(bucket, key, upload_id)
+            raise
+
+    async def download_file(
         self,
         bucket: str,
         key: str,
@@ -120,22 +188,37 @@ class YandexS3Client:
             dest = dest / Path(key).name
         dest.parent.mkdir(parents=True, exist_ok=True)
 
-        self.s3.download_file(bucket, key, str(dest))
+        response = await self.get_object(bucket, key)
+        async with response["Body"] as stream, aiofiles.open(dest, "wb") as f:
+            while chunk := await stream.read(CHUNK_SIZE):
+                await f.write(chunk)
+
+    async def put_object(self, bucket: str, key: str, body: bytes, **kwargs) -> dict:
+        """Upload an in-memory body in a single request. Returns the S3 response."""
+        s3 = await self._s3()
+        return await s3.put_object(Bucket=bucket, Key=key, Body=body, **kwargs)
 
-    def delete_file(self, bucket: str, key: str, version_id: str | None = None) -> dict:
-        """Delete object (or a specific version). Returns boto3 response."""
+    async def get_object(self, bucket: str, key: str, **kwargs) -> dict:
+        """Return the raw get_object response; `Body` is an async StreamingBody."""
+        s3 = await self._s3()
+        return await s3.get_object(Bucket=bucket, Key=key, **kwargs)
+
+    async def delete_file(self, bucket: str, key: str, version_id: str | None = None) -> dict:
+        """Delete object (or a specific version). Returns the S3 response."""
         kwargs = {"Bucket": bucket, "Key": key}
         if version_id:
             kwargs["VersionId"] = version_id
-        return self.s3.delete_object(**kwargs)
+        s3 = await self._s3()
+        return await s3.delete_object(**kwargs)
 
-    def object_exists(self, bucket: str, key: str, version_id: str | None = None) -> bool:
+    async def object_exists(self, bucket: str, key: str, version_id: str | None = None) -> bool:
         """Check if an object (or version) exists."""
         try:
             kwargs = {"Bucket": bucket, "Key": key}
             if version_id:
                 kwargs["VersionId"] = version_id
-            self.s3.head_object(**kwargs)
+            s3 = await self._s3()
+            await s3.head_object(**kwargs)
             return True
         except ClientError as e:
             code = e.response.get("Error", {}).get("Code")
@@ -143,35 +226,118 @@ class YandexS3Client:
                 return False
             raise
 
+    # -------- Multipart ops --------
+    async def create_multipart_upload(self, bucket: str, key: str, **kwargs) -> str:
+        """Start a multipart upload and return its UploadId."""
+        s3 = await self._s3()
+        resp = await s3.create_multipart_upload(Bucket=bucket, Key=key, **kwargs)
+        return resp["UploadId"]
+
+    async def upload_part(
+        self, bucket: str, key: str, upload_id: str, part_number: int, data: bytes
+    ) -> dict:
+        """Upload one part; returns the {'PartNumber', 'ETag'} entry for completion."""
+        s3 = await self._s3()
+        resp = await s3.upload_part(
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=data,
+        )
+        return {"PartNumber": part_number, "ETag": resp["ETag"]}
+
+    async def complete_multipart_upload(
+        self, bucket: str, key: str, upload_id: str, parts: list[dict]
+    ) -> dict:
+        s3 = await self._s3()
+        return await s3.complete_multipart_upload(
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": sorted(parts, key=lambda p: p["PartNumber"])},
+        )
+
+    async def abort_multipart_upload(self, bucket: str, key: str, upload_id: str) -> None:
+        try:
+            s3 = await self._s3()
+            await s3.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+        except Exception as e:
+            logger.warning("Failed to abort multipart upload %s for %s/%s: %s", upload_id, bucket, key, e)
+
     # -------- Optional helpers --------
     def public_url(self, bucket: str, key: str) -> str:
         """Return the public HTTPS URL (works if object/bucket is public)."""
         return f"https://storage.yandexcloud.net/{bucket}/{key}"
 
-    def presign_get(self, bucket: str, key: str, expires_in: int = 3600) -> str:
-        """Return a pre-signed GET URL valid for `expires_in` seconds."""
-        return self.s3.generate_presigned_url(
+    async def presign_get(
+        self,
+        bucket: str,
+        key: str,
+        expires_in: int = 3600,
+        response_content_type: str | None = None,
+        response_content_disposition: str | None = None,
+    ) -> str:
+        """Return a pre-signed GET URL valid for `expires_in` seconds.
+
+        Optional response overrides make S3 send the given Content-Type /
+        Content-Disposition headers when the URL is fetched.
+        """
+        params = {"Bucket": bucket, "Key": key}
+        if response_content_type:
+            params["ResponseContentType"] = response_content_type
+        if response_content_disposition:
+            params["ResponseContentDisposition"] = response_content_disposition
+
+        s3 = await self._s3()
+        return await s3.generate_presigned_url(
             "get_object",
-            Params={"Bucket": bucket, "Key": key},
+            Params=params,
             ExpiresIn=expires_in,
         )
 
-    def presign_put(self, bucket: str, key: str, expires_in: int = 3600) -> str:
+    async def presign_put(self, bucket: str, key: str, expires_in: int = 3600) -> str:
         """Return a pre-signed PUT URL valid for `expires_in` seconds."""
-        return self.s3.generate_presigned_url(
+        s3 = await self._s3()
+        return await s3.generate_presigned_url(
             "put_object",
             Params={"Bucket": bucket, "Key": key},
             ExpiresIn=expires_in,
         )
 
-    def get_object_metadata(self, bucket: str, key: str) -> dict:
+    async def presign_upload_part(
+        self,
+        bucket: str,
+        key: str,
+        upload_id: str,
+        part_number: int,
+        expires_in: int = 3600,
+    ) -> str:
+        """Return a pre-signed PUT URL for one part of a multipart upload."""
+        s3 = await self._s3()
+        return await s3.generate_presigned_url(
+            "upload_part",
+            Params={
+                "Bucket": bucket,
+                "Key": key,
+                "UploadId": upload_id,
+                "PartNumber": part_number,
+            },
+            ExpiresIn=expires_in,
+        )
+
+    async def get_object_metadata(self, bucket: str, key: str) -> dict:
         """
         Get object metadata (size, content-type, etag, etc.) without downloading.
-        
+
         Returns:
             dict with keys: ContentLength, ContentType, ETag, LastModified, etc.
-        
+
         Raises:
             ClientError: If object doesn't exist or access denied.
         """
-        return self.s3.head_object(Bucket=bucket, Key=key)
+        s3 = await self._s3()
+        return await s3.head_object(Bucket=bucket, Key=key)
+
+
+yandex_s3 = YandexS3Client()
@@ -1,10 +1,14 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from app.middleware.logging import AccessLogMiddleware
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 from app.database.connection import db_manager
+from app.infrastructure.llm.client import openai_registry
+from app.infrastructure.yandex.yandex_s3_client import yandex_s3
+from app.domain.storage.registry import storage_registry
 from app.api.v1 import router as api_router
 from app.core.config import settings
 from app.exceptions.exceptions import add_exception_handlers
@@ -24,9 +28,13 @@ logger = get_logger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """FastAPI application lifecycle."""
+    registry_listener = None
     try:
         setup_logging()
         db_manager.init_engine()
+        openai_registry.init_client()
+        await yandex_s3.connect()
+        registry_listener = asyncio.create_task(storage_registry.listen())
         logger.info("Application startup complete")
         yield
     except Exception as e:
@@ -34,6 +42,12 @@ async def lifespan(app: FastAPI):
         raise
     finally:
         logger.info("Application shutting down")
+        if registry_listener:
+            registry_listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await registry_listener
+        await openai_registry.close()
+        await yandex_s3.close()
         await db_manager.close()
     
 
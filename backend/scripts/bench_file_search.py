@@ -0,0 +1,128 @@
+"""
+Benchmark: files page `q` search latency with and without the pg_trgm indexes.
+
+Seeds N synthetic file rows (bucket "bench-search"), then times
+FileRepo.get_page + count_page for each search mode first with
+ix_files_name_trgm / ix_files_s3_object_key_trgm dropped (sequential scan)
+and then with them rebuilt and the table ANALYZEd.
+
+Usage:
+    python -m scripts.bench_file_search --rows 500000
+
+Needs a migrated database (DATABASE_URL or --database-url) with pg_trgm
+available. The seeded rows are deleted again; the indexes are left in place.
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from app.domain.file.repository import FileRepo
+from app.core.config import settings
+
+
+BENCH_BUCKET = "bench-search"
+
+# (mode, q): a rare substring, a common prefix, and a misspelled name
+QUERIES = [
+    ("contains", "report-4242"),
+    ("prefix", "invoice-99"),
+    ("fuzzy", "quartely_reprot_4242"),
+]
+
+TRIGRAM_INDEXES = {
+    "ix_files_name_trgm": "name",
+    "ix_files_s3_object_key_trgm": "s3_object_key",
+}
+
+
+async def seed(engine: AsyncEngine, rows: int) -> None:
+    words = "ARRAY['report','invoice','contract','quarterly_report','minutes','spec']"
+    async with engine.begin() as conn:
+        await conn.execute(text(f"""
+            INSERT INTO files (
+                name, s3_bucket, s3_object_key, vector_store_id, origin, status,
+                deleted_openai, deleted_s3, created_at, updated_at
+            )
+            SELECT
+                ({words})[1 + g % 6] || '-' || g || '.pdf',
+                :bucket,
+                'uploads/' || md5(g::text) || '/' || ({words})[1 + g % 6] || '-' || g || '.pdf',
+                'vs_bench',
+                'UPLOAD',
+                'INDEXED',
+                false,
+                false,
+                now() - g * interval '1 second',
+                now()
+            FROM generate_series(1, :rows) AS g
+        """), {"bucket": BENCH_BUCKET, "rows": rows})
+        await conn.execute(text("ANALYZE files"))
+
+
+async def cleanup(engine: AsyncEngine) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("DELETE FROM files WHERE s3_bucket = :bucket"), {"bucket": BENCH_BUCKET})
+
+
+async def drop_trigram_indexes(engine: AsyncEngine) -> None:
+    async with engine.begin() as conn:
+        for name in TRIGRAM_INDEXES:
+            await conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        await conn.execute(text("ANALYZE files"))
+
+
+async def create_trigram_indexes(engine: AsyncEngine) -> None:
+    async with engine.begin() as conn:
+        for name, column in TRIGRAM_INDEXES.items():
+            await conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS {name} ON files USING gin ({column} gin_trgm_ops)"
+            ))
+        await conn.execute(text("ANALYZE files"))
+
+
+async def time_queries(engine: AsyncEngine, repeats: int) -> dict[str, float]:
+    repo = FileRepo()
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    medians = {}
+    async with session_factory() as session:
+        for mode, q in QUERIES:
+            samples = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                await repo.get_page(session, limit=50, q=q, bucket=BENCH_BUCKET, match=mode)
+                await repo.count_page(session, q=q, bucket=BENCH_BUCKET, match=mode)
+                samples.append(time.perf_counter() - start)
+            medians[mode] = statistics.median(samples) * 1000
+    return medians
+
+
+async def main(args: argparse.Namespace):
+    engine = create_async_engine(args.database_url)
+    try:
+        print(f"seeding {args.rows} rows ...")
+        await seed(engine, args.rows)
+
+        await drop_trigram_indexes(engine)
+        before = await time_queries(engine, args.repeats)
+        await create_trigram_indexes(engine)
+        after = await time_queries(engine, args.repeats)
+
+        print(f"{'mode':<10}{'q':<24}{'no index ms':>13}{'trigram ms':>12}")
+        for mode, q in QUERIES:
+            print(f"{mode:<10}{q:<24}{before[mode]:>13.1f}{after[mode]:>12.1f}")
+    finally:
+        await cleanup(engine)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,146 @@
+"""
+Benchmark: per-request AsyncOpenAI construction vs the pooled shared client.
+
+Starts a local stub of the Responses API and measures p50/p99 latency of
+OpenAIManager.send_and_receive in both modes.
+
+Usage:
+    python -m scripts.bench_openai_client --requests 500 --concurrency 20
+
+Note: the stub is plain HTTP on localhost, so this only captures pool setup,
+TCP connect and client construction cost. Against the real API the per-request
+mode additionally pays DNS + TLS handshake on every call.
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from datetime import datetime, timezone
+from aiohttp import web
+from openai import AsyncOpenAI
+
+from app.domain.file.repository import FileRepo
+from app.domain.storage.repository import StorageRepo
+from app.domain.user.schema import UserOutSchema
+from app.enums.enums import UserRole
+from app.infrastructure.llm.client import build_openai_client
+from app.infrastructure.llm.openai_manager import OpenAIManager
+
+
+STUB_RESPONSE = {
+    "id": "resp_bench",
+    "object": "response",
+    "created_at": 0,
+    "model": "gpt-4o-mini",
+    "status": "completed",
+    "output": [
+        {
+            "id": "msg_bench",
+            "type": "message",
+            "role": "assistant",
+            "status": "completed",
+            "content": [{"type": "output_text", "text": "pong", "annotations": []}],
+        }
+    ],
+}
+
+
+def make_stub_app(latency_ms: float) -> web.Application:
+    async def responses(request: web.Request) -> web.Response:
+        await request.read()
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        return web.json_response(STUB_RESPONSE)
+
+    app = web.Application()
+    app.router.add_post("/v1/responses", responses)
+    return app
+
+
+def bench_user() -> UserOutSchema:
+    return UserOutSchema(
+        id=1,
+        name="bench",
+        email="bench@example.com",
+        role=UserRole.USER,
+        valid=True,
+        model="gpt-4o-mini",
+        vector_store_ids=["vs_bench"],
+        external_id=None,
+        source="web",
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+async def run_mode(
+    mode: str,
+    base_url: str,
+    total: int,
+    concurrency: int,
+) -> list[float]:
+    user = bench_user()
+    file_repo = FileRepo()
+    storage_repo = StorageRepo()
+    shared = build_openai_client(api_key="bench", base_url=base_url) if mode == "pooled" else None
+    sem = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one_call():
+        async with sem:
+            start = time.perf_counter()
+            if shared is not None:
+                client = shared
+            else:
+                # Mirrors the old get_openai_manager: a brand-new client per request
+                client = AsyncOpenAI(api_key="bench", base_url=base_url, timeout=70)
+            manager = OpenAIManager(client=client, file_repo=file_repo, storage_repo=storage_repo)
+            await manager.send_and_receive(db=None, conv_id="conv_bench", user=user, user_input="ping")
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    try:
+        await asyncio.gather(*(one_call() for _ in range(total)))
+    finally:
+        if shared is not None:
+            await shared.close()
+    return latencies
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+async def main(args: argparse.Namespace):
+    runner = web.AppRunner(make_stub_app(args.latency_ms))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", args.port)
+    await site.start()
+    base_url = f"http://127.0.0.1:{args.port}/v1"
+
+    try:
+        # Warm-up so imports / first-call costs don't skew either mode
+        await run_mode("pooled", base_url, total=10, concurrency=2)
+
+        print(f"{'mode':<12}{'n':>6}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+        for mode in ("per-request", "pooled"):
+            lat = await run_mode(mode, base_url, args.requests, args.concurrency)
+            print(
+                f"{mode:<12}{len(lat):>6}"
+                f"{percentile(lat, 50):>10.2f}"
+                f"{percentile(lat, 99):>10.2f}"
+                f"{statistics.mean(lat):>10.2f}"
+            )
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Artificial stub latency")
+    parser.add_argument("--port", type=int, default=8765)
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main(parser.parse_args()))
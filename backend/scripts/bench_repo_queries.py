@@ -0,0 +1,105 @@
+"""
+Benchmark: database round trips per file lifecycle, BaseRepository.update vs
+the single-statement helpers.
+
+Walks N files through the status changes an API upload and a later delete
+perform (key assignment, STORED, INDEXING, INDEXED, deleted_openai,
+deleted_s3, row delete) once with `update` (SELECT + UPDATE + COMMIT +
+refresh) and once with `update_returning`. Statements, transaction
+begins/commits and wall time are counted with engine events.
+
+Usage:
+    python -m scripts.bench_repo_queries --files 200
+
+Needs a migrated database (DATABASE_URL or --database-url); the rows it
+creates are deleted again.
+"""
+import argparse
+import asyncio
+import logging
+import time
+import uuid
+from collections import Counter
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from app.domain.file.repository import FileRepo
+from app.domain.file.schema import FileCreate
+from app.domain.user.model import User
+from app.enums.enums import FileOrigin, FileState
+from app.core.config import settings
+
+
+def count_round_trips(engine: AsyncEngine) -> Counter:
+    counts: Counter = Counter()
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _statement(conn, cursor, statement, parameters, context, executemany):
+        counts["statements"] += 1
+
+    @event.listens_for(sync_engine, "begin")
+    def _begin(conn):
+        counts["begins"] += 1
+
+    @event.listens_for(sync_engine, "commit")
+    def _commit(conn):
+        counts["commits"] += 1
+
+    return counts
+
+
+async def lifecycle(repo: FileRepo, session, update) -> None:
+    """The row updates FileService.create_file + delete_by_id issue for one file."""
+    file = await repo.create(session, FileCreate(
+        name="bench.txt",
+        s3_bucket="bench",
+        vector_store_id="vs_bench",
+        origin=FileOrigin.UPLOAD,
+        status=FileState.UPLOADING,
+    ))
+    await update(session, file.id, {"s3_object_key": f"{file.id}:{uuid.uuid4().hex}"})
+    await update(session, file.id, {"size": 1024, "sha256": uuid.uuid4().hex, "status": FileState.STORED})
+    await update(session, file.id, {"storage_key": "file_bench", "status": FileState.INDEXING})
+    await update(session, file.id, {"status": FileState.INDEXED})
+    await update(session, file.id, {"deleted_openai": True})
+    await update(session, file.id, {"deleted_s3": True})
+    await repo.delete_by_id(session, file.id)
+
+
+async def measure(engine: AsyncEngine, counts: Counter, files: int, mode: str) -> tuple[Counter, float]:
+    repo = FileRepo()
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    update = repo.update if mode == "update" else repo.update_returning
+
+    counts.clear()
+    start = time.perf_counter()
+    async with session_factory() as session:
+        for _ in range(files):
+            await lifecycle(repo, session, update)
+    return Counter(counts), time.perf_counter() - start
+
+
+async def main(args: argparse.Namespace):
+    engine = create_async_engine(args.database_url)
+    counts = count_round_trips(engine)
+    try:
+        print(f"files: {args.files}")
+        print(f"{'mode':<18}{'stmts/file':>12}{'begins/file':>13}{'commits/file':>14}{'ms/file':>10}")
+        for mode in ("update", "update_returning"):
+            result, elapsed = await measure(engine, counts, args.files, mode)
+            per_file = {k: v / args.files for k, v in result.items()}
+            print(
+                f"{mode:<18}{per_file['statements']:>12.1f}{per_file['begins']:>13.1f}"
+                f"{per_file['commits']:>14.1f}{elapsed * 1000 / args.files:>10.2f}"
+            )
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,137 @@
+"""
+Benchmark: peak Python heap of OpenAIManager.create_file_from_path.
+
+Writes a synthetic file (100 MB by default), starts a local stub of the
+Files / Vector Store Files endpoints and uploads the file through
+`create_file_from_path`, once with the old whole-file read and once with the
+streaming file-handle path. Peak allocations are measured with tracemalloc.
+
+Usage:
+    python -m scripts.bench_upload_memory --size-mb 100
+
+The stub drains request bodies chunk by chunk, so its own buffers don't
+dominate the measurement.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from aiohttp import web
+
+from app.domain.file.repository import FileRepo
+from app.domain.storage.repository import StorageRepo
+from app.infrastructure.llm.client import build_openai_client
+from app.infrastructure.llm.openai_manager import OpenAIManager
+
+
+FILE_OBJECT = {
+    "id": "file_bench",
+    "object": "file",
+    "bytes": 0,
+    "created_at": 0,
+    "filename": "bench.txt",
+    "purpose": "assistants",
+    "status": "processed",
+}
+
+VECTOR_STORE_FILE = {
+    "id": "file_bench",
+    "object": "vector_store.file",
+    "created_at": 0,
+    "usage_bytes": 0,
+    "vector_store_id": "vs_bench",
+    "status": "in_progress",
+    "last_error": None,
+}
+
+
+def make_stub_app() -> web.Application:
+    async def files(request: web.Request) -> web.Response:
+        async for _ in request.content.iter_chunked(64 * 1024):
+            pass
+        return web.json_response(FILE_OBJECT)
+
+    async def vector_store_files(request: web.Request) -> web.Response:
+        await request.read()
+        return web.json_response(VECTOR_STORE_FILE)
+
+    app = web.Application(client_max_size=0)
+    app.router.add_post("/v1/files", files)
+    app.router.add_post("/v1/vector_stores/{vs_id}/files", vector_store_files)
+    return app
+
+
+class WholeFileManager(OpenAIManager):
+    """The previous implementation: read the whole file, then upload the bytes."""
+
+    async def create_file_from_path(self, path: str, vector_store_id: str):
+        import aiofiles
+
+        async with aiofiles.open(path, "rb") as f:
+            file_content = await f.read()
+
+        openai_file = await self.client.files.create(
+            file=(self._normalize_filename(Path(path).name), file_content),
+            purpose="assistants"
+        )
+        await self.client.vector_stores.files.create(
+            vector_store_id=vector_store_id,
+            file_id=openai_file.id,
+        )
+        return openai_file
+
+
+def write_synthetic_file(size_mb: int) -> Path:
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".txt")
+    block = os.urandom(1024 * 1024)
+    with tmp:
+        for _ in range(size_mb):
+            tmp.write(block)
+    return Path(tmp.name)
+
+
+async def measure(manager_cls: type[OpenAIManager], path: Path, base_url: str) -> tuple[float, float]:
+    client = build_openai_client(api_key="bench", base_url=base_url)
+    manager = manager_cls(client=client, file_repo=FileRepo(), storage_repo=StorageRepo())
+    try:
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        await manager.create_file_from_path(str(path), "vs_bench")
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        await client.close()
+    return peak / (1024 * 1024), elapsed
+
+
+async def main(args: argparse.Namespace):
+    runner = web.AppRunner(make_stub_app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", args.port)
+    await site.start()
+    base_url = f"http://127.0.0.1:{args.port}/v1"
+
+    path = write_synthetic_file(args.size_mb)
+    try:
+        print(f"file size: {args.size_mb} MB")
+        print(f"{'mode':<12}{'peak MB':>10}{'seconds':>10}")
+        for name, cls in (("whole-file", WholeFileManager), ("streaming", OpenAIManager)):
+            peak_mb, elapsed = await measure(cls, path, base_url)
+            print(f"{name:<12}{peak_mb:>10.1f}{elapsed:>10.2f}")
+    finally:
+        path.unlink(missing_ok=True)
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=100)
+    parser.add_argument("--port", type=int, default=8766)
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main(parser.parse_args()))
@@ -108,6 +108,31 @@ def mock_file_external_deps(monkeypatch):
         raising=True,
     )
 
+    # -------------------------
+    # OpenAIManager streaming upload (single-pass tee)
+    # -------------------------
+    async def create_file_from_bytes_mock(self, filename: str, data: bytes):
+        return SimpleNamespace(id="file_test_12345")
+
+    monkeypatch.setattr(
+        "app.infrastructure.llm.openai_manager.OpenAIManager.create_file_from_bytes",
+        create_file_from_bytes_mock,
+        raising=True,
+    )
+
+    for name, value in {
+        "create_upload": "upload_test_12345",
+        "add_upload_part": "part_test_12345",
+        "complete_upload": SimpleNamespace(id="file_test_12345"),
+        "cancel_upload": None,
+        "attach_to_vector_store": None,
+    }.items():
+        monkeypatch.setattr(
+            f"app.infrastructure.llm.openai_manager.OpenAIManager.{name}",
+            AsyncMock(return_value=value),
+            raising=True,
+        )
+
     # -------------------------
     # OpenAIManager.delete_file
     # -------------------------
@@ -122,30 +147,105 @@ def mock_file_external_deps(monkeypatch):
     # -------------------------
     monkeypatch.setattr(
         "app.infrastructure.yandex.yandex_s3_client.YandexS3Client.upload_file",
-        lambda self, bucket, local_path, key, content_type=None: None,
+        AsyncMock(return_value=None),
+        raising=True,
+    )
+
+    # -------------------------
+    # YandexS3Client single-request / multipart upload
+    # -------------------------
+    monkeypatch.setattr(
+        "app.infrastructure.yandex.yandex_s3_client.YandexS3Client.put_object",
+        AsyncMock(return_value={"ETag": '"etag-test"'}),
         raising=True,
     )
 
+    for name, value in {
+        "create_multipart_upload": "upload_test_1",
+        "upload_part": {"PartNumber": 1, "ETag": '"etag-part"'},
+        "complete_multipart_upload": {"ETag": '"etag-test"'},
+        "abort_multipart_upload": None,
+    }.items():
+        monkeypatch.setattr(
+            f"app.infrastructure.yandex.yandex_s3_client.YandexS3Client.{name}",
+            AsyncMock(return_value=value),
+            raising=True,
+        )
+
     # -------------------------
     # YandexS3Client.delete_file
     # -------------------------
     monkeypatch.setattr(
         "app.infrastructure.yandex.yandex_s3_client.YandexS3Client.delete_file",
-        lambda self, bucket, key: None,
+        AsyncMock(return_value=None),
         raising=True,
     )
 
     # Optional: allow listing APIs if you test them later
     monkeypatch.setattr(
         "app.infrastructure.yandex.yandex_s3_client.YandexS3Client.list_buckets",
-        lambda self: [],
+        AsyncMock(return_value=[]),
         raising=False,
     )
 
     monkeypatch.setattr(
         "app.infrastructure.yandex.yandex_s3_client.YandexS3Client.list_objects",
-        lambda self, bucket: [],
+        AsyncMock(return_value=[]),
         raising=False,
     )
 
     return None
+
+
+@pytest.fixture(autouse=True)
+def mock_job_queue(monkeypatch):
+    """Record worker jobs instead of writing them to Redis; maps stream -> payloads."""
+    enqueued: dict[str, list[dict]] = {}
+
+    async def fake_enqueue(self, payload: dict, attempts: int = 0):
+        enqueued.setdefault(self.stream, []).append(payload)
+        return f"0-{len(enqueued[self.stream])}"
+
+    monkeypatch.setattr(
+        "app.infrastructure.redis.stream_queue.RedisStreamQueue.enqueue",
+        fake_enqueue,
+    )
+    return enqueued
+
+
+@pytest.fixture
+def mock_s3_multipart(monkeypatch, unique_file_bytes_factory):
+    """
+    Fake the direct-to-S3 multipart flow. Returns the bytes the "client"
+    uploaded so tests can compute the expected SHA-256.
+    """
+    from app.infrastructure.yandex.yandex_s3_client import YandexS3Client
+    from tests.e2e.fixtures.file_public import FakeBody
+
+    content = unique_file_bytes_factory("multipart")
+
+    monkeypatch.setattr(
+        YandexS3Client,
+        "create_multipart_upload",
+        AsyncMock(return_value="upload_test_1"),
+        raising=True,
+    )
+
+    async def fake_presign_upload_part(self, bucket, key, upload_id, part_number, expires_in=3600):
+        return f"https://s3.test/{bucket}/{key}?uploadId={upload_id}&partNumber={part_number}"
+
+    monkeypatch.setattr(YandexS3Client, "presign_upload_part", fake_presign_upload_part, raising=True)
+
+    monkeypatch.setattr(
+        YandexS3Client,
+        "complete_multipart_upload",
+        AsyncMock(return_value={"ETag": '"etag-multipart"'}),
+        raising=True,
+    )
+
+    async def fake_get_object(self, bucket: str, key: str, **kwargs):
+        return {"Body": FakeBody(content), "ContentLength": len(content)}
+
+    monkeypatch.setattr(YandexS3Client, "get_object", fake_get_object, raising=True)
+
+    return content
@@ -26,7 +26,7 @@ def yandex_event_payload_factory():
 
 @pytest.fixture(autouse=True)
 def mock_yandex_s3_metadata(monkeypatch):
-    def fake_get_object_metadata(*args, **kwargs):
+    async def fake_get_object_metadata(*args, **kwargs):
         return {
             "ContentLength": 123,
             "ContentType": "application/pdf",
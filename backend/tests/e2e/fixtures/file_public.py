@@ -5,22 +5,21 @@ from app.core.config import settings
 
 
 class FakeBody:
+    """Mimics aiobotocore's async StreamingBody."""
     def __init__(self, data: bytes):
         self._bio = io.BytesIO(data)
 
-    def read(self, n: int = -1) -> bytes:
+    async def read(self, n: int = -1) -> bytes:
         return self._bio.read(n)
 
     def close(self) -> None:
         self._bio.close()
 
+    async def __aenter__(self):
+        return self
 
-class FakeS3:
-    def __init__(self, data: bytes):
-        self._data = data
-
-    def get_object(self, Bucket: str, Key: str):
-        return {"Body": FakeBody(self._data)}
+    async def __aexit__(self, *exc):
+        self.close()
 
 
 @pytest.fixture
@@ -31,18 +30,19 @@ def s3_bytes() -> bytes:
 @pytest.fixture(autouse=True)
 def mock_public_s3(monkeypatch, s3_bytes: bytes):
     """
-    PublicFileService uses self.s3_client.s3.get_object(...)
-    Patch YandexS3Client to always have a fake _s3 in tests.
+    PublicFileService streams self.s3_client.get_object(...)["Body"].
+    Patch YandexS3Client.get_object to return an in-memory body in tests.
     """
     from app.infrastructure.yandex.yandex_s3_client import YandexS3Client
 
-    real_init = YandexS3Client.__init__
-
-    def patched_init(self, *args, **kwargs):
-        real_init(self, *args, **kwargs)
-        self.s3 = FakeS3(s3_bytes)
+    async def fake_get_object(self, bucket: str, key: str, **kwargs):
+        data = s3_bytes
+        if "Range" in kwargs:
+            start, end = kwargs["Range"].removeprefix("bytes=").split("-")
+            data = s3_bytes[int(start):int(end) + 1]
+        return {"Body": FakeBody(data), "ContentLength": len(data)}
 
-    monkeypatch.setattr(YandexS3Client, "__init__", patched_init, raising=True)
+    monkeypatch.setattr(YandexS3Client, "get_object", fake_get_object, raising=True)
 
 
 @pytest.fixture
@@ -1,7 +1,14 @@
 import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 import pytest
 
+from app.domain.file.repository import FileRepo
+from app.domain.message.jobs import assistant_queue
 from app.domain.message.schema import ResultPayload
+from app.domain.storage.repository import StorageRepo
+from app.infrastructure.llm.openai_manager import OpenAIManager
+from workers.assistant_worker import run_job
 
 
 @pytest.fixture
@@ -25,9 +32,43 @@ def message_tools(monkeypatch):
         async def fake_send_and_receive(*args, **kwargs):
             return ResultPayload(answer=answer, sources=sources)
 
+        async def fake_stream_and_receive(*args, on_delta, **kwargs):
+            # Two chunks, so delta coalescing is exercised too
+            half = len(answer) // 2
+            await on_delta(answer[:half], 0)
+            await on_delta(answer[half:], half)
+            return ResultPayload(answer=answer, sources=sources)
+
         monkeypatch.setattr(
             "app.infrastructure.llm.openai_manager.OpenAIManager.send_and_receive",
             fake_send_and_receive,
         )
+        monkeypatch.setattr(
+            "app.infrastructure.llm.openai_manager.OpenAIManager.stream_and_receive",
+            fake_stream_and_receive,
+        )
 
     return {"payload": payload, "patch_openai": patch_openai}
+
+
+@pytest.fixture
+def assistant_worker_ctx(session_factory):
+    """The parts of WorkerContext the assistant worker uses."""
+    return SimpleNamespace(
+        session_factory=session_factory,
+        openai=OpenAIManager(AsyncMock(), FileRepo(), StorageRepo()),
+        storage_repo=StorageRepo(),
+    )
+
+
+@pytest.fixture
+def run_assistant_jobs(assistant_worker_ctx, mock_job_queue):
+    """Run the assistant jobs enqueued so far through the worker; returns their payloads."""
+
+    async def run() -> list[dict]:
+        jobs = mock_job_queue.pop(assistant_queue.stream, [])
+        for payload in jobs:
+            assert await run_job(assistant_worker_ctx, payload)
+        return jobs
+
+    return run
@@ -76,13 +76,12 @@ def mock_openai_client(monkeypatch):
     mock_file_delete.deleted = True
     mock_client.vector_stores.files.delete = AsyncMock(return_value=mock_file_delete)
     
-    # Replace the real AsyncOpenAI class with our mock
-    # When StorageService does: self.client = AsyncOpenAI(...)
-    # It actually gets: self.client = mock_client
-    def mock_openai_constructor(*args, **kwargs):
-        return mock_client
-    
-    monkeypatch.setattr("app.domain.storage.service.AsyncOpenAI", mock_openai_constructor)
+    # Replace the shared client handed out by the registry with our mock
+    # When StorageService is built, get_openai_client() returns mock_client
+    monkeypatch.setattr(
+        "app.infrastructure.llm.client.openai_registry.get_client",
+        lambda: mock_client,
+    )
     
     # Return the mock so tests can customize it if needed
     return mock_client
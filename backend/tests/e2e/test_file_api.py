@@ -69,6 +69,99 @@ class TestFileAPI:
         ids2 = {it["id"] for it in data2["items"] if "id" in it}
         assert ids1.isdisjoint(ids2)
 
+    async def test_files_page_cursor_walks_all_matches(
+        self,
+        client: AsyncClient,
+        upload_files_payload_factory,
+        unique_file_bytes_factory,
+    ):
+        created = await _create_n_files(
+            client,
+            upload_files_payload_factory,
+            unique_file_bytes_factory,
+            n=5,
+            prefix="cursor_walk",
+        )
+
+        seen = []
+        cursor = None
+        for _ in range(5):
+            url = "/api/v1/file/page?limit=2&q=cursor_walk&count=none"
+            if cursor:
+                url += f"&cursor={cursor}"
+            r = await client.get(url)
+            assert r.status_code == 200, r.text
+            data = r.json()
+            assert data["total"] is None
+            seen.extend(it["id"] for it in data["items"])
+            cursor = data["nextCursor"]
+            if not cursor:
+                break
+
+        # Newest first, each file exactly once
+        assert seen == sorted(created, reverse=True)
+
+    async def test_files_page_count_modes(self, client: AsyncClient):
+        exact = (await client.get("/api/v1/file/page?limit=1")).json()
+        assert exact["totalEstimated"] is False
+
+        cached = (await client.get("/api/v1/file/page?limit=1&count=cached")).json()
+        assert isinstance(cached["total"], int)
+
+        estimated = (await client.get("/api/v1/file/page?limit=1&count=estimate")).json()
+        assert estimated["totalEstimated"] is True
+        assert isinstance(estimated["total"], int)
+
+    @pytest.mark.parametrize("q", [":draft", "report :v2", "(copy):2", "50%", "it's"])
+    async def test_files_page_estimate_with_special_characters(self, client: AsyncClient, q: str):
+        r = await client.get("/api/v1/file/page", params={"q": q, "count": "estimate"})
+
+        assert r.status_code == 200
+        assert isinstance(r.json()["total"], int)
+
+    async def test_files_page_invalid_cursor(self, client: AsyncClient):
+        r = await client.get("/api/v1/file/page?cursor=not-a-cursor")
+        assert r.status_code == 400
+
+    async def test_files_page_search_modes(
+        self,
+        client: AsyncClient,
+        upload_files_payload_factory,
+        unique_file_bytes_factory,
+    ):
+        created = await _create_n_files(
+            client,
+            upload_files_payload_factory,
+            unique_file_bytes_factory,
+            n=2,
+            prefix="quarterly_search",
+        )
+
+        r = await client.get("/api/v1/file/page?limit=50&q=quarterly_search&match=prefix")
+        assert r.status_code == 200, r.text
+        assert {it["id"] for it in r.json()["items"]} >= set(created)
+
+        # Mid-word term does not match as a prefix
+        r = await client.get("/api/v1/file/page?limit=50&q=terly_search&match=prefix")
+        assert r.status_code == 200, r.text
+        assert not {it["id"] for it in r.json()["items"]} & set(created)
+
+        # Misspelled term still finds the files by trigram similarity
+        r = await client.get("/api/v1/file/page?limit=50&q=quartely_serch_0.txt&match=fuzzy")
+        assert r.status_code == 200, r.text
+        data = r.json()
+        assert created[0] in {it["id"] for it in data["items"]}
+        assert data["nextCursor"] is None
+
+    async def test_files_page_fuzzy_rejects_cursor(self, client: AsyncClient):
+        first = (await client.get("/api/v1/file/page?limit=1&count=none")).json()
+        if not first["nextCursor"]:
+            pytest.skip("needs at least two files")
+        r = await client.get(
+            f"/api/v1/file/page?q=report&match=fuzzy&cursor={first['nextCursor']}"
+        )
+        assert r.status_code == 400
+
     async def test_files_page_filter_by_vector_store(
         self,
         client: AsyncClient,
@@ -141,6 +234,37 @@ class TestFileAPI:
         r2 = await client.post("/api/v1/file/upload", files=files2)
         assert r2.status_code == 409
 
+    async def test_multipart_upload_flow(self, client: AsyncClient, mock_s3_multipart: bytes):
+        import hashlib
+
+        init = await client.post(
+            "/api/v1/file/upload/multipart",
+            json={"name": "direct.txt", "size": len(mock_s3_multipart), "contentType": "text/plain"},
+        )
+        assert init.status_code == 201, init.text
+        data = init.json()
+        assert data["uploadId"] == "upload_test_1"
+        assert [p["partNumber"] for p in data["parts"]] == [1]
+
+        done = await client.post(
+            f"/api/v1/file/upload/multipart/{data['fileId']}/complete",
+            json={
+                "uploadId": data["uploadId"],
+                "parts": [{"partNumber": 1, "eTag": '"etag-part-1"'}],
+            },
+        )
+        assert done.status_code == 200, done.text
+        file = done.json()
+        assert file["status"].lower() == "stored"
+        assert file["origin"].lower() == "direct_upload"
+        assert file["sha256"] == hashlib.sha256(mock_s3_multipart).hexdigest()
+
+        again = await client.post(
+            f"/api/v1/file/upload/multipart/{data['fileId']}/complete",
+            json={"uploadId": data["uploadId"], "parts": [{"partNumber": 1, "eTag": "x"}]},
+        )
+        assert again.status_code == 409
+
     async def test_get_file_by_id(self, client, upload_files_payload_factory, unique_file_bytes_factory):
         create = await client.post(
             "/api/v1/file/upload",
@@ -2,6 +2,7 @@ from httpx import AsyncClient
 from sqlalchemy import select
 from app.domain.file.model import File
 from app.domain.storage.repository import StorageRepo
+from app.domain.storage.registry import storage_registry
 from app.enums.enums import FileState
 from unittest.mock import patch
 
@@ -38,12 +39,42 @@ class TestFileBucketWebhookAPI:
         assert f is not None
         assert f.status == FileState.STORED
 
+    async def test_storage_event_create_enqueues_upload_job(
+        self,
+        client: AsyncClient,
+        session_factory,
+        yandex_event_payload_factory,
+        yandex_webhook_token,
+        db_storage,
+        mock_job_queue,
+    ):
+        object_id = "uploads/test_create_job.pdf"
+        payload = yandex_event_payload_factory(
+            event_type="yandex.cloud.events.storage.ObjectCreate",
+            object_id=object_id,
+            bucket=db_storage.s3_bucket
+        )
+
+        r = await client.post(
+            "/api/v1/file/yandex/storage-event",
+            json=payload,
+            headers={"X-Webhook-Token": yandex_webhook_token},
+        )
+        assert r.status_code == 200
+
+        async with session_factory() as session:
+            res = await session.execute(select(File).where(File.s3_object_key == object_id))
+            f = res.scalar_one()
+
+        assert mock_job_queue["jobs:file:upload"] == [{"file_id": f.id}]
+
     async def test_storage_event_delete_marks_file_deleting(
         self,
         client: AsyncClient,
         session_factory,
         yandex_event_payload_factory,
-        yandex_webhook_token
+        yandex_webhook_token,
+        mock_job_queue,
     ):
         object_id = "uploads/test_delete_1.pdf"
 
@@ -78,6 +109,7 @@ class TestFileBucketWebhookAPI:
 
         assert updated is not None
         assert updated.status == FileState.DELETING
+        assert {"file_id": updated.id} in mock_job_queue["jobs:file:delete"]
 
     async def test_storage_event_ignores_non_supported_extensions(
         self,
@@ -179,19 +211,23 @@ class TestFileBucketWebhookAPI:
             })
         payload = {"messages": messages}
 
-        # 2. Patch the repo method to track calls
-        # Note: Use the actual path to your StorageRepo in the service
+        # 2. Track storage queries from a cold registry
+        storage_registry.clear()
+        repo = StorageRepo()
         with patch(
+            "app.domain.storage.repository.StorageRepo.get_all", wraps=repo.get_all
+        ) as mocked_load, patch(
             "app.domain.storage.repository.StorageRepo.get_by_bucket_name",
-            wraps=StorageRepo().get_by_bucket_name
+            wraps=repo.get_by_bucket_name,
         ) as mocked_get:
-            
-            r = await client.post(
-                "/api/v1/file/yandex/storage-event",
-                json=payload,
-                headers={"X-Webhook-Token": yandex_webhook_token},
-            )
-            
-            assert r.status_code == 200
-            # 3. Verify that despite 5 files, we only queried the DB once
-            assert mocked_get.call_count == 1
\ No newline at end of file
+            for _ in range(2):
+                r = await client.post(
+                    "/api/v1/file/yandex/storage-event",
+                    json=payload,
+                    headers={"X-Webhook-Token": yandex_webhook_token},
+                )
+                assert r.status_code == 200
+
+            # 3. Verify that despite 5 files and 2 requests, storages were loaded once
+            assert mocked_load.call_count == 1
+            assert mocked_get.call_count == 0
\ No newline at end of file
@@ -40,6 +40,41 @@ class TestPublicFileAPI:
         assert r.content == s3_bytes
         assert "content-disposition" in {k.lower() for k in r.headers.keys()}
 
+    async def test_secure_download_range_request(
+        self,
+        client: AsyncClient,
+        session_factory,
+        file_access_token_factory,
+        s3_bytes: bytes,
+        default_vector_store_id
+    ):
+        async with session_factory() as session:
+            f = File(
+                name="range.pdf",
+                vector_store_id=default_vector_store_id,
+                s3_bucket="test-bucket",
+                s3_object_key="public/range.pdf",
+                size=len(s3_bytes),
+                content_type="application/pdf",
+                status=FileState.STORED,
+            )
+            session.add(f)
+            await session.commit()
+            await session.refresh(f)
+            file_id = f.id
+
+        token = file_access_token_factory(file_id)
+
+        r = await client.get(
+            "/api/v1/file/secure-download",
+            params={"token": token},
+            headers={"Range": "bytes=0-4"},
+        )
+
+        assert r.status_code == 206
+        assert r.headers["content-range"] == f"bytes 0-4/{len(s3_bytes)}"
+        assert r.headers["content-length"] == "5"
+
     async def test_secure_download_file_not_found(self, client: AsyncClient, file_access_token_factory):
         token = file_access_token_factory(99999999)
 
@@ -1,6 +1,13 @@
-import asyncio
+from datetime import datetime, timedelta, timezone
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import update
+from app.core.config import settings
+from app.domain.message.jobs import assistant_queue
+from app.domain.message.model import Message
+from app.domain.message.repository import MessageRepository
+from workers.assistant_worker import recover_replies
+from app.exceptions.exceptions import DatabaseError
 
 pytestmark = pytest.mark.asyncio
 
@@ -38,10 +45,48 @@ class TestMessageAPI:
         assert assistant_msg.get("state", "").lower() == "processing"
         assert assistant_msg.get("content") == "..."
 
-    async def test_assistant_message_is_eventually_completed(
+    async def test_create_message_is_atomic(
         self,
         client: AsyncClient,
         message_tools,
+        monkeypatch,
+    ):
+        message_tools["patch_openai"]()
+
+        cr = await client.post("/api/v1/chat/", json={"name": "Msg Atomic Chat"})
+        assert cr.status_code == 201
+        chat_id = cr.json()["id"]
+
+        # The user message is flushed, then the placeholder insert fails
+        original_create = MessageRepository.create
+        calls = 0
+
+        async def failing_second_create(self, db, entity, *args, **kwargs):
+            nonlocal calls
+            calls += 1
+            if calls == 2:
+                raise DatabaseError("placeholder insert failed")
+            return await original_create(self, db, entity, *args, **kwargs)
+
+        monkeypatch.setattr(MessageRepository, "create", failing_second_create)
+
+        r = await client.post(
+            "/api/v1/message/",
+            json=message_tools["payload"](chat_id=chat_id, content="lost"),
+        )
+        assert r.status_code >= 400
+
+        monkeypatch.setattr(MessageRepository, "create", original_create)
+        listed = await client.get(f"/api/v1/message/chat/{chat_id}")
+        assert listed.status_code == 200
+        assert listed.json() == []
+
+    async def test_assistant_message_is_completed_by_worker(
+        self,
+        client: AsyncClient,
+        message_tools,
+        run_assistant_jobs,
+        mock_job_queue,
     ):
         message_tools["patch_openai"](answer="final mocked answer")
 
@@ -53,21 +98,62 @@ class TestMessageAPI:
         assert r.status_code == 201
         assistant_id = r.json()[1]["id"]
 
-        final = None
-        for _ in range(40):
-            gr = await client.get(f"/api/v1/message/{assistant_id}")
-            assert gr.status_code == 200
-            msg = gr.json()
+        pending = (await client.get(f"/api/v1/message/{assistant_id}")).json()
+        assert pending["state"] == "processing"
 
-            if msg.get("state", "").lower() == "completed":
-                final = msg
-                break
+        assert await run_assistant_jobs() == [{"kind": "reply", "message_id": assistant_id}]
 
-            await asyncio.sleep(0.05)
-
-        assert final is not None, "assistant message did not reach COMPLETED"
+        final = (await client.get(f"/api/v1/message/{assistant_id}")).json()
+        assert final["state"] == "completed"
         assert final["content"] == "final mocked answer"
 
+        # A duplicate delivery of the same job leaves the answer alone
+        message_tools["patch_openai"](answer="second answer")
+        mock_job_queue[assistant_queue.stream] = [{"kind": "reply", "message_id": assistant_id}]
+        await run_assistant_jobs()
+        again = (await client.get(f"/api/v1/message/{assistant_id}")).json()
+        assert again["content"] == "final mocked answer"
+
+    async def test_recovery_requeues_orphaned_and_expires_old_replies(
+        self,
+        client: AsyncClient,
+        message_tools,
+        session_factory,
+        assistant_worker_ctx,
+        mock_job_queue,
+    ):
+        cr = await client.post("/api/v1/chat/", json={"name": "Msg Recovery Chat"})
+        chat_id = cr.json()["id"]
+
+        ids = []
+        for _ in range(3):
+            r = await client.post("/api/v1/message/", json=message_tools["payload"](chat_id=chat_id))
+            ids.append(r.json()[1]["id"])
+        fresh_id, orphan_id, expired_id = ids
+        mock_job_queue.pop(assistant_queue.stream, None)
+
+        now = datetime.now(timezone.utc)
+        async with session_factory() as db:
+            for message_id, age in (
+                (orphan_id, settings.ASSISTANT_REPLY_ORPHAN_SECONDS + 60),
+                (expired_id, settings.ASSISTANT_REPLY_EXPIRE_SECONDS + 60),
+            ):
+                await db.execute(
+                    update(Message)
+                    .where(Message.id == message_id)
+                    .values(created_at=now - timedelta(seconds=age))
+                )
+            await db.commit()
+
+        await recover_replies(assistant_worker_ctx)
+
+        assert mock_job_queue[assistant_queue.stream] == [{"kind": "reply", "message_id": orphan_id}]
+
+        expired = (await client.get(f"/api/v1/message/{expired_id}")).json()
+        assert expired["state"] == "error"
+        fresh = (await client.get(f"/api/v1/message/{fresh_id}")).json()
+        assert fresh["state"] == "processing"
+
     async def test_get_messages_by_chat_id_smoke(
         self,
         client: AsyncClient,
@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy import event
+
+from app.domain.file.model import File
+from app.domain.file.repository import FileRepo
+from app.domain.message.repository import MessageRepository
+from app.enums.enums import FileOrigin, FileState
+
+
+async def _plan(test_engine, session_factory, call) -> str:
+    """
+    Run `call(session)`, then EXPLAIN the first statement it sent with the same
+    parameters. Sequential scans are disabled because the test tables are tiny
+    and the planner would otherwise (correctly) ignore every index.
+    """
+    captured = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", _capture)
+    try:
+        async with session_factory() as session:
+            await call(session)
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", _capture)
+
+    statement, parameters = captured[0]
+    async with test_engine.connect() as conn:
+        await conn.exec_driver_sql("SET enable_seqscan = off")
+        result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+        return "\n".join(row[0] for row in result)
+
+
+@pytest.mark.asyncio
+class TestQueryPlans:
+    """Hot repository queries must keep using their indexes."""
+
+    async def test_s3_bucket_key_lookup(self, test_engine, session_factory):
+        plan = await _plan(
+            test_engine, session_factory,
+            lambda db: FileRepo().get_by_s3_bucket_and_key(db, "bucket", "uploads/a.pdf"),
+        )
+        assert "uq_files_s3_bucket_object_key" in plan, plan
+
+    @pytest.mark.parametrize("status, origins", [
+        (FileState.STORED, (FileOrigin.S3_IMPORT, FileOrigin.UPLOAD)),
+        (FileState.DELETING, None),
+    ])
+    async def test_worker_claim(self, test_engine, session_factory, status, origins):
+        plan = await _plan(
+            test_engine, session_factory,
+            lambda db: FileRepo().claim_batch(
+                db, worker_id="plan-test", status=status, limit=5, lease_seconds=0, origins=origins,
+            ),
+        )
+        assert "ix_files_worker_queue" in plan, plan
+
+    async def test_indexing_claim(self, test_engine, session_factory):
+        plan = await _plan(
+            test_engine, session_factory,
+            lambda db: FileRepo().claim_batch(
+                db, worker_id="plan-test", status=FileState.INDEXING, limit=5, lease_seconds=0,
+                order_by=(File.indexing_checked_at.asc().nulls_first(),),
+            ),
+        )
+        assert "ix_files_indexing_due" in plan, plan
+
+    async def test_vector_store_stats(self, test_engine, session_factory):
+        plan = await _plan(
+            test_engine, session_factory,
+            lambda db: FileRepo().get_stats_by_vector_store(db, "vs_plan"),
+        )
+        assert "ix_files_vector_store_status" in plan, plan
+
+    async def test_vector_store_page(self, test_engine, session_factory):
+        plan = await _plan(
+            test_engine, session_factory,
+            lambda db: FileRepo().get_page(db, limit=20, vector_store_id="vs_plan"),
+        )
+        assert "ix_files_vector_store_created_at_id" in plan, plan
+
+    async def test_chat_history(self, test_engine, session_factory):
+        plan = await _plan(
+            test_engine, session_factory,
+            lambda db: MessageRepository().get_by_chat_id(db, 1),
+        )
+        assert "ix_messages_chat_id_created_at_id" in plan, plan
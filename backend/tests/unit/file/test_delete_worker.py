@@ -0,0 +1,59 @@
+# tests/unit/file/test_delete_worker.py
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+import pytest
+
+from app.core.config import settings
+from workers.delete_worker import process_deletions
+
+
+class FakeFileRepo:
+    def __init__(self, count: int):
+        self.deleting = {
+            i: SimpleNamespace(id=i, name=f"{i}.pdf", storage_key=None, vector_store_id=None, s3_object_key=None)
+            for i in range(1, count + 1)
+        }
+        self.claim_limits: list[int] = []
+
+    async def claim_batch(self, db, worker_id, status, limit, lease_seconds, after_id=None, ids=None):
+        self.claim_limits.append(limit)
+        candidates = [f for i, f in sorted(self.deleting.items()) if i > (after_id or 0) and (ids is None or i in ids)]
+        return candidates[:limit]
+
+    async def delete_by_id(self, db, _id):
+        del self.deleting[_id]
+
+    async def bulk_update_mapping(self, db, rows):
+        pass
+
+    async def release_claims(self, db, ids, worker_id):
+        pass
+
+
+def _ctx(repo: FakeFileRepo):
+    @asynccontextmanager
+    async def session_factory():
+        yield None
+
+    return SimpleNamespace(session_factory=session_factory, file_repo=repo, openai=AsyncMock())
+
+
+@pytest.mark.asyncio
+class TestProcessDeletions:
+    async def test_sweep_drains_every_deleting_row(self, monkeypatch):
+        monkeypatch.setattr(settings, "DELETE_WORKER_BATCH_SIZE", 3)
+        repo = FakeFileRepo(count=8)
+
+        await process_deletions(_ctx(repo))
+
+        assert repo.deleting == {}
+        assert repo.claim_limits == [3, 3, 3, 3]
+
+    async def test_queue_job_deletes_only_its_rows(self):
+        repo = FakeFileRepo(count=8)
+
+        await process_deletions(_ctx(repo), file_ids=[2, 5])
+
+        assert sorted(repo.deleting) == [1, 3, 4, 6, 7, 8]
+        assert repo.claim_limits == [2]
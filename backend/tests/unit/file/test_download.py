@@ -0,0 +1,87 @@
+# tests/unit/file/test_download.py
+import pytest
+from fastapi import HTTPException
+
+from app.domain.file.download import parse_range_header, content_disposition_headers
+
+
+class TestParseRangeHeader:
+    def test_no_header_serves_full_object(self):
+        assert parse_range_header(None, 100) is None
+
+    def test_explicit_range(self):
+        assert parse_range_header("bytes=0-9", 100) == (0, 9)
+
+    def test_open_ended_range(self):
+        assert parse_range_header("bytes=90-", 100) == (90, 99)
+
+    def test_suffix_range(self):
+        assert parse_range_header("bytes=-10", 100) == (90, 99)
+
+    def test_end_is_clamped_to_size(self):
+        assert parse_range_header("bytes=50-1000", 100) == (50, 99)
+
+    def test_multi_range_is_ignored(self):
+        assert parse_range_header("bytes=0-1,5-6", 100) is None
+
+    def test_start_past_end_of_file(self):
+        with pytest.raises(HTTPException) as exc:
+            parse_range_header("bytes=100-", 100)
+
+        assert exc.value.status_code == 416
+        assert exc.value.headers["Content-Range"] == "bytes */100"
+
+
+class TestContentDisposition:
+    def test_unicode_name_has_ascii_fallback(self):
+        headers = content_disposition_headers("пример.pdf")
+
+        assert 'filename=".pdf"' in headers["Content-Disposition"]
+        assert "filename*=UTF-8''" in headers["Content-Disposition"]
+
+    def test_empty_name(self):
+        assert content_disposition_headers(None) == {}
+
+
+class TestRedirectMode:
+    @pytest.fixture
+    def file_out(self):
+        from datetime import datetime, timezone
+        from app.domain.file.schema import FileOut
+        from app.enums.enums import FileState, FileOrigin
+
+        return FileOut(
+            id=1,
+            name="report.pdf",
+            s3_bucket="bucket",
+            s3_object_key="report.pdf",
+            content_type="application/pdf",
+            size=100,
+            status=FileState.INDEXED,
+            origin=FileOrigin.UPLOAD,
+            vector_store_id="vs_1",
+            indexing_checked_at=None,
+            created_at=datetime.now(timezone.utc),
+        )
+
+    @pytest.mark.asyncio
+    async def test_redirect_uses_cached_presigned_url(self, file_out):
+        from unittest.mock import AsyncMock
+        from app.domain.file.download import build_download_response
+        from app.infrastructure.yandex.presign_cache import PresignedUrlCache
+
+        s3 = AsyncMock()
+        s3.presign_get.return_value = "https://s3.example/report.pdf?sig=1"
+        cache = PresignedUrlCache(redis=None, expires_in=900, margin=60)
+
+        first = await build_download_response(s3, file_out, mode="redirect", cache=cache)
+        second = await build_download_response(s3, file_out, mode="redirect", cache=cache)
+
+        assert first.status_code == 307
+        assert first.headers["location"] == "https://s3.example/report.pdf?sig=1"
+        assert second.headers["location"] == first.headers["location"]
+        s3.presign_get.assert_awaited_once()
+        kwargs = s3.presign_get.await_args.kwargs
+        assert kwargs["expires_in"] == 900
+        assert kwargs["response_content_type"] == "application/pdf"
+        assert "report.pdf" in kwargs["response_content_disposition"]
@@ -0,0 +1,75 @@
+# tests/unit/file/test_file_delete.py
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from fastapi import HTTPException
+import pytest
+
+from app.domain.file.model import File
+from app.domain.file.repository import FileRepo
+from app.domain.file.service import FileService
+from app.domain.user.schema import UserOutSchema
+from app.enums.enums import FileState, UserRole
+from app.infrastructure.llm.answer_cache import AnswerCache
+
+
+def _file(**overrides):
+    fields = dict(
+        id=5, status=FileState.INDEXED, deleted_openai=False, deleted_s3=False,
+        vector_store_id="vs_1", storage_key="file_5", s3_bucket="b", s3_object_key="5:a.pdf",
+    )
+    return SimpleNamespace(**{**fields, **overrides})
+
+
+def _service(repo, manager=None, s3_client=None) -> FileService:
+    admin = UserOutSchema(
+        id=1, name="a", email="a@example.com", role=UserRole.ADMIN, valid=True,
+        vector_store_ids=None, external_id=None, source="web", created_at=datetime.now(),
+    )
+    return FileService(
+        repo=repo,
+        storage_repo=AsyncMock(),
+        user=admin,
+        manager=manager or AsyncMock(),
+        s3_client=s3_client or AsyncMock(),
+        converter=AsyncMock(),
+    )
+
+
+@pytest.fixture(autouse=True)
+def no_answer_cache(monkeypatch):
+    monkeypatch.setattr("app.domain.file.service.answer_cache", AnswerCache(redis=None, ttl=60))
+
+
+def _written_columns(repo) -> set[str]:
+    return {key for call in repo.update_returning.await_args_list for key in call.args[2]}
+
+
+@pytest.mark.asyncio
+class TestDeleteFailures:
+    async def test_openai_failure_records_error_and_raises_500(self):
+        repo = AsyncMock(spec=FileRepo)
+        repo.get_by_id.return_value = _file()
+        manager = AsyncMock()
+        manager.delete_file.side_effect = RuntimeError("openai down")
+
+        with pytest.raises(HTTPException) as exc:
+            await _service(repo, manager=manager).delete_by_id(None, 5)
+
+        assert exc.value.status_code == 500
+        assert exc.value.detail == "openai down"
+        repo.update_returning.assert_awaited_once_with(None, 5, {"last_delete_error": "OpenAI: openai down"})
+        assert _written_columns(repo) <= set(File.__table__.columns.keys())
+
+    async def test_s3_failure_records_error_and_raises_500(self):
+        repo = AsyncMock(spec=FileRepo)
+        repo.get_by_id.return_value = _file(deleted_openai=True)
+        s3_client = AsyncMock()
+        s3_client.delete_file.side_effect = RuntimeError("s3 down")
+
+        with pytest.raises(HTTPException) as exc:
+            await _service(repo, s3_client=s3_client).delete_by_id(None, 5)
+
+        assert exc.value.detail == "s3 down"
+        repo.update_returning.assert_awaited_once_with(None, 5, {"last_delete_error": "S3: s3 down"})
+        assert _written_columns(repo) <= set(File.__table__.columns.keys())
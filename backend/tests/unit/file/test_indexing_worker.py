@@ -0,0 +1,58 @@
+# tests/unit/file/test_indexing_worker.py
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+import pytest
+
+from app.enums.enums import FileState
+from workers.indexing_worker import _reconcile
+
+
+def _file(file_id: int, vector_store_id: str = "vs_1"):
+    return SimpleNamespace(id=file_id, name=f"{file_id}.pdf", storage_key=f"file_{file_id}", vector_store_id=vector_store_id)
+
+
+def _vs_file(file_id: int, status: str):
+    return SimpleNamespace(id=f"file_{file_id}", status=status, last_error=None)
+
+
+def _openai(counts: dict, listings: dict | None = None, retrieved: dict | None = None):
+    openai = AsyncMock()
+    openai.get_vector_store_file_counts.return_value = SimpleNamespace(**counts)
+    openai.list_vector_store_file_statuses.side_effect = lambda vs, status: (listings or {})[status]
+    openai.retrieve_file.side_effect = lambda vs, key: (retrieved or {})[key]
+    return openai
+
+
+@pytest.mark.asyncio
+class TestReconcile:
+    async def test_stragglers_in_large_store_are_retrieved_directly(self):
+        openai = _openai(
+            {"in_progress": 2, "completed": 10_000},
+            listings={"in_progress": {"file_2": _vs_file(2, "in_progress")}},
+            retrieved={"file_1": _vs_file(1, "completed"), "file_3": _vs_file(3, "failed")},
+        )
+
+        updates = await _reconcile(openai, [_file(1), _file(2), _file(3)])
+
+        assert sorted(updates, key=lambda u: u[0]) == [
+            (1, FileState.INDEXED, None),
+            (2, None, None),
+            (3, FileState.UPLOAD_FAILED, "OpenAI indexing failed"),
+        ]
+        openai.list_vector_store_file_statuses.assert_awaited_once_with("vs_1", status="in_progress")
+
+    async def test_large_import_is_listed(self):
+        files = [_file(i) for i in range(1, 201)]
+        openai = _openai(
+            {"in_progress": 150, "completed": 50},
+            listings={
+                "in_progress": {f"file_{i}": _vs_file(i, "in_progress") for i in range(1, 151)},
+                "completed": {f"file_{i}": _vs_file(i, "completed") for i in range(151, 201)},
+            },
+        )
+
+        updates = await _reconcile(openai, files)
+
+        assert sum(1 for _, status, _ in updates if status == FileState.INDEXED) == 50
+        assert openai.list_vector_store_file_statuses.await_count == 2
+        openai.retrieve_file.assert_not_awaited()
@@ -0,0 +1,22 @@
+# tests/unit/file/test_pagination.py
+from datetime import datetime, timezone
+import pytest
+
+from app.common.pagination import encode_cursor, decode_cursor
+
+
+class TestCursor:
+    def test_round_trip(self):
+        created_at = datetime(2026, 10, 17, 12, 30, 5, 123456, tzinfo=timezone.utc)
+
+        assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+    def test_cursor_is_url_safe(self):
+        cursor = encode_cursor(datetime.now(timezone.utc), 7)
+
+        assert all(c.isalnum() or c in "-_" for c in cursor)
+
+    @pytest.mark.parametrize("cursor", ["", "not-a-cursor", "e30"])
+    def test_malformed_cursor(self, cursor):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
@@ -0,0 +1,93 @@
+# tests/unit/file/test_upload_pipeline.py
+import hashlib
+import io
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+import pytest
+
+from app.domain.file.upload_pipeline import OpenAIUploadSink, tee_upload
+
+
+class RecordingSink:
+    def __init__(self, fail_on_part: int | None = None):
+        self.parts: list[tuple[int, bytes, bool]] = []
+        self.fail_on_part = fail_on_part
+        self.aborted = False
+
+    async def write(self, part_number: int, data: bytes, last: bool) -> None:
+        if part_number == self.fail_on_part:
+            raise RuntimeError("sink failed")
+        self.parts.append((part_number, data, last))
+
+    async def complete(self):
+        return len(self.parts)
+
+    async def abort(self) -> None:
+        self.aborted = True
+
+
+def reader(data: bytes):
+    bio = io.BytesIO(data)
+
+    async def read(n: int) -> bytes:
+        return bio.read(n)
+
+    return read
+
+
+@pytest.mark.asyncio
+class TestTeeUpload:
+    async def test_every_sink_gets_the_same_parts(self):
+        data = bytes(range(256)) * 100  # 25,600 bytes
+        sinks = [RecordingSink(), RecordingSink()]
+
+        result = await tee_upload(reader(data), sinks, part_size=10_000, chunk_size=1_000)
+
+        assert result.size == len(data)
+        assert result.sha256 == hashlib.sha256(data).hexdigest()
+        assert result.results == [3, 3]
+        for sink in sinks:
+            assert [p[0] for p in sink.parts] == [1, 2, 3]
+            assert [p[2] for p in sink.parts] == [False, False, True]
+            assert b"".join(p[1] for p in sink.parts) == data
+
+    async def test_small_stream_is_a_single_last_part(self):
+        sink = RecordingSink()
+
+        await tee_upload(reader(b"hello"), [sink], part_size=10_000)
+
+        assert sink.parts == [(1, b"hello", True)]
+
+    async def test_sink_failure_aborts_all_sinks(self):
+        data = b"x" * 50_000
+        ok, bad = RecordingSink(), RecordingSink(fail_on_part=2)
+
+        with pytest.raises(RuntimeError, match="sink failed"):
+            await tee_upload(reader(data), [ok, bad], part_size=10_000, chunk_size=1_000)
+
+        assert ok.aborted and bad.aborted
+
+
+@pytest.mark.asyncio
+class TestOpenAIUploadSink:
+    async def test_abort_deletes_created_file(self):
+        manager = AsyncMock()
+        manager.create_file_from_bytes.return_value = SimpleNamespace(id="file_1")
+        sink = OpenAIUploadSink(manager, "a.pdf", size=5)
+
+        await tee_upload(reader(b"hello"), [sink])
+        await sink.abort()
+
+        manager.discard_file.assert_awaited_once_with("file_1")
+        manager.cancel_upload.assert_not_awaited()
+
+    async def test_abort_cancels_unfinished_upload(self):
+        manager = AsyncMock()
+        manager.create_upload.return_value = "upload_1"
+        sink = OpenAIUploadSink(manager, "a.pdf", size=50_000)
+
+        await sink.write(1, b"x" * 10_000, last=False)
+        await sink.abort()
+
+        manager.cancel_upload.assert_awaited_once_with("upload_1")
+        manager.discard_file.assert_not_awaited()
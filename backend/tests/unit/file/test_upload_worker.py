@@ -0,0 +1,79 @@
+# tests/unit/file/test_upload_worker.py
+import asyncio
+from types import SimpleNamespace
+import pytest
+
+from app.core.config import settings
+from workers import upload_worker
+from workers.context import StageLimits
+
+
+@pytest.mark.asyncio
+async def test_claims_only_as_many_rows_as_free_slots(monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_WORKER_CONCURRENCY", 3)
+    pending = [SimpleNamespace(id=i) for i in range(1, 6)]
+    claim_sizes: list[int] = []
+    processed: list[int] = []
+    running = 0
+
+    async def claim_batch(ctx, after_id, limit, file_ids=None):
+        # Every claimed row must start right away
+        assert running + limit <= 3
+        claim_sizes.append(limit)
+        return [file for file in pending if file.id > after_id][:limit]
+
+    async def process_file(ctx, file, limits):
+        nonlocal running
+        running += 1
+        await asyncio.sleep(0.01 * file.id)
+        processed.append(file.id)
+        running -= 1
+
+    async def release(ctx, file_id):
+        pass
+
+    monkeypatch.setattr(upload_worker, "_claim_batch", claim_batch)
+    monkeypatch.setattr(upload_worker, "_process_file", process_file)
+    monkeypatch.setattr(upload_worker, "_release", release)
+
+    await upload_worker.process_upload_batch(SimpleNamespace(upload_limits=StageLimits.from_settings()))
+
+    assert claim_sizes[0] == 3
+    assert sorted(processed) == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_runs_share_the_process_cap(monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_WORKER_CONCURRENCY", 2)
+    pending = [SimpleNamespace(id=i) for i in range(1, 9)]
+    claimed: set[int] = set()
+    running = 0
+    peak = 0
+
+    async def claim_batch(ctx, after_id, limit, file_ids=None):
+        batch = [f for f in pending if f.id > after_id and f.id not in claimed and (file_ids is None or f.id in file_ids)]
+        claimed.update(f.id for f in batch[:limit])
+        return batch[:limit]
+
+    async def process_file(ctx, file, limits):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    async def release(ctx, file_id):
+        pass
+
+    monkeypatch.setattr(upload_worker, "_claim_batch", claim_batch)
+    monkeypatch.setattr(upload_worker, "_process_file", process_file)
+    monkeypatch.setattr(upload_worker, "_release", release)
+
+    ctx = SimpleNamespace(upload_limits=StageLimits.from_settings())
+    await asyncio.gather(
+        upload_worker.process_upload_batch(ctx),
+        upload_worker.process_upload_batch(ctx, file_ids=[7, 8]),
+    )
+
+    assert claimed == {f.id for f in pending}
+    assert peak == 2
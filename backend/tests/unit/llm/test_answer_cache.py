@@ -0,0 +1,122 @@
+# tests/unit/llm/test_answer_cache.py
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+import pytest
+
+from app.domain.file.repository import FileRepo
+from app.domain.message.schema import ResultPayload, SourceInfo
+from app.domain.storage.repository import StorageRepo
+from app.domain.user.schema import UserOutSchema
+from app.enums.enums import UserRole
+from app.infrastructure.llm.answer_cache import AnswerCache, SemanticIndex, normalize_question
+from app.infrastructure.llm.openai_manager import OpenAIManager
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data: dict[str, str] = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+
+
+ANSWER = ResultPayload(
+    answer="Vacation is 28 days.",
+    sources=[SourceInfo(file_id=4, file_name="hr.pdf", page=2)],
+)
+
+
+async def _fill(cache: AnswerCache, question: str = "How long is vacation?", stores=("vs_1",), embed=None):
+    lookup = await cache.lookup(list(stores), "gpt-4o-mini", "web", question, embed=embed)
+    assert lookup.answer is None
+    await cache.store(lookup, ANSWER)
+
+
+def test_normalize_question():
+    assert normalize_question("  How long   is VACATION?? ") == "how long is vacation"
+
+
+@pytest.mark.asyncio
+class TestAnswerCache:
+    async def test_exact_hit_keeps_sources(self):
+        cache = AnswerCache(FakeRedis(), ttl=60)
+        await _fill(cache)
+
+        lookup = await cache.lookup(["vs_1"], "gpt-4o-mini", "web", "how long is vacation")
+
+        assert lookup.answer == ANSWER
+
+    async def test_key_includes_model_instructions_and_stores(self):
+        cache = AnswerCache(FakeRedis(), ttl=60)
+        await _fill(cache)
+
+        for stores, model, instructions in (
+            (["vs_2"], "gpt-4o-mini", "web"),
+            (["vs_1"], "gpt-4o", "web"),
+            (["vs_1"], "gpt-4o-mini", "bitrix"),
+        ):
+            lookup = await cache.lookup(stores, model, instructions, "How long is vacation?")
+            assert lookup.answer is None
+
+    async def test_invalidate_drops_answers_for_that_store_only(self):
+        cache = AnswerCache(FakeRedis(), ttl=60)
+        await _fill(cache, stores=("vs_1", "vs_2"))
+        await _fill(cache, stores=("vs_3",))
+
+        await cache.invalidate("vs_2")
+
+        assert (await cache.lookup(["vs_2", "vs_1"], "gpt-4o-mini", "web", "How long is vacation?")).answer is None
+        assert (await cache.lookup(["vs_3"], "gpt-4o-mini", "web", "How long is vacation?")).answer == ANSWER
+
+    async def test_semantic_tier_matches_similar_questions(self):
+        vectors = {
+            "how long is vacation": [1.0, 0.0, 0.0],
+            "how many vacation days do i get": [0.99, 0.1, 0.0],
+            "where is the office": [0.0, 1.0, 0.0],
+        }
+
+        async def embed(text):
+            return vectors[text]
+
+        cache = AnswerCache(FakeRedis(), ttl=60, index=SemanticIndex(ttl=60), min_similarity=0.95)
+        await _fill(cache, embed=embed)
+
+        similar = await cache.lookup(["vs_1"], "gpt-4o-mini", "web", "How many vacation days do I get?", embed=embed)
+        other = await cache.lookup(["vs_1"], "gpt-4o-mini", "web", "Where is the office?", embed=embed)
+
+        assert similar.answer == ANSWER
+        assert other.answer is None
+
+    async def test_disabled_without_redis(self):
+        cache = AnswerCache(None, ttl=60)
+        await _fill(cache)
+        assert (await cache.lookup(["vs_1"], "gpt-4o-mini", "web", "How long is vacation?")).answer is None
+
+
+@pytest.mark.asyncio
+async def test_manager_serves_repeated_question_from_cache(monkeypatch):
+    monkeypatch.setattr("app.infrastructure.llm.openai_manager.answer_cache", AnswerCache(FakeRedis(), ttl=60))
+    content = SimpleNamespace(type="output_text", text="Hi", annotations=[])
+    client = AsyncMock()
+    client.responses.create.return_value = SimpleNamespace(output=[SimpleNamespace(type="message", content=[content])])
+    manager = OpenAIManager(client=client, file_repo=AsyncMock(spec=FileRepo), storage_repo=AsyncMock(spec=StorageRepo))
+    user = UserOutSchema(
+        id=1, name="u", email="u@example.com", role=UserRole.USER, valid=True,
+        vector_store_ids=["vs_1"], external_id=None, source="bitrix", created_at=datetime.now(),
+    )
+
+    first = await manager.create_response(None, "conv", user, "Hello?", None)
+    second = await manager.create_response(None, "conv", user, "hello", None)
+
+    assert first == second == ResultPayload(answer="Hi", sources=[])
+    client.responses.create.assert_awaited_once()
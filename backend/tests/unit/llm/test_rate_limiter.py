@@ -0,0 +1,109 @@
+# tests/unit/llm/test_rate_limiter.py
+from unittest.mock import AsyncMock, MagicMock
+import httpx
+import pytest
+
+from app.infrastructure.llm.rate_limiter import (
+    OpenAIRateLimiter,
+    Priority,
+    RateLimitedTransport,
+    openai_priority,
+    parse_reset_ms,
+    retry_after_ms,
+)
+
+
+class FakeLimiter:
+    def __init__(self):
+        self.acquired: list[Priority] = []
+        self.released: list[str] = []
+        self.observed: list[tuple[int, str | None]] = []
+
+    async def acquire(self, priority):
+        self.acquired.append(priority)
+        return f"lease-{len(self.acquired)}"
+
+    async def release(self, lease):
+        self.released.append(lease)
+
+    async def observe(self, status_code, headers):
+        self.observed.append((status_code, headers.get("x-ratelimit-remaining-requests")))
+
+
+class ChunkStream(httpx.AsyncByteStream):
+    async def __aiter__(self):
+        yield b"o"
+        yield b"k"
+
+
+def test_parse_reset_ms():
+    assert parse_reset_ms("20ms") == 20
+    assert parse_reset_ms("1s") == 1000
+    assert parse_reset_ms("6m0s") == 360_000
+    assert parse_reset_ms("1.5s") == 1500
+    assert parse_reset_ms(None) == 0
+
+
+def test_retry_after_ms():
+    assert retry_after_ms({"retry-after-ms": "250"}) == 250
+    assert retry_after_ms({"retry-after": "2"}) == 2000
+    assert retry_after_ms({}) == 0
+
+
+@pytest.mark.asyncio
+class TestRateLimitedTransport:
+    async def test_lease_held_until_body_closed(self):
+        limiter = FakeLimiter()
+
+        def handler(request):
+            return httpx.Response(200, headers={"x-ratelimit-remaining-requests": "42"}, stream=ChunkStream())
+
+        transport = RateLimitedTransport(httpx.MockTransport(handler), limiter, Priority.BACKGROUND)
+        async with httpx.AsyncClient(transport=transport) as client:
+            async with client.stream("GET", "https://api.test/v1/responses") as response:
+                assert limiter.released == []
+                assert await response.aread() == b"ok"
+
+        assert limiter.acquired == [Priority.BACKGROUND]
+        assert limiter.released == ["lease-1"]
+        assert limiter.observed == [(200, "42")]
+
+    async def test_priority_context_overrides_client_default(self):
+        limiter = FakeLimiter()
+        transport = RateLimitedTransport(
+            httpx.MockTransport(lambda request: httpx.Response(200, stream=ChunkStream())),
+            limiter,
+            Priority.BACKGROUND,
+        )
+        async with httpx.AsyncClient(transport=transport) as client:
+            with openai_priority(Priority.CHAT):
+                await client.get("https://api.test/v1/responses")
+            await client.get("https://api.test/v1/files")
+
+        assert limiter.acquired == [Priority.CHAT, Priority.BACKGROUND]
+
+    async def test_lease_released_when_request_fails(self):
+        limiter = FakeLimiter()
+
+        def handler(request):
+            raise httpx.ConnectError("down")
+
+        transport = RateLimitedTransport(httpx.MockTransport(handler), limiter, Priority.CHAT)
+        async with httpx.AsyncClient(transport=transport) as client:
+            with pytest.raises(httpx.ConnectError):
+                await client.get("https://api.test/v1/responses")
+
+        assert limiter.released == ["lease-1"]
+        assert limiter.observed == []
+
+
+@pytest.mark.asyncio
+async def test_limiter_fails_open_without_redis():
+    redis = MagicMock()
+    redis.register_script.return_value = AsyncMock(side_effect=ConnectionError("down"))
+    limiter = OpenAIRateLimiter(
+        redis, requests_per_minute=60, max_in_flight=2, background_share=0.5, max_wait=1, lease_seconds=30,
+    )
+
+    assert await limiter.acquire(Priority.BACKGROUND) is None
+    await limiter.observe(429, {"retry-after": "1"})
@@ -0,0 +1,137 @@
+# tests/unit/llm/test_resilience.py
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+import httpx
+import openai
+import pytest
+
+from app.core.config import settings
+from app.domain.file.repository import FileRepo
+from app.domain.message.schema import ResultPayload
+from app.domain.storage.repository import StorageRepo
+from app.domain.user.schema import UserOutSchema
+from app.enums.enums import UserRole
+from app.infrastructure.llm.answer_cache import AnswerCache
+from app.infrastructure.llm.openai_manager import OpenAIManager
+from app.infrastructure.llm.resilience import HEDGE_MIN_SAMPLES, Deadline, LatencyTracker, hedged
+
+
+REQUEST = httpx.Request("POST", "https://api.openai.com/v1/responses")
+
+
+def _response(text: str):
+    content = SimpleNamespace(type="output_text", text=text, annotations=[])
+    return SimpleNamespace(output=[SimpleNamespace(type="message", content=[content])])
+
+
+def _manager(create) -> OpenAIManager:
+    client = AsyncMock()
+    client.responses.create.side_effect = create
+    return OpenAIManager(client=client, file_repo=AsyncMock(spec=FileRepo), storage_repo=AsyncMock(spec=StorageRepo))
+
+
+def _user(model: str = "gpt-4o") -> UserOutSchema:
+    return UserOutSchema(
+        id=1, name="u", email="u@example.com", role=UserRole.USER, valid=True, model=model,
+        vector_store_ids=["vs_1"], external_id=None, source="web", created_at=datetime.now(),
+    )
+
+
+@pytest.fixture(autouse=True)
+def fast_fallback(monkeypatch):
+    monkeypatch.setattr("app.infrastructure.llm.openai_manager.answer_cache", AnswerCache(redis=None, ttl=60))
+    monkeypatch.setattr(settings, "LLM_FALLBACK_MODEL", "gpt-4o-mini")
+    monkeypatch.setattr(settings, "LLM_FALLBACK_RESERVE_SECONDS", 1.0)
+    monkeypatch.setattr("app.infrastructure.llm.openai_manager.MIN_ATTEMPT_SECONDS", 0.05)
+    monkeypatch.setattr("app.infrastructure.llm.openai_manager.RETRY_BACKOFF_SECONDS", 0.01)
+
+
+def test_p95_needs_enough_samples():
+    tracker = LatencyTracker()
+    for _ in range(HEDGE_MIN_SAMPLES - 1):
+        tracker.record("gpt-4o", 1.0)
+    assert tracker.p95("gpt-4o") is None
+
+    for i in range(80):
+        tracker.record("gpt-4o", 1.0 if i < 75 else 9.0)
+    assert tracker.p95("gpt-4o") == 9.0
+    assert tracker.p95("gpt-4o-mini") is None
+
+
+@pytest.mark.asyncio
+class TestHedged:
+    async def test_hedge_wins_and_slow_call_is_cancelled(self):
+        calls = []
+
+        async def call():
+            calls.append(asyncio.current_task())
+            await asyncio.sleep(10 if len(calls) == 1 else 0)
+            return len(calls)
+
+        assert await hedged(call, timeout=1, hedge_after=0.01) == 2
+        await asyncio.sleep(0)
+        assert calls[0].cancelled()
+
+    async def test_times_out(self):
+        async def call():
+            await asyncio.sleep(10)
+
+        with pytest.raises(TimeoutError):
+            await hedged(call, timeout=0.05, hedge_after=0.01)
+
+    async def test_failure_before_hedge_raises(self):
+        call = AsyncMock(side_effect=ValueError("boom"))
+
+        with pytest.raises(ValueError):
+            await hedged(call, timeout=1, hedge_after=0.5)
+        call.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+class TestFallback:
+    async def test_slow_primary_falls_back_within_deadline(self):
+        async def create(**params):
+            if params["model"] == "gpt-4o":
+                await asyncio.sleep(10)
+            return _response(params["model"])
+
+        manager = _manager(create)
+        result = await manager.create_response(None, "conv", _user(), "Hi", None, deadline=Deadline.after(1.3))
+
+        assert result == ResultPayload(answer="gpt-4o-mini", sources=[])
+
+    async def test_unavailable_model_falls_back_without_retry(self):
+        not_found = openai.NotFoundError("no such model", response=httpx.Response(404, request=REQUEST), body=None)
+        create = AsyncMock(side_effect=[not_found, _response("fallback")])
+
+        manager = _manager(create)
+        result = await manager.create_response(None, "conv", _user(), "Hi", None)
+
+        assert result.answer == "fallback"
+        assert [call.kwargs["model"] for call in create.await_args_list] == ["gpt-4o", "gpt-4o-mini"]
+
+    async def test_transient_error_is_retried_on_same_model(self):
+        create = AsyncMock(side_effect=[openai.APIConnectionError(request=REQUEST), _response("ok")])
+
+        manager = _manager(create)
+        result = await manager.create_response(None, "conv", _user(), "Hi", None)
+
+        assert result.answer == "ok"
+        assert [call.kwargs["model"] for call in create.await_args_list] == ["gpt-4o", "gpt-4o"]
+
+    async def test_bad_request_is_not_retried(self):
+        bad = openai.BadRequestError("bad", response=httpx.Response(400, request=REQUEST), body=None)
+        create = AsyncMock(side_effect=bad)
+
+        with pytest.raises(openai.BadRequestError):
+            await _manager(create).create_response(None, "conv", _user(), "Hi", None)
+        create.assert_awaited_once()
+
+    async def test_passed_deadline_raises_timeout(self):
+        create = AsyncMock(return_value=_response("late"))
+
+        with pytest.raises(TimeoutError):
+            await _manager(create).create_response(None, "conv", _user(), "Hi", None, deadline=Deadline.after(0))
+        create.assert_not_awaited()
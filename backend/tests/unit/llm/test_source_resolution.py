@@ -0,0 +1,88 @@
+# tests/unit/llm/test_source_resolution.py
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+import pytest
+
+from app.domain.file.repository import FileRepo
+from app.domain.storage.repository import StorageRepo
+from app.infrastructure.llm.openai_manager import OpenAIManager
+from app.infrastructure.llm.source_cache import SourceFileCache
+
+
+def _citation(file_id: str, page: int | None = None):
+    return SimpleNamespace(type="file_citation", file_id=file_id, page=page)
+
+
+@pytest.fixture
+def source_cache(monkeypatch) -> SourceFileCache:
+    cache = SourceFileCache()
+    monkeypatch.setattr("app.infrastructure.llm.openai_manager.source_file_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def file_repo() -> AsyncMock:
+    repo = AsyncMock(spec=FileRepo)
+    repo.get_by_storage_keys.side_effect = lambda db, keys: {
+        key: SimpleNamespace(id=int(key.removeprefix("file-")), name=f"{key}.pdf")
+        for key in keys
+        if key != "file-404"
+    }
+    return repo
+
+
+@pytest.fixture
+def manager(file_repo) -> OpenAIManager:
+    return OpenAIManager(client=AsyncMock(), file_repo=file_repo, storage_repo=AsyncMock(spec=StorageRepo))
+
+
+@pytest.mark.asyncio
+class TestExtractSources:
+    async def test_all_citations_resolved_in_one_query(self, manager, file_repo, source_cache):
+        content = SimpleNamespace(annotations=[
+            _citation("file-1", page=3),
+            SimpleNamespace(type="url_citation"),
+            _citation("file-2"),
+            _citation("file-1", page=9),
+            _citation("file-404"),
+        ])
+
+        sources = await manager.extract_sources_from_content(None, content)
+
+        assert [(s.file_id, s.file_name, s.page) for s in sources] == [
+            (1, "file-1.pdf", 3),
+            (2, "file-2.pdf", None),
+        ]
+        file_repo.get_by_storage_keys.assert_awaited_once_with(None, ["file-1", "file-2", "file-404"])
+
+    async def test_cached_files_skip_the_query(self, manager, file_repo, source_cache):
+        source_cache.set("file-1", 1, "file-1.pdf")
+
+        await manager.extract_sources_from_content(None, SimpleNamespace(annotations=[
+            _citation("file-1"), _citation("file-2"),
+        ]))
+        await manager.extract_sources_from_content(None, SimpleNamespace(annotations=[
+            _citation("file-1"), _citation("file-2"),
+        ]))
+
+        file_repo.get_by_storage_keys.assert_awaited_once_with(None, ["file-2"])
+
+    async def test_no_citations_no_query(self, manager, file_repo, source_cache):
+        assert await manager.extract_sources_from_content(None, SimpleNamespace(annotations=[])) == []
+        file_repo.get_by_storage_keys.assert_not_awaited()
+
+
+class TestSourceFileCache:
+    def test_evicts_least_recently_used(self):
+        cache = SourceFileCache(max_entries=2)
+        cache.set("a", 1, "a")
+        cache.set("b", 2, "b")
+        cache.get_many(["a"])
+        cache.set("c", 3, "c")
+
+        assert cache.get_many(["a", "b", "c"]) == {"a": (1, "a"), "c": (3, "c")}
+
+    def test_entries_expire(self):
+        cache = SourceFileCache(ttl=0)
+        cache.set("a", 1, "a")
+        assert cache.get_many(["a"]) == {}
@@ -0,0 +1,192 @@
+# tests/unit/message/test_assistant_worker.py
+import asyncio
+import pytest
+
+from app.infrastructure.redis.stream_queue import QueueMessage
+from workers import assistant_worker
+from workers.assistant_worker import InFlightSlots, consume_assistant_jobs
+
+
+class FakeQueue:
+    stream = "jobs:test"
+
+    def __init__(self, payloads: list[dict], first_ms: int = 0):
+        self.pending = [QueueMessage(id=f"{first_ms}-{i}", payload=p) for i, p in enumerate(payloads)]
+        self.acked: list[str] = []
+        self.retried: list[str] = []
+        self.enqueued: list[dict] = []
+
+    async def ensure_group(self):
+        pass
+
+    async def read(self, consumer, count=10, block_ms=5000):
+        if not self.pending:
+            await asyncio.sleep(0.01)
+            return []
+        batch, self.pending = self.pending[:count], self.pending[count:]
+        return batch
+
+    async def ack(self, message):
+        self.acked.append(message.id)
+
+    async def retry(self, message, error):
+        self.retried.append(message.id)
+
+    async def enqueue(self, payload, attempts=0):
+        self.enqueued.append(payload)
+        self.pending.append(QueueMessage(id=f"1-{len(self.enqueued)}", payload=payload, attempts=attempts))
+
+
+async def _consume_until(queue: FakeQueue, done):
+    task = asyncio.create_task(consume_assistant_jobs(None, queue))
+    for _ in range(500):
+        if done():
+            break
+        await asyncio.sleep(0.01)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(assistant_worker, "USER_BUSY_RETRY_SECONDS", 0)
+    monkeypatch.setattr(assistant_worker, "GLOBAL_BUSY_POLL_SECONDS", 0.01)
+    monkeypatch.setattr(assistant_worker, "global_slots", InFlightSlots(FakeRedis(), limit=100, ttl=300))
+
+
+@pytest.mark.asyncio
+class TestConsumeAssistantJobs:
+    async def test_in_flight_jobs_are_capped(self, monkeypatch):
+        monkeypatch.setattr(assistant_worker.settings, "ASSISTANT_WORKER_CONCURRENCY", 2)
+        running, peak = 0, 0
+
+        async def fake_run_job(ctx, payload):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            return True
+
+        monkeypatch.setattr(assistant_worker, "run_job", fake_run_job)
+        queue = FakeQueue([{"message_id": i} for i in range(6)])
+
+        await _consume_until(queue, lambda: len(queue.acked) == 6)
+
+        assert peak == 2
+        assert sorted(queue.acked) == [f"0-{i}" for i in range(6)]
+
+    async def test_cap_is_shared_by_all_consumers(self, monkeypatch):
+        monkeypatch.setattr(assistant_worker, "global_slots", InFlightSlots(FakeRedis(), limit=3, ttl=300))
+        running, peak = 0, 0
+
+        async def fake_run_job(ctx, payload):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            return True
+
+        monkeypatch.setattr(assistant_worker, "run_job", fake_run_job)
+        # Two replicas, each allowed more jobs than the shared cap
+        queues = [FakeQueue([{"message_id": i} for i in range(6)], first_ms=replica) for replica in range(2)]
+
+        await asyncio.gather(*(
+            _consume_until(queue, lambda queue=queue: len(queue.acked) == 6) for queue in queues
+        ))
+
+        assert peak == 3
+        assert all(len(queue.acked) == 6 for queue in queues)
+
+    async def test_busy_user_job_goes_back_to_the_stream(self, monkeypatch):
+        attempts = []
+
+        async def fake_run_job(ctx, payload):
+            attempts.append(payload["message_id"])
+            return len(attempts) > 1
+
+        monkeypatch.setattr(assistant_worker, "run_job", fake_run_job)
+        queue = FakeQueue([{"message_id": 7}])
+
+        await _consume_until(queue, lambda: len(queue.acked) == 2)
+
+        assert attempts == [7, 7]
+        assert queue.enqueued == [{"message_id": 7}]
+        assert queue.acked == ["0-0", "1-1"]
+
+    async def test_failed_job_is_retried(self, monkeypatch):
+        async def fake_run_job(ctx, payload):
+            raise RuntimeError("db down")
+
+        monkeypatch.setattr(assistant_worker, "run_job", fake_run_job)
+        queue = FakeQueue([{"message_id": 7}])
+
+        await _consume_until(queue, lambda: queue.retried)
+
+        assert queue.retried == ["0-0"]
+        assert queue.acked == []
+
+
+class FakeRedis:
+    """Just enough sorted-set support for InFlightSlots."""
+
+    def __init__(self):
+        self.zsets: dict[str, dict[str, float]] = {}
+        self._ops = []
+
+    def pipeline(self, transaction=True):
+        return self
+
+    async def __aenter__(self):
+        self._ops = []
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def zremrangebyscore(self, key, low, high):
+        def remove():
+            members = self.zsets.get(key, {})
+            stale = [m for m, score in members.items() if score <= high]
+            for member in stale:
+                del members[member]
+            return len(stale)
+
+        self._ops.append(remove)
+
+    def zadd(self, key, mapping):
+        self._ops.append(lambda: self.zsets.setdefault(key, {}).update(mapping))
+
+    def zcard(self, key):
+        self._ops.append(lambda: len(self.zsets.get(key, {})))
+
+    def expire(self, key, ttl):
+        self._ops.append(lambda: True)
+
+    async def execute(self):
+        return [op() for op in self._ops]
+
+    async def zrem(self, key, member):
+        self.zsets.get(key, {}).pop(member, None)
+
+
+@pytest.mark.asyncio
+class TestInFlightSlots:
+    async def test_limit_per_user(self):
+        slots = InFlightSlots(FakeRedis(), limit=2, ttl=300)
+
+        assert await slots.acquire(1, "a")
+        assert await slots.acquire(1, "b")
+        assert not await slots.acquire(1, "c")
+        assert await slots.acquire(2, "c")
+
+        await slots.release(1, "a")
+        assert await slots.acquire(1, "c")
+
+    async def test_stale_slots_expire(self):
+        redis = FakeRedis()
+        slots = InFlightSlots(redis, limit=1, ttl=300)
+        redis.zsets["assistant:inflight:1"] = {"crashed": 0.0}
+
+        assert await slots.acquire(1, "a")
@@ -0,0 +1,172 @@
+# tests/unit/message/test_streaming.py
+import asyncio
+import json
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+import pytest
+
+from app.core.config import settings
+from app.domain.file.repository import FileRepo
+from app.domain.message.streaming import DeltaPublisher, DELTA_PREFIX
+from app.domain.storage.repository import StorageRepo
+from app.domain.user.schema import UserOutSchema
+from app.enums.enums import UserRole
+from app.infrastructure.llm.answer_cache import AnswerCache
+from app.infrastructure.llm.openai_manager import OpenAIManager
+from app.infrastructure.llm.resilience import Deadline
+
+
+class RecordingPubSub:
+    def __init__(self):
+        self.published: list[dict] = []
+
+    async def publish(self, message: str):
+        assert message.startswith(DELTA_PREFIX)
+        self.published.append(json.loads(message))
+
+
+@pytest.mark.asyncio
+class TestDeltaPublisher:
+    async def test_first_delta_is_immediate_rest_coalesced(self):
+        pubsub = RecordingPubSub()
+        publisher = DeltaPublisher(pubsub, message_id=7, interval_ms=60_000)
+
+        await publisher("Hel", 0)
+        await publisher("lo ", 3)
+        await publisher("world", 6)
+        await publisher.flush()
+
+        assert pubsub.published == [
+            {"event": "delta", "id": 7, "offset": 0, "delta": "Hel"},
+            {"event": "delta", "id": 7, "offset": 3, "delta": "lo world"},
+        ]
+
+    async def test_restart_drops_buffered_text(self):
+        pubsub = RecordingPubSub()
+        publisher = DeltaPublisher(pubsub, message_id=7, interval_ms=60_000)
+
+        await publisher("abc", 0)
+        await publisher("def", 3)
+        await publisher("xyz", 0)
+        await publisher.flush()
+
+        assert [(p["offset"], p["delta"]) for p in pubsub.published] == [(0, "abc"), (0, "xyz")]
+
+    async def test_publish_errors_are_swallowed(self):
+        pubsub = AsyncMock()
+        pubsub.publish.side_effect = ConnectionError("down")
+        publisher = DeltaPublisher(pubsub, message_id=7, interval_ms=0)
+
+        await publisher("abc", 0)
+        await publisher.flush()
+
+
+def _event(type_: str, **kwargs):
+    return SimpleNamespace(type=type_, **kwargs)
+
+
+class FakeStream:
+    """Async-iterable like the SDK's AsyncStream; `delays` pause before each event."""
+
+    def __init__(self, events, delays=None):
+        self.events = events
+        self.delays = delays or [0] * len(events)
+        self.closed = False
+
+    async def __aiter__(self):
+        for event, delay in zip(self.events, self.delays):
+            await asyncio.sleep(delay)
+            yield event
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def no_answer_cache(monkeypatch):
+    monkeypatch.setattr("app.infrastructure.llm.openai_manager.answer_cache", AnswerCache(redis=None, ttl=60))
+
+
+@pytest.fixture
+def user() -> UserOutSchema:
+    return UserOutSchema(
+        id=1, name="u", email="u@example.com", role=UserRole.USER, valid=True,
+        vector_store_ids=["vs_1"], external_id=None, source="web", created_at=datetime.now(),
+    )
+
+
+def _manager(events, delays=None) -> OpenAIManager:
+    client = AsyncMock()
+    client.responses.create.return_value = FakeStream(events, delays)
+    file_repo = AsyncMock(spec=FileRepo)
+    file_repo.get_by_storage_keys.return_value = {}
+    return OpenAIManager(client=client, file_repo=file_repo, storage_repo=AsyncMock(spec=StorageRepo))
+
+
+def _completed(text: str):
+    content = SimpleNamespace(type="output_text", text=text, annotations=[])
+    return SimpleNamespace(output=[SimpleNamespace(type="message", content=[content])])
+
+
+@pytest.mark.asyncio
+class TestStreamResponse:
+    async def test_deltas_then_final_payload(self, user):
+        manager = _manager([
+            _event("response.created"),
+            _event("response.output_text.delta", delta="Hi "),
+            _event("response.output_text.delta", delta="there"),
+            _event("response.completed", response=_completed("Hi there")),
+        ])
+        deltas = []
+
+        async def on_delta(text, offset):
+            deltas.append((text, offset))
+
+        result = await manager.stream_response(None, "conv", user, "hello", None, on_delta)
+
+        assert deltas == [("Hi ", 0), ("there", 3)]
+        assert result.answer == "Hi there"
+        assert manager.client.responses.create.await_args.kwargs["stream"] is True
+
+    async def test_failed_response_raises(self, user):
+        manager = _manager([
+            _event("response.output_text.delta", delta="Hi"),
+            _event("response.failed", response=SimpleNamespace(error="boom", incomplete_details=None)),
+        ])
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await manager.stream_response(None, "conv", user, "hello", None, AsyncMock())
+
+    async def test_truncated_stream_raises(self, user):
+        manager = _manager([_event("response.output_text.delta", delta="Hi")])
+
+        with pytest.raises(RuntimeError, match="before completion"):
+            await manager.stream_response(None, "conv", user, "hello", None, AsyncMock())
+
+    async def test_deadline_bounds_first_delta_not_whole_answer(self, user, monkeypatch):
+        monkeypatch.setattr(settings, "LLM_FALLBACK_MODEL", None)
+        monkeypatch.setattr(settings, "LLM_STREAM_IDLE_SECONDS", 0.2)
+        monkeypatch.setattr("app.infrastructure.llm.openai_manager.MIN_ATTEMPT_SECONDS", 0.05)
+        events = [_event("response.output_text.delta", delta="x") for _ in range(6)]
+        manager = _manager(events + [_event("response.completed", response=_completed("xxxxxx"))], [0.05] * 7)
+
+        # 350ms of steady deltas outlast the 0.2s deadline
+        result = await manager.stream_response(
+            None, "conv", user, "hello", None, AsyncMock(), deadline=Deadline.after(0.2)
+        )
+
+        assert result.answer == "xxxxxx"
+        assert manager.client.responses.create.return_value.closed
+
+    async def test_stalled_stream_times_out(self, user, monkeypatch):
+        monkeypatch.setattr(settings, "LLM_FALLBACK_MODEL", None)
+        monkeypatch.setattr(settings, "LLM_STREAM_IDLE_SECONDS", 0.05)
+        manager = _manager(
+            [_event("response.output_text.delta", delta="Hi"), _event("response.completed", response=_completed("Hi"))],
+            [0, 10],
+        )
+
+        with pytest.raises(TimeoutError):
+            await manager.stream_response(None, "conv", user, "hello", None, AsyncMock(), deadline=Deadline.after(5))
+        assert manager.client.responses.create.return_value.closed
@@ -0,0 +1,71 @@
+# tests/unit/redis/test_stream_queue.py
+import json
+import pytest
+
+from app.infrastructure.redis.stream_queue import RedisStreamQueue
+
+
+class FakePipeline:
+    def __init__(self, redis: "FakeRedis"):
+        self.redis = redis
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def xadd(self, stream, fields, **kwargs):
+        self.redis.added.append((stream, fields))
+
+    def xack(self, stream, group, message_id):
+        self.redis.acked.append(message_id)
+
+    def xdel(self, stream, message_id):
+        pass
+
+    async def execute(self):
+        return []
+
+
+class FakeRedis:
+    """A single pending message that its consumer never acks."""
+
+    def __init__(self, attempts: int, times_delivered: int):
+        self.entry = (b"1-0", {b"payload": json.dumps({"file_id": 7}).encode(), b"attempts": str(attempts).encode()})
+        self.times_delivered = times_delivered
+        self.added: list[tuple[str, dict]] = []
+        self.acked: list[str] = []
+
+    async def xautoclaim(self, *args, **kwargs):
+        self.times_delivered += 1
+        return [b"0-0", [self.entry], []]
+
+    async def xpending_range(self, *args, **kwargs):
+        return [{"message_id": b"1-0", "times_delivered": self.times_delivered}]
+
+    async def xreadgroup(self, *args, **kwargs):
+        return []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+@pytest.mark.asyncio
+class TestReclaim:
+    async def test_reclaimed_message_counts_earlier_deliveries(self):
+        redis = FakeRedis(attempts=1, times_delivered=1)
+        queue = RedisStreamQueue(redis, "jobs:test", "workers", max_retries=5)
+
+        [message] = await queue.read("worker-2")
+
+        assert message.payload == {"file_id": 7}
+        assert message.attempts == 2
+
+    async def test_message_that_keeps_killing_consumers_is_dead_lettered(self):
+        redis = FakeRedis(attempts=0, times_delivered=5)
+        queue = RedisStreamQueue(redis, "jobs:test", "workers", max_retries=5)
+
+        assert await queue.read("worker-2") == []
+        assert [stream for stream, _ in redis.added] == ["jobs:test:dead"]
+        assert redis.acked == ["1-0"]
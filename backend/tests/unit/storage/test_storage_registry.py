@@ -0,0 +1,84 @@
+# tests/unit/storage/test_storage_registry.py
+from datetime import datetime
+from unittest.mock import AsyncMock
+import pytest
+
+from app.domain.storage.registry import StorageRegistry, INVALIDATE_CHANNEL
+from app.domain.storage.repository import StorageRepo
+from app.domain.storage.schema import StorageOut
+
+
+def _storage(storage_id: int, **kwargs) -> StorageOut:
+    data = dict(
+        id=storage_id,
+        name=f"storage {storage_id}",
+        vector_store_id=f"vs_{storage_id}",
+        default=False,
+        bot_id=None,
+        bot_name=None,
+        s3_bucket=None,
+        created_at=datetime(2026, 1, 1),
+    )
+    data.update(kwargs)
+    return StorageOut(**data)
+
+
+@pytest.fixture
+def repo() -> AsyncMock:
+    repo = AsyncMock(spec=StorageRepo)
+    repo.get_all.return_value = [
+        _storage(1, s3_bucket="docs", bot_id="7"),
+        _storage(2, default=True),
+    ]
+    repo.get_by_bucket_name.return_value = None
+    return repo
+
+
+@pytest.mark.asyncio
+class TestStorageRegistry:
+    async def test_lookups_share_one_load(self, repo):
+        registry = StorageRegistry(repo=repo, redis=None, ttl=60)
+
+        assert (await registry.get_by_bucket(None, "docs")).id == 1
+        assert (await registry.get_by_bot_id(None, "7")).id == 1
+        assert (await registry.get_by_vector_store_id(None, "vs_2")).id == 2
+        assert (await registry.get_default(None)).id == 2
+        assert (await registry.get_by_id(None, 2)).id == 2
+
+        repo.get_all.assert_awaited_once()
+
+    async def test_miss_falls_through_to_repo(self, repo):
+        registry = StorageRegistry(repo=repo, redis=None, ttl=60)
+
+        assert await registry.get_by_bucket(None, "unknown") is None
+        repo.get_by_bucket_name.assert_awaited_once_with(None, "unknown")
+
+    async def test_snapshot_expires(self, repo):
+        registry = StorageRegistry(repo=repo, redis=None, ttl=0)
+
+        await registry.get_default(None)
+        await registry.get_default(None)
+
+        assert repo.get_all.await_count == 2
+
+    async def test_invalidate_reloads_and_publishes(self, repo):
+        redis = AsyncMock()
+        registry = StorageRegistry(repo=repo, redis=redis, ttl=60)
+        await registry.get_default(None)
+
+        await registry.invalidate()
+        await registry.get_default(None)
+
+        redis.publish.assert_awaited_once_with(INVALIDATE_CHANNEL, "1")
+        assert repo.get_all.await_count == 2
+
+    async def test_publish_failure_still_clears_locally(self, repo):
+        redis = AsyncMock()
+        redis.publish.side_effect = ConnectionError("down")
+        registry = StorageRegistry(repo=repo, redis=redis, ttl=60)
+        await registry.get_default(None)
+
+        await registry.invalidate()
+        await registry.get_default(None)
+
+        assert repo.get_all.await_count == 2
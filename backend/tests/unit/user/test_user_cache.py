@@ -0,0 +1,92 @@
+# tests/unit/user/test_user_cache.py
+from datetime import datetime
+from unittest.mock import AsyncMock
+import pytest
+
+from app.domain.user.schema import UserOutSchema
+from app.enums.enums import UserRole
+from app.infrastructure.redis.user_cache import UserCache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data: dict[str, str] = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+def _user(user_id: int = 1, email: str = "user@example.com") -> UserOutSchema:
+    return UserOutSchema(
+        id=user_id,
+        name="User",
+        email=email,
+        role=UserRole.USER,
+        valid=True,
+        vector_store_ids=["vs_1"],
+        external_id=None,
+        source="web",
+        created_at=datetime(2026, 1, 1, 12, 0),
+    )
+
+
+@pytest.mark.asyncio
+class TestUserCache:
+    async def test_miss_then_hit(self):
+        cache = UserCache(redis=None, ttl=60, local_ttl=5)
+        assert await cache.get(1) is None
+
+        await cache.set(_user())
+        assert (await cache.get(1)).email == "user@example.com"
+
+    async def test_redis_tier_shared_between_processes(self):
+        redis = FakeRedis()
+        writer = UserCache(redis=redis, ttl=60, local_ttl=5)
+        reader = UserCache(redis=redis, ttl=60, local_ttl=5)
+
+        await writer.set(_user())
+        cached = await reader.get(1)
+
+        assert cached == _user()
+
+    async def test_invalidate_clears_both_tiers(self):
+        redis = FakeRedis()
+        cache = UserCache(redis=redis, ttl=60, local_ttl=5)
+        await cache.set(_user())
+
+        await cache.invalidate(1)
+
+        assert await cache.get(1) is None
+        assert redis.data == {}
+
+    async def test_local_entries_expire(self):
+        cache = UserCache(redis=None, ttl=60, local_ttl=0)
+        await cache.set(_user())
+        assert await cache.get(1) is None
+
+    async def test_local_tier_evicts_least_recently_used(self):
+        cache = UserCache(redis=None, ttl=60, local_ttl=5, max_local_entries=2)
+        await cache.set(_user(1))
+        await cache.set(_user(2))
+        await cache.get(1)
+        await cache.set(_user(3))
+
+        assert await cache.get(1) is not None
+        assert await cache.get(2) is None
+        assert await cache.get(3) is not None
+
+    async def test_redis_errors_fall_back_to_local(self):
+        redis = AsyncMock()
+        redis.get.side_effect = ConnectionError("down")
+        redis.setex.side_effect = ConnectionError("down")
+        cache = UserCache(redis=redis, ttl=60, local_ttl=5)
+
+        assert await cache.get(1) is None
+        await cache.set(_user())
+        assert (await cache.get(1)).id == 1
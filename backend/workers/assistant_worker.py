@@ -0,0 +1,325 @@
+# workers/assistant_worker.py
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.domain.chat.repository import ChatRepository
+from app.domain.message.jobs import BITRIX_JOB, assistant_queue, enqueue_assistant_reply
+from app.domain.message.repository import MessageRepository
+from app.domain.message.service import MessageService, REPLY_FAILED_TEXT, publish_message
+from app.domain.user.repository import UserRepository
+from app.enums.enums import MessageState
+from app.exceptions.exceptions import NotFoundError
+from app.infrastructure.bitrix.bitrix_service import BitrixService
+from app.infrastructure.llm.rate_limiter import Priority, openai_priority
+from app.infrastructure.redis.client import redis_client
+from app.infrastructure.redis.stream_queue import QueueMessage, RedisStreamQueue
+from app.core.config import settings
+from .context import WorkerContext
+from .lease import worker_id
+from .queue_consumer import RETRY_BACKOFF_SECONDS
+
+
+logger = logging.getLogger('app.assistant_worker')
+
+# A job for a user already at ASSISTANT_WORKER_PER_USER goes back to the end
+# of the stream after this pause
+USER_BUSY_RETRY_SECONDS = 2
+# While all ASSISTANT_MAX_IN_FLIGHT slots are taken, a consumer holding a job polls this often
+GLOBAL_BUSY_POLL_SECONDS = 0.5
+# InFlightSlots scope of the cap across all users
+ALL_USERS = "all"
+# On shutdown, replies in flight get this long to finish before being cancelled
+SHUTDOWN_GRACE_SECONDS = 30
+
+
+class InFlightSlots:
+    """
+    Cap on assistant jobs in flight per scope (a user, or ALL_USERS), shared
+    by all worker processes.
+
+    Each running job is a member of the scope's Redis sorted set, scored by
+    start time. Members older than `ttl` (the queue's reclaim timeout) are
+    dropped on every acquire, so a crashed worker cannot leak a slot.
+    """
+
+    def __init__(self, redis: Redis, limit: int, ttl: int):
+        self.redis = redis
+        self.limit = limit
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(scope: int | str) -> str:
+        return f"assistant:inflight:{scope}"
+
+    async def acquire(self, scope: int | str, job_id: str) -> bool:
+        key = self._key(scope)
+        now = time.time()
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(key, "-inf", now - self.ttl)
+            pipe.zadd(key, {job_id: now})
+            pipe.zcard(key)
+            pipe.expire(key, self.ttl)
+            _, _, in_flight, _ = await pipe.execute()
+
+        if in_flight > self.limit:
+            await self.redis.zrem(key, job_id)
+            return False
+        return True
+
+    async def release(self, scope: int | str, job_id: str) -> None:
+        await self.redis.zrem(self._key(scope), job_id)
+
+
+user_slots = InFlightSlots(
+    redis_client,
+    limit=settings.ASSISTANT_WORKER_PER_USER,
+    ttl=settings.ASSISTANT_JOB_CLAIM_IDLE_SECONDS,
+)
+global_slots = InFlightSlots(
+    redis_client,
+    limit=settings.ASSISTANT_MAX_IN_FLIGHT,
+    ttl=settings.ASSISTANT_JOB_CLAIM_IDLE_SECONDS,
+)
+
+
+async def process_reply(ctx: WorkerContext, message_id: int) -> bool:
+    """
+    Generate the answer for assistant placeholder `message_id`.
+
+    Returns False if the user is at their in-flight limit and the job should
+    be retried later. Jobs for messages that are gone, no longer PROCESSING
+    (duplicates, expired) or already being answered elsewhere are no-ops.
+    """
+    message_repo, chat_repo, user_repo = MessageRepository(), ChatRepository(), UserRepository()
+
+    async with ctx.session_factory() as db:
+        try:
+            message = await message_repo.get_by_id(db, message_id)
+            chat = await chat_repo.get_by_id(db, message.chat_id)
+            user = await user_repo.get_by_id(db, chat.user_id)
+        except NotFoundError:
+            logger.info(f"Reply {message_id}: message, chat or user is gone, skipping")
+            return True
+
+        if message.state != MessageState.PROCESSING:
+            return True
+
+        user_input = await message_repo.get_prompt(db, message)
+        if user_input is None:
+            # Left PROCESSING; the recovery sweep fails it once expired
+            logger.error(f"Reply {message_id}: no user message to answer")
+            return True
+
+    # Duplicate jobs (recovery re-enqueue, reclaimed entries) must not answer twice
+    lock_key = f"lock:assistant:reply:{message_id}"
+    if not await redis_client.set(lock_key, worker_id(), nx=True, ex=settings.ASSISTANT_JOB_CLAIM_IDLE_SECONDS):
+        return True
+
+    try:
+        job_id = f"reply:{message_id}"
+        if not await user_slots.acquire(user.id, job_id):
+            return False
+        try:
+            service = MessageService(
+                repo=message_repo,
+                chat_repo=chat_repo,
+                user=user,
+                manager=ctx.openai,
+                session_factory=ctx.session_factory,
+            )
+            await service.process_assistant_response(
+                chat_id=chat.id,
+                assistant_msg_id=message.id,
+                session_handle=chat.session_handle,
+                user_input=user_input,
+                user=user,
+            )
+        finally:
+            await user_slots.release(user.id, job_id)
+    finally:
+        await redis_client.delete(lock_key)
+
+    return True
+
+
+async def process_bitrix_webhook(ctx: WorkerContext, form_data: dict, user_id: int) -> bool:
+    """Answer a Bitrix webhook; same return contract as `process_reply`."""
+    async with ctx.session_factory() as db:
+        try:
+            user = await UserRepository().get_by_id(db, user_id)
+        except NotFoundError:
+            logger.info(f"Bitrix webhook for missing user {user_id}, skipping")
+            return True
+
+    job_id = f"bitrix:{uuid.uuid4().hex}"
+    if not await user_slots.acquire(user.id, job_id):
+        return False
+    try:
+        service = BitrixService(
+            message_repo=MessageRepository(),
+            chat_repo=ChatRepository(),
+            user=user,
+            openai_manager=ctx.openai,
+            storage_repo=ctx.storage_repo,
+            session_factory=ctx.session_factory,
+        )
+        await service.process_webhook(form_data=form_data)
+    finally:
+        await user_slots.release(user.id, job_id)
+
+    return True
+
+
+async def run_job(ctx: WorkerContext, payload: dict) -> bool:
+    # Someone is waiting on these, unlike the rest of the worker's OpenAI traffic
+    with openai_priority(Priority.CHAT):
+        if payload.get("kind") == BITRIX_JOB:
+            return await process_bitrix_webhook(ctx, payload["form_data"], payload["user_id"])
+        return await process_reply(ctx, payload["message_id"])
+
+
+async def consume_assistant_jobs(ctx: WorkerContext, queue: RedisStreamQueue = assistant_queue):
+    """
+    Run assistant jobs from `queue` until cancelled.
+
+    At most ASSISTANT_WORKER_CONCURRENCY jobs run at once in this process; a
+    message is only read when a slot is free, so the backlog stays in Redis
+    where other replicas can take it. A job read then waits for one of the
+    ASSISTANT_MAX_IN_FLIGHT slots shared by all replicas, so adding replicas
+    does not raise the load on OpenAI. Each job is acked on its own once done.
+    """
+    consumer = worker_id()
+    slots = asyncio.Semaphore(settings.ASSISTANT_WORKER_CONCURRENCY)
+    tasks: set[asyncio.Task] = set()
+    group_ready = False
+
+    try:
+        while True:
+            await slots.acquire()
+            try:
+                if not group_ready:
+                    await queue.ensure_group()
+                    group_ready = True
+                    logger.info(f"Consuming {queue.stream} as {consumer}")
+
+                messages = await queue.read(consumer, count=1)
+            except (RedisError, OSError) as e:
+                slots.release()
+                logger.warning(f"Queue {queue.stream} unavailable: {e}")
+                await asyncio.sleep(RETRY_BACKOFF_SECONDS)
+                continue
+            except BaseException:
+                slots.release()
+                raise
+
+            if not messages:
+                slots.release()
+                continue
+
+            message = messages[0]
+            global_job_id = f"{consumer}:{message.id}"
+            try:
+                await _acquire_global_slot(global_job_id)
+            except BaseException:
+                slots.release()
+                raise
+
+            task = asyncio.create_task(_run_message(ctx, queue, message, slots, global_job_id))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    except asyncio.CancelledError:
+        if tasks:
+            logger.info(f"Waiting for {len(tasks)} assistant jobs to finish")
+            _, pending = await asyncio.wait(tasks, timeout=SHUTDOWN_GRACE_SECONDS)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        raise
+
+
+async def _acquire_global_slot(job_id: str) -> None:
+    while True:
+        try:
+            if await global_slots.acquire(ALL_USERS, job_id):
+                return
+        except (RedisError, OSError) as e:
+            logger.warning(f"Global assistant cap unavailable, not limiting: {e}")
+            return
+        await asyncio.sleep(GLOBAL_BUSY_POLL_SECONDS)
+
+
+async def _release_global_slot(job_id: str) -> None:
+    try:
+        await global_slots.release(ALL_USERS, job_id)
+    except (RedisError, OSError) as e:
+        # Expires after ASSISTANT_JOB_CLAIM_IDLE_SECONDS
+        logger.warning(f"Failed to release global assistant slot {job_id}: {e}")
+
+
+async def _run_message(
+    ctx: WorkerContext,
+    queue: RedisStreamQueue,
+    message: QueueMessage,
+    slots: asyncio.Semaphore,
+    global_job_id: str,
+):
+    try:
+        try:
+            done = await run_job(ctx, message.payload)
+        finally:
+            slots.release()
+            await _release_global_slot(global_job_id)
+
+        if not done:
+            # Wait without holding a slot, then go behind other users' jobs
+            await asyncio.sleep(USER_BUSY_RETRY_SECONDS)
+            await queue.enqueue(message.payload, attempts=message.attempts)
+        await queue.ack(message)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error(f"Assistant job {message.id} on {queue.stream} failed: {e}")
+        try:
+            await queue.retry(message, str(e))
+        except (RedisError, OSError) as redis_error:
+            # Unacked messages are reclaimed later
+            logger.warning(f"Failed to retry queue message {message.id}: {redis_error}")
+
+
+async def recover_replies(ctx: WorkerContext) -> None:
+    """
+    Safety net for replies whose job was lost (Redis down at enqueue time,
+    dead-lettered, worker pool down).
+
+    PROCESSING placeholders older than ASSISTANT_REPLY_ORPHAN_SECONDS are
+    enqueued again; one still being answered holds its lock, so the duplicate
+    is a no-op. Those older than ASSISTANT_REPLY_EXPIRE_SECONDS are failed so
+    the chat stops waiting.
+    """
+    now = datetime.now(timezone.utc)
+    expired_before = now - timedelta(seconds=settings.ASSISTANT_REPLY_EXPIRE_SECONDS)
+    repo = MessageRepository()
+
+    async with ctx.session_factory() as db:
+        stale = await repo.get_processing_replies(
+            db, created_before=now - timedelta(seconds=settings.ASSISTANT_REPLY_ORPHAN_SECONDS)
+        )
+
+        expired = 0
+        for message in stale:
+            if message.created_at < expired_before:
+                updated = await repo.update(
+                    db, message.id, {"content": REPLY_FAILED_TEXT, "state": MessageState.ERROR}
+                )
+                await publish_message(updated)
+                expired += 1
+            else:
+                await enqueue_assistant_reply(message.id)
+
+    if stale:
+        logger.info(f"Recovered {len(stale) - expired} orphaned replies, expired {expired}")
@@ -0,0 +1,135 @@
+# workers/context.py
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator
+from openai import AsyncOpenAI
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.domain.file.repository import FileRepo
+from app.domain.storage.repository import StorageRepo
+from app.infrastructure.llm.client import build_openai_client
+from app.infrastructure.llm.rate_limiter import Priority
+from app.infrastructure.llm.openai_manager import OpenAIManager
+from app.infrastructure.yandex.yandex_s3_client import YandexS3Client, yandex_s3
+from app.infrastructure.file_converter.file_converter import FileConverter
+from app.core.config import settings
+
+
+logger = logging.getLogger('app.worker_context')
+
+
+@dataclass
+class StageLimits:
+    """Per-stage upload concurrency caps shared by every upload run in the process."""
+    in_flight: asyncio.Semaphore
+    download: asyncio.Semaphore
+    convert: asyncio.Semaphore
+    upload: asyncio.Semaphore
+
+    @classmethod
+    def from_settings(cls) -> "StageLimits":
+        return cls(
+            in_flight=asyncio.Semaphore(settings.UPLOAD_WORKER_CONCURRENCY),
+            download=asyncio.Semaphore(settings.UPLOAD_WORKER_S3_CONCURRENCY),
+            convert=asyncio.Semaphore(settings.UPLOAD_WORKER_CONVERT_PROCESSES),
+            upload=asyncio.Semaphore(settings.UPLOAD_WORKER_OPENAI_CONCURRENCY),
+        )
+
+
+@dataclass
+class WorkerContext:
+    """
+    Long-lived resources shared by every job in the worker process.
+
+    Built once in `scheduler.main()` and passed to each job, so runs reuse
+    the same Postgres pool, OpenAI/S3 keep-alive connections and conversion
+    processes instead of creating (and leaking) them every tick.
+    """
+    engine: AsyncEngine
+    session_factory: async_sessionmaker[AsyncSession]
+    openai_client: AsyncOpenAI
+    openai: OpenAIManager
+    s3: YandexS3Client
+    converter: FileConverter
+    convert_pool: ProcessPoolExecutor
+    file_repo: FileRepo
+    storage_repo: StorageRepo
+    upload_limits: StageLimits
+
+    @classmethod
+    async def create(cls) -> "WorkerContext":
+        engine = create_async_engine(
+            settings.DATABASE_URL,
+            pool_size=settings.WORKER_DB_POOL_SIZE,
+            max_overflow=settings.WORKER_DB_MAX_OVERFLOW,
+            pool_pre_ping=True,
+            connect_args={"server_settings": {"application_name": "ai-assistant-workers"}},
+        )
+        file_repo = FileRepo()
+        storage_repo = StorageRepo()
+        # Indexing/upload traffic yields to chat; assistant jobs raise their own priority
+        openai_client = build_openai_client(priority=Priority.BACKGROUND)
+
+        await yandex_s3.connect()
+
+        ctx = cls(
+            engine=engine,
+            session_factory=async_sessionmaker(engine, expire_on_commit=False),
+            openai_client=openai_client,
+            openai=OpenAIManager(openai_client, file_repo, storage_repo),
+            s3=yandex_s3,
+            converter=FileConverter(),
+            convert_pool=ProcessPoolExecutor(
+                max_workers=settings.UPLOAD_WORKER_CONVERT_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+            ),
+            file_repo=file_repo,
+            storage_repo=storage_repo,
+            upload_limits=StageLimits.from_settings(),
+        )
+        logger.info(f"Worker context ready (db pool_size={settings.WORKER_DB_POOL_SIZE})")
+        return ctx
+
+    async def close(self) -> None:
+        """Release everything; each step runs even if an earlier one fails."""
+        self.log_pool_stats()
+        self.convert_pool.shutdown(wait=False, cancel_futures=True)
+        for name, closer in (
+            ("OpenAI client", self.openai_client.close),
+            ("S3 client", self.s3.close),
+            ("database engine", self.engine.dispose),
+        ):
+            try:
+                await closer()
+            except Exception as e:
+                logger.warning(f"Failed to close {name}: {e}")
+
+    def pool_stats(self) -> dict[str, int]:
+        pool = self.engine.pool
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+        }
+
+    def log_pool_stats(self) -> None:
+        stats = self.pool_stats()
+        logger.info(
+            "DB pool: size=%s checked_out=%s checked_in=%s overflow=%s",
+            stats["size"], stats["checked_out"], stats["checked_in"], stats["overflow"],
+        )
+
+
+@asynccontextmanager
+async def worker_context() -> AsyncIterator[WorkerContext]:
+    """Standalone runs (`python -m workers.upload_worker`) get their own context."""
+    ctx = await WorkerContext.create()
+    try:
+        yield ctx
+    finally:
+        await ctx.close()
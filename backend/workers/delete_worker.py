@@ -1,84 +1,107 @@
 # workers/delete_worker.py
 import logging
 import asyncio
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from openai import NotFoundError, APIError, AsyncOpenAI
+from typing import Sequence
+from openai import NotFoundError, APIError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.domain.file.model import File
-from app.domain.file.repository import FileRepo
-from app.domain.storage.repository import StorageRepo
+from app.domain.file.schema import FileOut
 from app.enums.enums import FileState
-from app.infrastructure.llm.openai_manager import OpenAIManager
 from app.core.config import settings
+from .context import WorkerContext, worker_context
 from .decorator import log_timing
+from .lease import worker_id
 
 
 logger = logging.getLogger('app.delete_worker')
 
 
 @log_timing('delete_worker.process_deletions')
-async def process_deletions():
+async def process_deletions(ctx: WorkerContext, file_ids: Sequence[int] | None = None):
     """
     Query files with status=DELETING
     Try to delete from OpenAI (404 is OK)
     Delete from DB
+
+    Rows are leased with FOR UPDATE SKIP LOCKED, so replicas delete disjoint sets.
+    Queue consumers pass `file_ids` to delete just those rows; without it this
+    is the periodic sweep, which claims DELETE_WORKER_BATCH_SIZE rows at a time
+    by ascending id until none are left, so a backlog of lost jobs is cleared
+    in one run.
     """
-    engine = create_async_engine(settings.DATABASE_URL)
-    
-    async with AsyncSession(engine, expire_on_commit=False) as session:
-
-        file_repo = FileRepo()
-        storage_repo = StorageRepo()
-        openai_client = AsyncOpenAI(
-            api_key=settings.OPENAI_API_KEY,
-            timeout=70
-        )
-
-        openai = OpenAIManager(openai_client, file_repo, storage_repo)
-        
-        # Get files to delete
-        stmt = select(File).where(File.status == FileState.DELETING).limit(5)
-        result = await session.execute(stmt)
-        files = result.scalars().all()
-        
-        if not files:
-            return
-        
-        logger.info(f"Processing {len(files)} files for deletion")
-        
-        for file in files:
-            try:
-                # Try to delete from OpenAI if storage_key exists
-                if file.storage_key:
-                    if not file.vector_store_id:
-                        raise ValueError("Missing vector_store_id for OpenAI deletion")
-
-                    try:
-                        await openai.delete_file(file.vector_store_id, file.storage_key)
-                        logger.info(f"✓ Deleted from OpenAI: {file.storage_key}")
-                    except NotFoundError:
-                        logger.info(f"✓ File not found in OpenAI (already deleted): {file.storage_key}")
-                    except APIError as e:
-                        # OpenAI API error - mark failed and skip DB deletion
-                        logger.error(f"✗ OpenAI API error for {file.storage_key}: {e}")
-                        await file_repo.update(
-                            db=session,
-                            _id=file.id,
-                            update_data={"status": FileState.DELETE_FAILED, "last_error": str(e)}
-                        )
-                        continue
-                
-                # Step 2: Delete from DB (only if OpenAI delete succeeded or no storage_key)
-                await file_repo.delete_by_id(db=session, _id=file.id)
-                logger.info(f"✓ Deleted from DB: {file.name} ({file.s3_object_key})")
-            except Exception as e:
-                logger.error(f"Failed to delete {file.name}: {e}")
-                await file_repo.update(
-                    db=session,
-                    _id=file.id,
-                    update_data={"status": FileState.DELETE_FAILED, "last_error": str(e)}
-                )
+    processed = 0
+    last_id = 0
+
+    async with ctx.session_factory() as session:
+        while True:
+            # Lease files to delete
+            files = await ctx.file_repo.claim_batch(
+                session,
+                worker_id=worker_id(),
+                status=FileState.DELETING,
+                limit=len(file_ids) if file_ids else settings.DELETE_WORKER_BATCH_SIZE,
+                lease_seconds=settings.WORKER_CLAIM_LEASE_SECONDS,
+                after_id=last_id,
+                ids=file_ids,
+            )
+
+            if not files:
+                break
+
+            logger.info(f"Processing {len(files)} files for deletion")
+            await _delete_files(ctx, session, files)
+            processed += len(files)
+            last_id = files[-1].id
+
+            if file_ids:
+                break
+
+    if processed and not file_ids:
+        logger.info(f"Delete run finished: {processed} files processed")
+
+
+async def _delete_files(ctx: WorkerContext, session: AsyncSession, files: list[FileOut]):
+    file_repo = ctx.file_repo
+    openai = ctx.openai
+
+    # Deleted rows drop their lease with them; failures are written in one
+    # statement and their leases released at the end
+    failed: list[dict] = []
+    for file in files:
+        try:
+            # Try to delete from OpenAI if storage_key exists
+            if file.storage_key:
+                if not file.vector_store_id:
+                    raise ValueError("Missing vector_store_id for OpenAI deletion")
+
+                try:
+                    await openai.delete_file(file.vector_store_id, file.storage_key)
+                    logger.info(f"✓ Deleted from OpenAI: {file.storage_key}")
+                except NotFoundError:
+                    logger.info(f"✓ File not found in OpenAI (already deleted): {file.storage_key}")
+                except APIError as e:
+                    # OpenAI API error - mark failed and skip DB deletion
+                    logger.error(f"✗ OpenAI API error for {file.storage_key}: {e}")
+                    failed.append({"id": file.id, "status": FileState.DELETE_FAILED, "last_error": str(e)})
+                    continue
+
+            # Step 2: Delete from DB (only if OpenAI delete succeeded or no storage_key)
+            await file_repo.delete_by_id(db=session, _id=file.id)
+            logger.info(f"✓ Deleted from DB: {file.name} ({file.s3_object_key})")
+        except Exception as e:
+            logger.error(f"Failed to delete {file.name}: {e}")
+            failed.append({"id": file.id, "status": FileState.DELETE_FAILED, "last_error": str(e)})
+
+    try:
+        await file_repo.bulk_update_mapping(session, failed)
+    finally:
+        await file_repo.release_claims(session, [row["id"] for row in failed], worker_id())
+
+
+async def main():
+    async with worker_context() as ctx:
+        await process_deletions(ctx)
+
 
 if __name__ == "__main__":
-    asyncio.run(process_deletions())
+    asyncio.run(main())
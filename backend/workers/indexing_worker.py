@@ -1,131 +1,175 @@
-from datetime import datetime, timezone
+from collections import defaultdict
 import asyncio
 import logging
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from openai import APIError, NotFoundError, AsyncOpenAI
+from openai import APIError, NotFoundError
 
 from app.domain.file.model import File
+from app.domain.file.schema import FileOut
 from app.domain.user.model import User
-from app.domain.file.repository import FileRepo
-from app.domain.storage.repository import StorageRepo
 from app.enums.enums import FileState
 from app.infrastructure.llm.openai_manager import OpenAIManager
+from app.infrastructure.llm.answer_cache import answer_cache
 from app.core.config import settings
+from .context import WorkerContext, worker_context
 from .decorator import log_timing
+from .lease import worker_id
 
 
 logger = logging.getLogger('app.indexing_worker')
 
+# (file_id, new status or None to keep, last_error or None to keep)
+IndexingUpdate = tuple[int, FileState | None, str | None]
+
+# Files per page of a vector store file listing
+LIST_PAGE_SIZE = 100
+# Statuses worth listing; failed and cancelled files are few and retrieved one by one
+LISTED_STATUSES = ("in_progress", "completed")
+
 
 @log_timing('indexing_worker.check_indexing_status')
-async def check_indexing_status():
+async def check_indexing_status(ctx: WorkerContext):
     """
     Query files with status=INDEXING
     Check OpenAI vector store file status
     Update to INDEXED or UPLOAD_FAILED based on result
-    """
-    engine = create_async_engine(settings.DATABASE_URL)
-
-    async with AsyncSession(engine, expire_on_commit=False) as session:
-        file_repo = FileRepo()
-        storage_repo = StorageRepo()
-        openai_client = AsyncOpenAI(
-            api_key=settings.OPENAI_API_KEY,
-            timeout=70
-        )
 
-        openai = OpenAIManager(openai_client, file_repo, storage_repo)
+    Per vector store, files are resolved by listing them by status (100 per
+    call) when that is cheaper than retrieving them one by one, and joined
+    against the INDEXING rows in memory; results are written with a single
+    bulk UPDATE. Rows are leased with FOR UPDATE SKIP LOCKED, so replicas
+    check disjoint sets.
+    """
+    file_repo = ctx.file_repo
 
-        # Get files being indexed
-        # stmt = select(File).where(File.status == FileState.INDEXING).limit(10)
-        stmt = (
-            select(File)
-            .where(File.status == FileState.INDEXING)
-            .order_by(
-                File.indexing_checked_at.is_not(None),
-                File.indexing_checked_at.asc(),
-            )
-            .limit(10)
+    async with ctx.session_factory() as session:
+        # Lease files being indexed, least recently checked first
+        files = await file_repo.claim_batch(
+            session,
+            worker_id=worker_id(),
+            status=FileState.INDEXING,
+            limit=settings.INDEXING_WORKER_BATCH_SIZE,
+            lease_seconds=settings.WORKER_CLAIM_LEASE_SECONDS,
+            order_by=(File.indexing_checked_at.asc().nulls_first(),),
         )
-        result = await session.execute(stmt)
-        files = result.scalars().all()
 
         if not files:
             return
-        
-        for file in files:
-            try:
-                if not file.storage_key or not file.vector_store_id:
-                    await file_repo.update(
-                        session,
-                        file.id,
-                        {
-                            "status": FileState.UPLOAD_FAILED,
-                            "last_error": "Missing storage_key or vector_store_id",
-                            "indexing_checked_at": datetime.now(timezone.utc),
-                        }
-                    )
-                    continue
-                
-                # Check OpenAI status
-                vs_file = await openai.retrieve_file(
-                    file.vector_store_id,
-                    file.storage_key
-                )
-
-                update_data = {
-                    "indexing_checked_at": datetime.now(timezone.utc),
-                }
-
-                # OpenAI file status: "in_progress", "completed", "cancelled", "failed"
-                if vs_file.status == "completed":
-                    update_data["status"] = FileState.INDEXED
-                elif vs_file.status in ["cancelled", "failed"]:
-                    error_msg = f"OpenAI indexing {vs_file.status}"
-                    if hasattr(vs_file, 'last_error') and vs_file.last_error:
-                        error_msg += f": {vs_file.last_error}"
-                    
-                    update_data["status"] = FileState.UPLOAD_FAILED
-                    update_data["last_error"] = error_msg
-                    
-                    logger.error(f"✗ File {file.name} indexing failed: {error_msg}")
-                
-                else:
-                    # Still "in_progress" - check again next run
-                    logger.info(f"File {file.name} still indexing (status={vs_file.status})")
-
-                await file_repo.update(session, file.id, update_data)
-
-            except NotFoundError:
-                logger.error(f"File {file.name} not found in OpenAI vector store")
-                await file_repo.update(
-                    session,
-                    file.id,
-                    {
-                        "status": FileState.UPLOAD_FAILED,
-                        "last_error": "File not found in OpenAI vector store"
-                    }
-                )
-            
-            except APIError as e:
-                logger.error(f"OpenAI API error checking {file.name}: {e}")
-                # Don't update status - retry next run
-            
-            except Exception as e:
-                logger.error(f"Failed to check indexing status for {file.name}: {e}")
-                await file_repo.update(
-                    session,
-                    file.id,
-                    {
-                        "status": FileState.UPLOAD_FAILED,
-                        "last_error": str(e)
-                    }
-                )
+
+        try:
+            updates = await _reconcile(ctx.openai, files)
+            updated = await file_repo.bulk_update_indexing_status(session, updates)
+
+            # Cached answers for a store no longer cover everything it can cite
+            indexed_ids = {file_id for file_id, status, _ in updates if status == FileState.INDEXED}
+            for vector_store_id in {f.vector_store_id for f in files if f.id in indexed_ids}:
+                await answer_cache.invalidate(vector_store_id)
+
+            indexed = len(indexed_ids)
+            failed = sum(1 for _, status, _ in updates if status == FileState.UPLOAD_FAILED)
+            logger.info(
+                f"Indexing check: {len(files)} files, {updated} rows updated "
+                f"({indexed} indexed, {failed} failed)"
+            )
+        finally:
+            await file_repo.release_claims(session, [f.id for f in files], worker_id())
+
+
+async def _reconcile(openai: OpenAIManager, files: list[FileOut]) -> list[IndexingUpdate]:
+    """Resolve the OpenAI status of every file, store by store."""
+    updates: list[IndexingUpdate] = []
+    by_store: dict[str, list[FileOut]] = defaultdict(list)
+
+    for file in files:
+        if not file.storage_key or not file.vector_store_id:
+            updates.append((file.id, FileState.UPLOAD_FAILED, "Missing storage_key or vector_store_id"))
+            continue
+        by_store[file.vector_store_id].append(file)
+
+    for vector_store_id, store_files in by_store.items():
+        try:
+            updates.extend(await _reconcile_store(openai, vector_store_id, store_files))
+        except NotFoundError:
+            logger.error(f"Vector store {vector_store_id} not found")
+            updates.extend(
+                (f.id, FileState.UPLOAD_FAILED, "OpenAI vector store not found")
+                for f in store_files
+            )
+        except APIError as e:
+            logger.error(f"OpenAI API error listing {vector_store_id}: {e}")
+            # Don't update status - retry next run
+
+    return updates
+
+
+async def _reconcile_store(
+    openai: OpenAIManager, vector_store_id: str, store_files: list[FileOut]
+) -> list[IndexingUpdate]:
+    """
+    Listing a status costs one call per page of files in it, whatever share
+    of them we claimed, so it is only done while that is fewer calls than
+    retrieving each still unresolved file. A few stragglers in a large store
+    are retrieved directly; a large import in progress is listed.
+    """
+    counts = await openai.get_vector_store_file_counts(vector_store_id)
+    unresolved = {f.storage_key: f for f in store_files}
+    updates: list[IndexingUpdate] = []
+
+    for status in LISTED_STATUSES:
+        pages = -(-getattr(counts, status) // LIST_PAGE_SIZE)
+        if not unresolved or pages == 0 or pages >= len(unresolved):
+            continue
+        listed = await openai.list_vector_store_file_statuses(vector_store_id, status=status)
+        for storage_key in listed.keys() & unresolved.keys():
+            updates.append(_update_from_vs_file(unresolved.pop(storage_key), listed[storage_key]))
+
+    # Failed, cancelled, gone, or cheaper to look up one by one
+    for file in unresolved.values():
+        update = await _retrieve_single(openai, file)
+        if update:
+            updates.append(update)
+
+    return updates
+
+
+def _update_from_vs_file(file: FileOut, vs_file) -> IndexingUpdate:
+    # OpenAI file status: "in_progress", "completed", "cancelled", "failed"
+    if vs_file.status == "completed":
+        return (file.id, FileState.INDEXED, None)
+
+    if vs_file.status in ["cancelled", "failed"]:
+        error_msg = f"OpenAI indexing {vs_file.status}"
+        if getattr(vs_file, 'last_error', None):
+            error_msg += f": {vs_file.last_error}"
+        logger.error(f"✗ File {file.name} indexing failed: {error_msg}")
+        return (file.id, FileState.UPLOAD_FAILED, error_msg)
+
+    # Still "in_progress" - only bump indexing_checked_at
+    return (file.id, None, None)
+
+
+async def _retrieve_single(openai: OpenAIManager, file: FileOut) -> IndexingUpdate | None:
+    try:
+        vs_file = await openai.retrieve_file(file.vector_store_id, file.storage_key)
+        return _update_from_vs_file(file, vs_file)
+    except NotFoundError:
+        logger.error(f"File {file.name} not found in OpenAI vector store")
+        return (file.id, FileState.UPLOAD_FAILED, "File not found in OpenAI vector store")
+    except APIError as e:
+        logger.error(f"OpenAI API error checking {file.name}: {e}")
+        return None
+    except Exception as e:
+        logger.error(f"Failed to check indexing status for {file.name}: {e}")
+        return (file.id, FileState.UPLOAD_FAILED, str(e))
+
+
+async def main():
+    async with worker_context() as ctx:
+        await check_indexing_status(ctx)
+
 
 if __name__ == "__main__":
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
     )
-    asyncio.run(check_indexing_status())
+    asyncio.run(main())
@@ -0,0 +1,17 @@
+# workers/lease.py
+import os
+import socket
+import uuid
+from functools import lru_cache
+from app.core.config import settings
+
+
+@lru_cache(maxsize=1)
+def worker_id() -> str:
+    """
+    Identity written to `files.claimed_by`; unique per worker process.
+
+    Containers usually run as pid 1, so a short random suffix keeps replicas
+    that share a hostname distinct.
+    """
+    return settings.WORKER_ID or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
@@ -0,0 +1,69 @@
+# workers/queue_consumer.py
+import asyncio
+import logging
+from typing import Awaitable, Callable, Sequence
+from redis.exceptions import RedisError
+
+from app.infrastructure.redis.stream_queue import RedisStreamQueue
+from app.core.config import settings
+from .lease import worker_id
+
+
+logger = logging.getLogger('app.queue_consumer')
+
+RETRY_BACKOFF_SECONDS = 5
+
+Handler = Callable[[Sequence[int]], Awaitable[None]]
+
+
+async def consume(queue: RedisStreamQueue, handler: Handler):
+    """
+    Feed file ids from `queue` to `handler` until cancelled.
+
+    A batch is acked once the handler returns; per-file failures are already
+    recorded on the rows by the workers. If the handler raises (DB down, etc.)
+    the whole batch is retried and eventually dead-lettered. Redis outages
+    just pause the loop; the periodic sweep keeps files moving meanwhile.
+    """
+    consumer = worker_id()
+    group_ready = False
+
+    while True:
+        try:
+            if not group_ready:
+                await queue.ensure_group()
+                group_ready = True
+                logger.info(f"Consuming {queue.stream} as {consumer}")
+
+            messages = await queue.read(consumer, count=settings.JOB_QUEUE_READ_COUNT)
+        except (RedisError, OSError) as e:
+            logger.warning(f"Queue {queue.stream} unavailable: {e}")
+            await asyncio.sleep(RETRY_BACKOFF_SECONDS)
+            continue
+
+        if not messages:
+            continue
+
+        file_ids = sorted({m.payload["file_id"] for m in messages if "file_id" in m.payload})
+
+        try:
+            if file_ids:
+                await handler(file_ids)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Job batch on {queue.stream} failed for files {file_ids}: {e}")
+            await _settle(queue.retry(m, str(e)) for m in messages)
+            await asyncio.sleep(RETRY_BACKOFF_SECONDS)
+            continue
+
+        await _settle(queue.ack(m) for m in messages)
+
+
+async def _settle(calls):
+    # Unacked messages are reclaimed later, so a failed ack only means a repeat
+    try:
+        for call in calls:
+            await call
+    except (RedisError, OSError) as e:
+        logger.warning(f"Failed to settle queue messages: {e}")
@@ -1,5 +1,6 @@
 import asyncio
 from datetime import datetime, timedelta
+from functools import partial
 import logging
 import sys
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
@@ -11,6 +12,12 @@ from workers.indexing_worker import check_indexing_status
 from workers.upload_worker import process_upload_batch
 from workers.delete_worker import process_deletions
 from workers.weekly_sync_worker import weekly_sync
+from workers.assistant_worker import consume_assistant_jobs, recover_replies
+from workers.queue_consumer import consume
+from workers.context import WorkerContext
+from app.domain.file.jobs import upload_queue, delete_queue
+from app.domain.storage.registry import storage_registry
+from app.core.config import settings
 
 
 SYNC_JOBS = [
@@ -38,14 +45,27 @@ def main():
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
 
+    # Shared DB pool, OpenAI/S3 clients and converter for all jobs in this process
+    ctx = loop.run_until_complete(WorkerContext.create())
+
     scheduler = AsyncIOScheduler(event_loop=loop)
 
     now = datetime.now()
 
-    # Worker 1: Upload to OpenAI every 2 minutes
+    # Queue consumers: uploads, deletions and assistant replies start as soon as a job is enqueued
+    consumers = [
+        loop.create_task(consume(upload_queue, partial(process_upload_batch, ctx))),
+        loop.create_task(consume(delete_queue, partial(process_deletions, ctx))),
+        loop.create_task(consume_assistant_jobs(ctx)),
+        # Assistant jobs resolve storages through the registry; see storage changes made by the API
+        loop.create_task(storage_registry.listen()),
+    ]
+
+    # Worker 1: Safety-net sweep for STORED files whose upload job was lost
     scheduler.add_job(
         process_upload_batch,
-        IntervalTrigger(minutes=3),
+        IntervalTrigger(minutes=settings.WORKER_SWEEP_MINUTES),
+        args=[ctx],
         id='upload_worker',
         max_instances=1,
         next_run_time=now
@@ -55,15 +75,17 @@ def main():
     scheduler.add_job(
         check_indexing_status,
         IntervalTrigger(minutes=5),
+        args=[ctx],
         id='indexing_worker',
         max_instances=1,
         next_run_time=now + timedelta(minutes=1)
     )
 
-    # Worker 3: Process deletions every 5 minutes
+    # Worker 3: Safety-net sweep for DELETING files whose delete job was lost
     scheduler.add_job(
         process_deletions,
-        IntervalTrigger(minutes=3),
+        IntervalTrigger(minutes=settings.WORKER_SWEEP_MINUTES),
+        args=[ctx],
         id='delete_worker',
         max_instances=1,
         next_run_time=now + timedelta(minutes=2)
@@ -86,8 +108,26 @@ def main():
             max_instances=1
         )
 
+    # Worker 5: Re-enqueue (or expire) PROCESSING replies whose job was lost; runs at startup too
+    scheduler.add_job(
+        recover_replies,
+        IntervalTrigger(seconds=settings.ASSISTANT_REPLY_ORPHAN_SECONDS),
+        args=[ctx],
+        id='assistant_recovery',
+        max_instances=1,
+        next_run_time=now
+    )
+
+    # Periodic DB pool report
+    scheduler.add_job(
+        ctx.log_pool_stats,
+        IntervalTrigger(minutes=settings.WORKER_POOL_STATS_MINUTES),
+        id='pool_stats',
+        max_instances=1
+    )
+
     scheduler.start()
-    logger.info("APScheduler started with 3 workers")
+    logger.info("APScheduler started with 4 workers and 3 queue consumers")
 
     try:
         loop.run_forever()
@@ -95,6 +135,10 @@ def main():
         scheduler.shutdown()
         logger.info("Scheduler shut down")
     finally:
+        for task in consumers:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*consumers, return_exceptions=True))
+        loop.run_until_complete(ctx.close())
         loop.close()
 
 
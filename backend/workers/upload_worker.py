@@ -2,140 +2,221 @@
 import asyncio
 import logging
 import tempfile
+from typing import Sequence
 from pathlib import Path
-from sqlalchemy import select, and_
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from openai import APIError, AsyncOpenAI
+from sqlalchemy.ext.asyncio import AsyncSession
+from openai import APIError
 
-from app.domain.file.model import File
+from app.domain.file.schema import FileOut
 from app.domain.user.model import User
 from app.domain.file.repository import FileRepo
-from app.domain.storage.repository import StorageRepo
 from app.enums.enums import FileState, FileOrigin
-from app.infrastructure.llm.openai_manager import OpenAIManager
-from app.infrastructure.yandex.yandex_s3_client import YandexS3Client
-from app.infrastructure.file_converter.file_converter import FileConverter
+from app.infrastructure.file_converter.file_converter import convert_in_process
 from app.core.config import settings
+from .context import StageLimits, WorkerContext, worker_context
 from .decorator import log_timing
+from .lease import worker_id
 
 
 logger = logging.getLogger('app.upload_worker')
 
+UPLOADABLE_ORIGINS = (
+    FileOrigin.S3_IMPORT,
+    FileOrigin.DIRECT_UPLOAD,
+    FileOrigin.UPLOAD,
+)
+
 
 @log_timing('upload_worker.process_upload_batch')
-async def process_upload_batch():
+async def process_upload_batch(ctx: WorkerContext, file_ids: Sequence[int] | None = None):
     """
-    Query files with status=STORED AND origin=S3_IMPORT
-    Download from S3, convert if needed, upload to OpenAI
+    Drain all STORED files (S3 imports, direct uploads and API uploads that
+    need conversion): download from S3, convert if needed, upload to OpenAI.
+
+    Files run concurrently inside one task group. UPLOAD_WORKER_CONCURRENCY
+    bounds files in flight, and each stage (S3 download, conversion in a
+    process pool, OpenAI upload) has its own limit. Rows are claimed by
+    ascending id until none are left, so a large import is drained in one
+    run instead of a few files per tick. Claims are FOR UPDATE SKIP LOCKED
+    leases, so worker replicas split the queue instead of double-processing
+    it. Only as many rows as there are free in-flight slots (at most
+    UPLOAD_WORKER_BATCH_SIZE) are claimed at a time, so a lease never ticks
+    away while its file waits for a slot.
+
+    Queue consumers pass `file_ids` to process just those rows; without it
+    this is the periodic sweep over everything STORED. Both run at once in
+    the worker process and share `ctx.upload_limits`, so the caps hold per
+    process, not per call.
     """
-    engine = create_async_engine(settings.DATABASE_URL)
-    
-    async with AsyncSession(engine, expire_on_commit=False) as session:
-        file_repo = FileRepo()
-        storage_repo = StorageRepo()
-        openai_client = AsyncOpenAI(
-            api_key=settings.OPENAI_API_KEY,
-            timeout=70
+    limits = ctx.upload_limits
+    processed = 0
+    last_id = 0
+
+    async def run(file: FileOut):
+        try:
+            await _process_file(ctx, file, limits)
+        finally:
+            await _release(ctx, file.id)
+            limits.in_flight.release()
+
+    async with asyncio.TaskGroup() as tg:
+        while True:
+            slots = await _acquire_free_slots(limits.in_flight, settings.UPLOAD_WORKER_BATCH_SIZE)
+            try:
+                files = await _claim_batch(ctx, last_id, slots, file_ids)
+            except BaseException:
+                _release_slots(limits.in_flight, slots)
+                raise
+            _release_slots(limits.in_flight, slots - len(files))
+            if not files:
+                break
+
+            last_id = files[-1].id
+            logger.info(f"Queueing {len(files)} files for upload to OpenAI")
+
+            for file in files:
+                tg.create_task(run(file))
+            processed += len(files)
+
+    if processed:
+        logger.info(f"Upload run finished: {processed} files processed")
+
+
+async def _acquire_free_slots(semaphore: asyncio.Semaphore, limit: int) -> int:
+    """Wait for one slot, then take whatever else is free right now, up to `limit`."""
+    await semaphore.acquire()
+    taken = 1
+    while taken < limit and not semaphore.locked():
+        await semaphore.acquire()
+        taken += 1
+    return taken
+
+
+def _release_slots(semaphore: asyncio.Semaphore, count: int) -> None:
+    for _ in range(count):
+        semaphore.release()
+
+
+async def _claim_batch(
+    ctx: WorkerContext,
+    after_id: int,
+    limit: int,
+    file_ids: Sequence[int] | None = None,
+) -> list[FileOut]:
+    """Lease the next page of uploadable files; keyset on id so each row is seen once per run."""
+    async with ctx.session_factory() as session:
+        return await ctx.file_repo.claim_batch(
+            session,
+            worker_id=worker_id(),
+            status=FileState.STORED,
+            limit=limit,
+            lease_seconds=settings.WORKER_CLAIM_LEASE_SECONDS,
+            origins=UPLOADABLE_ORIGINS,
+            after_id=after_id,
+            ids=file_ids,
         )
 
-        openai = OpenAIManager(openai_client, file_repo, storage_repo)
-        s3_client = YandexS3Client()
-        converter = FileConverter()
-        
-        # Get files to upload
-        stmt = (
-            select(File)
-            .where(
-                and_(
-                    File.status == FileState.STORED,
-                    File.origin == FileOrigin.S3_IMPORT
-                )
-            )
-            .limit(5)
-        )
-        result = await session.execute(stmt)
-        files = result.scalars().all()
 
-        if not files:
-            return
+async def _release(ctx: WorkerContext, file_id: int):
+    try:
+        async with ctx.session_factory() as session:
+            await ctx.file_repo.release_claims(session, [file_id], worker_id())
+    except Exception as e:
+        # The lease simply expires if this fails
+        logger.warning(f"Failed to release claim on file {file_id}: {e}")
 
-        logger.info(f"Processing {len(files)} files for upload to OpenAI")
 
-        for file in files:
-            tmp_path = None
-            converted_path = None
+async def _process_file(ctx: WorkerContext, file: FileOut, limits: StageLimits):
+    """Download → convert → upload → update for one file, in its own session."""
+    tmp_path = None
+    converted_path = None
 
-            try:
-                # Create temp file with correct extension
-                suffix = Path(file.name).suffix
-                tmp_fd = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-                tmp_path = Path(tmp_fd.name)
-                tmp_fd.close()
-
-                # Download to temp path
-                await asyncio.to_thread(
-                    s3_client.download_file,
+    file_repo = ctx.file_repo
+
+    async with ctx.session_factory() as session:
+        try:
+            # Create temp file with correct extension
+            suffix = Path(file.name).suffix
+            tmp_fd = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+            tmp_path = Path(tmp_fd.name)
+            tmp_fd.close()
+
+            # 1. Download to temp path
+            async with limits.download:
+                await ctx.s3.download_file(
                     file.s3_bucket,
                     file.s3_object_key,
                     str(tmp_path)
                 )
 
-                openai_path, openai_filename = await converter.convert(
-                    tmp_path,
-                    file.name
-                )
+            # 2. Convert in the process pool (CPU-bound)
+            openai_path = tmp_path
+            if ctx.converter.needs_conversion(file.name):
+                async with limits.convert:
+                    loop = asyncio.get_running_loop()
+                    path_str, _ = await loop.run_in_executor(
+                        ctx.convert_pool, convert_in_process, str(tmp_path), file.name
+                    )
+                openai_path = Path(path_str)
                 converted_path = openai_path if openai_path != tmp_path else None
 
-                # 3. Upload to OpenAI
-                openai_file = await openai.create_file_from_path(
+            # 3. Upload to OpenAI
+            async with limits.upload:
+                openai_file = await ctx.openai.create_file_from_path(
                     str(openai_path),
                     file.vector_store_id
                 )
 
-                # 4. Update status to INDEXING
-                await file_repo.update(
-                    session,
-                    file.id,
-                    {
-                        "storage_key": openai_file.id,
-                        "status": FileState.INDEXING
-                    }
-                )
+            # 4. Update status to INDEXING
+            await file_repo.bulk_update(
+                session,
+                [file.id],
+                {
+                    "storage_key": openai_file.id,
+                    "status": FileState.INDEXING
+                }
+            )
+
+        except APIError as e:
+            logger.error(f"OpenAI API error for {file.name}: {e}")
+            await _mark_failed(session, file_repo, file, f"OpenAI: {str(e)}")
+        except Exception as e:
+            logger.error(f"Failed to upload {file.name}: {e}")
+            await _mark_failed(session, file_repo, file, str(e))
+
+        finally:
+            if tmp_path and tmp_path.exists():
+                try:
+                    tmp_path.unlink(missing_ok=True)
+                except Exception as e:
+                    logger.warning(f"Failed to delete temp file {tmp_path}: {e}")
+
+            if converted_path and converted_path.exists():
+                try:
+                    converted_path.unlink(missing_ok=True)
+                except Exception as e:
+                    logger.warning(f"Failed to delete converted file {converted_path}: {e}")
+
+
+async def _mark_failed(session: AsyncSession, file_repo: FileRepo, file: FileOut, error: str):
+    # Never let a failed status write cancel sibling tasks in the group
+    try:
+        await file_repo.bulk_update(
+            session,
+            [file.id],
+            {
+                "status": FileState.UPLOAD_FAILED,
+                "last_error": error
+            }
+        )
+    except Exception as e:
+        logger.error(f"Failed to mark {file.name} as failed: {e}")
 
-            except APIError as e:
-                logger.error(f"OpenAI API error for {file.name}: {e}")
-                await file_repo.update(
-                    session,
-                    file.id,
-                    {
-                        "status": FileState.UPLOAD_FAILED,
-                        "last_error": f"OpenAI: {str(e)}"
-                    }
-                )
-            except Exception as e:
-                logger.error(f"Failed to upload {file.name}: {e}")
-                await file_repo.update(
-                    session,
-                    file.id,
-                    {
-                        "status": FileState.UPLOAD_FAILED,
-                        "last_error": str(e)
-                    }
-                )
 
-            finally:
-                if tmp_path and tmp_path.exists():
-                    try:
-                        tmp_path.unlink(missing_ok=True)
-                    except Exception as e:
-                        logger.warning(f"Failed to delete temp file {tmp_path}: {e}")
-                
-                if converted_path and converted_path.exists():
-                    try:
-                        converted_path.unlink(missing_ok=True)
-                    except Exception as e:
-                        logger.warning(f"Failed to delete converted file {converted_path}: {e}")
+async def main():
+    async with worker_context() as ctx:
+        await process_upload_batch(ctx)
 
 
 if __name__ == "__main__":
-    asyncio.run(process_upload_batch())
+    asyncio.run(main())
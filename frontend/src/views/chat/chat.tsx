@@ -23,6 +23,12 @@ interface IFailedSendingChat {
     [key: string]: boolean;
 }
 
+interface IMessageDelta {
+    id: number;
+    offset: number;
+    delta: string;
+}
+
 const ChatView = () => {
     const { user } = useAuth();
     const navigate = useNavigate();
@@ -32,6 +38,7 @@ const ChatView = () => {
     const [messages, setMessages] = useState<IMessage[]>([]);
     const [chatFailedSending, setChatFailedSending] = useState<IFailedSendingChat>({});
     const messagesEndRef = useRef<HTMLDivElement>(null);
+    const streamingIds = useRef<Set<string>>(new Set());
 
     const { data, refetch, isError, error } = useGetMessagesQuery(chatId as string, {
         skip: !chatId,
@@ -71,6 +78,15 @@ const ChatView = () => {
             }
         };
 
+        // Partial assistant answers while the reply is still processing
+        source.addEventListener("delta", (event) => {
+            try {
+                appendDelta(JSON.parse((event as MessageEvent).data));
+            } catch (err) {
+                console.error("Failed to parse SSE delta:", err);
+            }
+        });
+
         source.onerror = (err) => {
             console.warn("SSE connection error:", err);
         };
@@ -117,6 +133,19 @@ const ChatView = () => {
         });
     };
 
+    // Deltas arrive in order; offset 0 replaces the "..." placeholder (or text
+    // from a retried attempt). A stream joined midway is skipped and the final
+    // message fills it in.
+    const appendDelta = ({ id, offset, delta }: IMessageDelta) => {
+        if (offset === 0) streamingIds.current.add(String(id));
+        if (!streamingIds.current.has(String(id))) return;
+
+        setMessages((prevMessages) => prevMessages.map((m) => {
+            if (String(m.id) !== String(id) || m.state !== MessageStates.PROCESSING) return m;
+            return { ...m, content: (offset === 0 ? "" : m.content) + delta };
+        }));
+    };
+
     const handleMessage = async (msg: string, resend = false) => {
         if (!chatId || !msg || !user) return;
 